@@ -0,0 +1,340 @@
+# asset_cache.py
+"""Asset cache: icons are decoded once, pre-scaled and optionally packed in an atlas.
+Room images are decoded once in a shared registry and scaled once per cell size.
+Sound effects are decoded once. See preloader.py to fill these caches in the background."""
+
+import os
+import pygame
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from constants import ICON_DIR, ROOM_DIR, SFX_DIR
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+# Threads decoding room images in the background (see ImageRegistry.prefetch)
+PREFETCH_WORKERS = 2
+
+
+class IconCache:
+    """
+    Cache des icônes de l'inventaire.
+
+    Chaque fichier est lu et décodé une seule fois, puis chaque taille demandée
+    est redimensionnée une seule fois. Les fichiers absents sont mémorisés pour
+    ne pas refaire la recherche sur disque à chaque frame.
+
+    Attributes:
+        directory (str): dossier contenant les icônes.
+        use_atlas (bool): si True, les icônes d'une même taille sont regroupées
+            dans une seule surface (atlas) et dessinées par zone.
+    """
+
+    def __init__(self, directory: str = ICON_DIR, use_atlas: bool = True):
+        self.directory = directory
+        self.use_atlas = use_atlas
+        self._sources: Dict[str, pygame.Surface] = {}
+        self._scaled: Dict[Tuple[str, int], pygame.Surface] = {}
+        self._missing: Set[str] = set()
+        # size -> (atlas surface, {filename: area rect})
+        self._atlases: Dict[int, Tuple[pygame.Surface, Dict[str, pygame.Rect]]] = {}
+
+    def _load_source(self, filename: str) -> Optional[pygame.Surface]:
+        """Charge l'image d'origine (une seule fois). Retourne None si absente."""
+        if filename in self._missing:
+            return None
+        img = self._sources.get(filename)
+        if img is None:
+            path = os.path.join(self.directory, filename)
+            if not os.path.exists(path):
+                self._missing.add(filename)
+                print(f"Icon not found: {path}")
+                return None
+            img = pygame.image.load(path).convert_alpha()
+            self._sources[filename] = img
+        return img
+
+    def add_source(self, filename: str, image: pygame.Surface):
+        """Enregistre une icône déjà décodée et convertie (préchargement)."""
+        self._sources[filename] = image
+        self._missing.discard(filename)
+
+    def get(self, filename: str, size: int) -> Optional[pygame.Surface]:
+        """Retourne l'icône redimensionnée en (size, size), ou None si absente."""
+        key = (filename, size)
+        img = self._scaled.get(key)
+        if img is None:
+            src = self._load_source(filename)
+            if src is None:
+                return None
+            img = pygame.transform.scale(src, (size, size))
+            self._scaled[key] = img
+        return img
+
+    def build_atlas(self, filenames: Iterable[str], size: int):
+        """
+        Regroupe les icônes d'une taille donnée dans une seule surface horizontale.
+        Les icônes absentes sont ignorées.
+        """
+        icons = [(name, self.get(name, size)) for name in filenames]
+        icons = [(name, img) for name, img in icons if img is not None]
+        atlas = pygame.Surface((max(1, size * len(icons)), size), pygame.SRCALPHA)
+        areas = {}
+        for i, (name, img) in enumerate(icons):
+            area = pygame.Rect(i * size, 0, size, size)
+            atlas.blit(img, area)
+            areas[name] = area
+        atlas = atlas.convert_alpha()
+        self._atlases[size] = (atlas, areas)
+        return atlas, areas
+
+    def blit(self, surface: pygame.Surface, filename: str, size: int, pos: Tuple[int, int]) -> bool:
+        """Dessine l'icône à la position donnée. Retourne False si l'icône est absente."""
+        if self.use_atlas:
+            entry = self._atlases.get(size)
+            if entry is not None:
+                atlas, areas = entry
+                area = areas.get(filename)
+                if area is not None:
+                    surface.blit(atlas, pos, area)
+                    return True
+        img = self.get(filename, size)
+        if img is None:
+            return False
+        surface.blit(img, pos)
+        return True
+
+    def has_atlas(self, size: int) -> bool:
+        return size in self._atlases
+
+    def is_missing(self, filename: str) -> bool:
+        return filename in self._missing
+
+    def clear(self):
+        """Vide le cache (ex: après recréation de la fenêtre)."""
+        self._sources.clear()
+        self._scaled.clear()
+        self._missing.clear()
+        self._atlases.clear()
+
+
+class ImageRegistry:
+    """
+    Registre global des images de salles, avec compteur de références.
+
+    Chaque fichier est décodé une seule fois pour tout le processus. Les Room
+    obtiennent leur image avec acquire() et la rendent avec release(). Les
+    fichiers absents sont mémorisés. Les images préchargées restent en mémoire ;
+    les autres sont libérées par purge() (à chaque nouvelle partie, voir
+    GameManager.reset) quand plus aucune Room ne les utilise.
+
+    prefetch() décode des fichiers sur des threads ; poll() (thread principal)
+    convertit les images prêtes. Tant qu'une image est en cours de décodage,
+    is_pending() est vrai et l'affichage utilise la couleur de la salle.
+    """
+
+    def __init__(self, directory: str = ROOM_DIR):
+        self.directory = directory
+        self._images: Dict[str, pygame.Surface] = {}
+        self._refs: Dict[str, int] = {}
+        self._pinned: Set[str] = set()
+        self._missing: Set[str] = set()
+        self._pending: Dict[str, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _load(self, image_name: str) -> Optional[pygame.Surface]:
+        if image_name in self._missing:
+            return None
+        if image_name in self._pending:
+            # Needed right now: wait for the decode already in progress
+            self._finish(image_name, self._pending.pop(image_name))
+            return self._images.get(image_name)
+        img = self._images.get(image_name)
+        if img is None:
+            path = os.path.join(self.directory, image_name)
+            if not os.path.exists(path):
+                self._missing.add(image_name)
+                return None
+            img = pygame.image.load(path).convert_alpha()
+            self._images[image_name] = img
+        return img
+
+    def acquire(self, image_name: Optional[str]) -> Optional[pygame.Surface]:
+        """Retourne l'image partagée et incrémente son compteur de références."""
+        if not image_name:
+            return None
+        img = self._load(image_name)
+        if img is not None:
+            self._refs[image_name] = self._refs.get(image_name, 0) + 1
+        return img
+
+    def release(self, image_name: Optional[str]):
+        """Décrémente le compteur de références de l'image."""
+        count = self._refs.get(image_name, 0)
+        if count > 1:
+            self._refs[image_name] = count - 1
+        elif count == 1:
+            del self._refs[image_name]
+
+    def ref_count(self, image_name: str) -> int:
+        return self._refs.get(image_name, 0)
+
+    def add(self, image_name: str, image: pygame.Surface, pinned: bool = True):
+        """Enregistre une image déjà décodée et convertie (préchargement)."""
+        self._images[image_name] = image
+        self._missing.discard(image_name)
+        if pinned:
+            self._pinned.add(image_name)
+
+    def prefetch(self, image_names: Iterable[Optional[str]]) -> int:
+        """
+        Lance le décodage en arrière-plan des images pas encore chargées.
+        Retourne le nombre de fichiers mis en file.
+        """
+        count = 0
+        for name in set(image_names):
+            if (not name or name in self._images or name in self._missing
+                    or name in self._pending):
+                continue
+            path = os.path.join(self.directory, name)
+            if not os.path.exists(path):
+                self._missing.add(name)
+                continue
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS,
+                                                    thread_name_prefix="room-images")
+            # Decode only: convert_alpha() needs the main thread (see poll)
+            self._pending[name] = self._executor.submit(pygame.image.load, path)
+            count += 1
+        return count
+
+    def is_pending(self, image_name: Optional[str]) -> bool:
+        return image_name in self._pending
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def poll(self) -> bool:
+        """Convertit les images décodées (thread principal). True si une image est arrivée."""
+        done = [name for name, fut in self._pending.items() if fut.done()]
+        for name in done:
+            self._finish(name, self._pending.pop(name))
+        return bool(done)
+
+    def _finish(self, image_name: str, future: Future):
+        try:
+            self._images[image_name] = future.result().convert_alpha()
+        except (pygame.error, OSError) as e:
+            print(f"Room image not loaded: {image_name} ({e})")
+            self._missing.add(image_name)
+
+    def preload(self) -> int:
+        """
+        Décode toutes les images du dossier (nécessite display.set_mode).
+        Les images préchargées ne sont jamais libérées par purge().
+        Retourne le nombre d'images chargées.
+        """
+        if not os.path.isdir(self.directory):
+            return 0
+        count = 0
+        for filename in sorted(os.listdir(self.directory)):
+            if not filename.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            if self._load(filename) is not None:
+                self._pinned.add(filename)
+                count += 1
+        return count
+
+    def purge(self) -> int:
+        """Libère les images non préchargées qui ne sont plus référencées."""
+        unused = [name for name in self._images
+                  if name not in self._pinned and self._refs.get(name, 0) == 0]
+        for name in unused:
+            del self._images[name]
+        return len(unused)
+
+    def __contains__(self, image_name: str) -> bool:
+        return image_name in self._images
+
+
+class ScaledRoomCache:
+    """
+    Surfaces de salles déjà redimensionnées à la taille d'une case.
+
+    La clé est (image_name, (w, h)) : deux salles qui utilisent le même fichier
+    partagent la même surface. Le cache est vidé seulement quand la taille des
+    cases change (fenêtre redimensionnée, autre taille de grille).
+    """
+
+    def __init__(self):
+        self._cell_size: Optional[Tuple[int, int]] = None
+        self._scaled: Dict[Tuple[str, Tuple[int, int]], pygame.Surface] = {}
+
+    def set_cell_size(self, size: Tuple[int, int]):
+        """Invalide le cache si la taille des cases a changé."""
+        if size != self._cell_size:
+            self._scaled.clear()
+            self._cell_size = size
+
+    def get(self, room, size: Tuple[int, int]) -> Optional[pygame.Surface]:
+        """Retourne l'image de la salle à la taille demandée, ou None si pas d'image."""
+        image = getattr(room, "image", None)
+        if image is None:
+            return None
+        key = (room.image_name, size)
+        img = self._scaled.get(key)
+        if img is None:
+            img = pygame.transform.scale(image, size)
+            self._scaled[key] = img
+        return img
+
+    def clear(self):
+        self._scaled.clear()
+        self._cell_size = None
+
+
+class SoundCache:
+    """
+    Effets sonores décodés une seule fois (pygame.mixer.Sound).
+    Les fichiers absents ou illisibles sont mémorisés ; sans mixer, get() retourne None.
+    """
+
+    def __init__(self, directory: str = SFX_DIR):
+        self.directory = directory
+        self._sounds: Dict[str, pygame.mixer.Sound] = {}
+        self._missing: Set[str] = set()
+
+    def add(self, filename: str, sound: pygame.mixer.Sound):
+        self._sounds[filename] = sound
+        self._missing.discard(filename)
+
+    def get(self, filename: str) -> Optional[pygame.mixer.Sound]:
+        sound = self._sounds.get(filename)
+        if sound is not None or filename in self._missing:
+            return sound
+        if not pygame.mixer.get_init():
+            return None
+        path = os.path.join(self.directory, filename)
+        try:
+            sound = pygame.mixer.Sound(path)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Sound not loaded: {path} ({e})")
+            self._missing.add(filename)
+            return None
+        self._sounds[filename] = sound
+        return sound
+
+    def __contains__(self, filename: str) -> bool:
+        return filename in self._sounds
+
+    def clear(self):
+        self._sounds.clear()
+        self._missing.clear()
+
+
+# Instances partagées par tous les écrans
+icons = IconCache()
+room_images = ImageRegistry()
+room_surfaces = ScaledRoomCache()
+sounds = SoundCache()
@@ -0,0 +1,336 @@
+# batch_engine.py
+"""
+Vectorised batch engine (NumPy) for the step / resource economy.
+
+The state of B games is stored as a structure of arrays: one NumPy array per
+Inventory field. Room effects from effects.apply_room_effect are applied as
+masked vector updates, and a single call advances every game of the batch by
+one move. This is meant for balancing sweeps; the interactive game keeps using
+GameEngine.
+
+NumPy is an optional dependency (pip install numpy), only needed here.
+
+Random outcomes (food, chest and dig rewards) are indices into the tables of
+effects.py. They come from a "roll source": by default a NumPy Generator, or
+python_roll_source() which uses one random.Random per game and consumes it
+exactly like the scalar code does. With the latter, results are identical to
+the scalar engine under the same seeds (see the self-check at the bottom).
+"""
+
+import random
+from typing import Callable, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError as exc:  # pragma: no cover - optional dependency
+    raise ImportError("batch_engine requires NumPy: pip install numpy") from exc
+
+from effects import FOOD_OPTIONS, CHEST_REWARDS, DIG_REWARDS
+from inventory import Inventory
+from door import E, N, W
+from rooms_catalog import CATALOG, RoomTemplate
+
+CONSUMABLES = ("steps", "gold", "gems", "keys", "dice")
+PERMANENTS = ("shovel", "hammer", "picklock_kit", "metal_detector", "rabbit_foot")
+
+# Effect kinds, resolved once per template (same order as effects.py)
+(K_NONE, K_LOCKED, K_LIBRARY, K_WORKSHOP, K_TREASURE, K_FOOD, K_TRAP,
+ K_CHEST, K_LOCKER, K_DIG, K_ITEM, K_EXIT) = range(12)
+
+ITEM_FIELDS = {
+    "pelle": "shovel",
+    "marteau": "hammer",
+    "crochetage": "picklock_kit",
+    "detecteur": "metal_detector",
+    "patte_lapin": "rabbit_foot",
+}
+
+ENTRY_TEMPLATE = RoomTemplate("Entrée", image_name="entry.png", room_type="start",
+                              color_type="blue", doors=N | E | W)
+EXIT_TEMPLATE = RoomTemplate("Antichambre", image_name="sortie.png", room_type="exit",
+                             color_type="blue", effect_data={"escape": True})
+
+# Roll source: (mask of games needing a roll, number of outcomes) -> int array (B,)
+RollSource = Callable[[np.ndarray, int], np.ndarray]
+
+
+def _effect_kind(tpl: RoomTemplate) -> int:
+    t = tpl.room_type
+    data = tpl.effect_data
+    if t == "locked_room":
+        return K_LOCKED
+    if t == "bibliotheque":
+        return K_LIBRARY
+    if t == "atelier":
+        return K_WORKSHOP
+    if t == "tresor":
+        return K_TREASURE
+    if t == "bedroom" and data.get("has_food"):
+        return K_FOOD
+    if t == "piege":
+        return K_TRAP
+    if t == "coffre":
+        return K_CHEST
+    if t == "casier":
+        return K_LOCKER
+    if t == "creuser":
+        return K_DIG
+    if data.get("item"):
+        return K_ITEM
+    if t == "exit":
+        return K_EXIT
+    return K_NONE
+
+
+class RoomTable:
+    """
+    Paramètres des salles sous forme de tableaux indexés par identifiant de salle.
+
+    Par défaut : les salles du catalogue, puis l'entrée et la sortie.
+    """
+
+    def __init__(self, templates: Optional[Sequence[RoomTemplate]] = None):
+        if templates is None:
+            templates = CATALOG.templates + (ENTRY_TEMPLATE, EXIT_TEMPLATE)
+        self.templates = tuple(templates)
+        self.ids = {tpl.name: i for i, tpl in enumerate(self.templates)}
+        kinds = [_effect_kind(t) for t in self.templates]
+        d = [t.effect_data for t in self.templates]
+
+        self.kind = np.array(kinds, dtype=np.int8)
+        self.cost_gems = np.array([t.cost_gems for t in self.templates], dtype=np.int32)
+        self.needs_key = np.array([bool(x.get("requires_key_to_enter", False)) for x in d])
+        # Amounts, with the same defaults as effects.py
+        self.gold = np.array([x.get("gold", 10 if k == K_LOCKED else 5) for x, k in zip(d, kinds)],
+                             dtype=np.int32)
+        self.gems = np.array([x.get("gems", 2 if k == K_LOCKED else 1) for x, k in zip(d, kinds)],
+                             dtype=np.int32)
+        self.keys = np.array([x.get("keys", 1) for x in d], dtype=np.int32)
+        self.trap_damage = np.array([x.get("trap_damage", 5) for x in d], dtype=np.int32)
+        self.item = np.array([list(ITEM_FIELDS).index(x["item"]) if x.get("item") in ITEM_FIELDS
+                              else -1 for x in d], dtype=np.int8)
+
+    def id_of(self, name: str) -> int:
+        return self.ids[name]
+
+
+class BatchState:
+    """
+    État de B parties : un tableau par champ d'Inventory, plus won.
+    """
+
+    def __init__(self, size: int):
+        defaults = Inventory()
+        self.size = size
+        for name in CONSUMABLES:
+            setattr(self, name, np.full(size, getattr(defaults, name), dtype=np.int32))
+        for name in PERMANENTS:
+            setattr(self, name, np.full(size, getattr(defaults, name), dtype=bool))
+        self.won = np.zeros(size, dtype=bool)
+
+    @classmethod
+    def from_inventories(cls, inventories: Sequence[Inventory]) -> "BatchState":
+        state = cls(len(inventories))
+        for name in CONSUMABLES + PERMANENTS:
+            getattr(state, name)[:] = [getattr(inv, name) for inv in inventories]
+        return state
+
+    def to_inventories(self) -> List[Inventory]:
+        return [Inventory(**{name: getattr(self, name)[i].item()
+                             for name in CONSUMABLES + PERMANENTS})
+                for i in range(self.size)]
+
+    @property
+    def dead(self) -> np.ndarray:
+        return self.steps <= 0
+
+    @property
+    def active(self) -> np.ndarray:
+        return ~(self.dead | self.won)
+
+
+def numpy_roll_source(rng: np.random.Generator) -> RollSource:
+    """Tirages vectorisés (rapide)."""
+    def draw(mask, n):
+        return rng.integers(0, n, size=mask.shape[0])
+    return draw
+
+
+def python_roll_source(rngs: Sequence[random.Random]) -> RollSource:
+    """
+    Un random.Random par partie, consommé seulement quand la partie a besoin
+    d'un tirage : même flux que random.choice() dans effects.py.
+    """
+    def draw(mask, n):
+        out = np.zeros(mask.shape[0], dtype=np.int64)
+        for i in np.flatnonzero(mask):
+            out[i] = rngs[i].randrange(n)
+        return out
+    return draw
+
+
+class BatchEngine:
+    """Applique les règles d'économie à tout un lot de parties à la fois."""
+
+    def __init__(self, table: Optional[RoomTable] = None,
+                 rolls: Optional[RollSource] = None, seed: Optional[int] = None):
+        self.table = table or RoomTable()
+        self.rolls = rolls or numpy_roll_source(np.random.default_rng(seed))
+        self._food_steps = np.array([steps for _, steps in FOOD_OPTIONS], dtype=np.int32)
+        weights = np.array([t.weight for t in CATALOG.templates])
+        self._catalog_p = weights / weights.sum()
+        self._catalog_ids = np.array([self.table.id_of(t.name) for t in CATALOG.templates])
+
+    def apply_effects(self, state: BatchState, room_ids: np.ndarray, mask: np.ndarray):
+        """Équivalent vectoriel de effects.apply_room_effect pour les parties de mask."""
+        tb = self.table
+        kind = np.where(mask, tb.kind[room_ids], K_NONE)
+
+        m = kind == K_LOCKED
+        state.gold += np.where(m, tb.gold[room_ids], 0)
+        state.gems += np.where(m, tb.gems[room_ids], 0)
+
+        m = kind == K_LIBRARY
+        state.gems += np.where(m, tb.gems[room_ids], 0)
+
+        m = kind == K_WORKSHOP
+        state.keys += np.where(m, tb.keys[room_ids], 0)
+
+        m = kind == K_TREASURE
+        state.gold += np.where(m, tb.gold[room_ids], 0)
+
+        m = kind == K_FOOD
+        if m.any():
+            roll = self.rolls(m, len(FOOD_OPTIONS))
+            state.steps += np.where(m, self._food_steps[roll], 0)
+
+        m = kind == K_TRAP
+        state.steps -= np.where(m, tb.trap_damage[room_ids], 0)
+
+        m = kind == K_CHEST
+        if m.any():
+            with_key = m & (state.keys > 0)
+            with_hammer = m & ~with_key & state.hammer
+            opened = with_key | with_hammer
+            state.keys -= with_key
+            roll = self.rolls(opened, len(CHEST_REWARDS))
+            state.gold += np.where(opened & (roll == CHEST_REWARDS.index("gold")), 5, 0)
+            state.steps += np.where(opened & (roll == CHEST_REWARDS.index("food")), 10, 0)
+            state.gems += np.where(opened & (roll == CHEST_REWARDS.index("gems")), 1, 0)
+
+        m = kind == K_LOCKER
+        if m.any():
+            opened = m & (state.keys > 0)
+            state.keys -= opened
+            state.steps += np.where(opened, 8, 0)
+
+        m = kind == K_DIG
+        if m.any():
+            digging = m & state.shovel
+            roll = self.rolls(digging, len(DIG_REWARDS))
+            state.gold += np.where(digging & (roll == DIG_REWARDS.index("gold")), 3, 0)
+            state.gems += np.where(digging & (roll == DIG_REWARDS.index("gems")), 1, 0)
+
+        m = kind == K_ITEM
+        if m.any():
+            items = tb.item[room_ids]
+            for code, name in enumerate(ITEM_FIELDS.values()):
+                arr = getattr(state, name)
+                arr |= m & (items == code)
+
+        state.won |= kind == K_EXIT
+
+    def enter(self, state: BatchState, room_ids: np.ndarray,
+              mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Déplace chaque partie active dans la salle room_ids[i] (un pas)
+        puis applique son effet. Retourne le masque des parties déplacées.
+        """
+        moving = state.active if mask is None else (mask & state.active)
+        state.steps -= moving
+        np.maximum(state.steps, 0, out=state.steps, where=moving)
+        self.apply_effects(state, room_ids, moving)
+        return moving
+
+    def place(self, state: BatchState, room_ids: np.ndarray,
+              mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Choisit la salle room_ids[i] derrière une porte : paie la clé puis les
+        gemmes (comme GameEngine.choose_room), et entre si le paiement réussit.
+        Retourne le masque des parties où la salle a été posée.
+        """
+        tb = self.table
+        active = state.active if mask is None else (mask & state.active)
+        needs_key = active & tb.needs_key[room_ids]
+        key_ok = ~needs_key | (state.keys > 0)
+        # La clé est consommée avant la vérification des gemmes (même ordre que le jeu)
+        state.keys -= needs_key & key_ok
+        cost = tb.cost_gems[room_ids]
+        ok = active & key_ok & (state.gems >= cost)
+        state.gems -= np.where(ok, cost, 0)
+        return self.enter(state, room_ids, ok)
+
+    def sample_rooms(self, size: int, rng: np.random.Generator) -> np.ndarray:
+        """Tire une salle du catalogue par partie, selon les poids de rareté."""
+        return self._catalog_ids[rng.choice(len(self._catalog_p), size=size, p=self._catalog_p)]
+
+
+# ============================================================================
+# Auto-vérification : python batch_engine.py
+# ============================================================================
+
+if __name__ == "__main__":
+    import time
+    from effects import apply_room_effect
+
+    B, MOVES, SEED = 2000, 40, 1234
+    table = RoomTable()
+    move_rng = np.random.default_rng(SEED)
+    plan = [(BatchEngine(table).sample_rooms(B, move_rng), move_rng.random(B) < 0.7)
+            for _ in range(MOVES)]
+
+    # Vectorised path, with per-game Python RNGs
+    state = BatchState(B)
+    state.hammer[::3] = True
+    state.shovel[::2] = True
+    engine = BatchEngine(table, rolls=python_roll_source([random.Random(SEED + i) for i in range(B)]))
+    for ids, is_new in plan:
+        engine.place(state, ids, is_new)
+        engine.enter(state, ids, ~is_new)
+
+    # Scalar path: same rules through effects.apply_room_effect
+    rooms = [tpl.instantiate() for tpl in table.templates]
+    mismatches = 0
+    for i in range(B):
+        random.seed(SEED + i)
+        inv = Inventory(hammer=(i % 3 == 0), shovel=(i % 2 == 0))
+        won = False
+        for ids, is_new in plan:
+            if inv.is_dead() or won:
+                continue
+            room = rooms[ids[i]]
+            if is_new[i]:
+                if room.effect_data.get("requires_key_to_enter"):
+                    if inv.keys <= 0:
+                        continue
+                    inv.keys -= 1
+                if not inv.use_gems(room.cost_gems):
+                    continue
+            inv.decrement_steps(1)
+            apply_room_effect(room, None, inv, None)
+            won = room.room_type == "exit"
+        batch_inv = state.to_inventories()[i]
+        if batch_inv != inv or bool(state.won[i]) != won:
+            mismatches += 1
+    print(f"Scalar vs batch: {mismatches} mismatch(es) on {B} games")
+
+    # Throughput
+    big = 100_000
+    state = BatchState(big)
+    engine = BatchEngine(table, seed=SEED)
+    rng = np.random.default_rng(SEED)
+    t0 = time.perf_counter()
+    for _ in range(MOVES):
+        engine.place(state, engine.sample_rooms(big, rng))
+    elapsed = time.perf_counter() - t0
+    print(f"Batch: {big * MOVES / elapsed:,.0f} game-moves/s")
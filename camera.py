@@ -0,0 +1,97 @@
+# camera.py
+"""
+Camera over the manor grid: fixed pixel cell sizes, zoom levels, scrolling.
+
+The camera maps grid cells to pixels of the grid area. Cells are square and
+CAMERA_ZOOM_LEVELS[zoom] pixels wide whatever the manor size; the view scrolls
+only when the player or the cursor gets within CAMERA_FOLLOW_MARGIN cells of
+its edge. visible_cells() gives the range of cells on screen so ui.draw_grid
+only draws those: the cost of a frame follows the screen area, not the manor.
+
+No pygame here (plain integers), so it can be used and tested headless.
+"""
+
+from typing import Iterable, Tuple
+
+from constants import CAMERA_DEFAULT_CELL, CAMERA_FOLLOW_MARGIN, CAMERA_ZOOM_LEVELS
+
+
+class Camera:
+    """
+    Vue sur la grille.
+
+    Attributes:
+        view_w, view_h (int): taille de la zone de la grille à l'écran (px).
+        zoom (int): indice dans CAMERA_ZOOM_LEVELS.
+        x, y (int): coin haut-gauche de la vue dans la grille (px, négatif
+            quand la grille est plus petite que la vue : elle est centrée).
+    """
+
+    def __init__(self, view_w: int, view_h: int, zoom: int | None = None):
+        self.view_w = view_w
+        self.view_h = view_h
+        self.zoom = CAMERA_ZOOM_LEVELS.index(CAMERA_DEFAULT_CELL) if zoom is None else zoom
+        self.x = 0
+        self.y = 0
+
+    @property
+    def cell(self) -> int:
+        """Taille d'une case en pixels au zoom courant."""
+        return CAMERA_ZOOM_LEVELS[self.zoom]
+
+    def fit(self, rows: int, cols: int):
+        """Plus grand zoom où tout le manoir tient dans la vue (sinon le zoom par défaut)."""
+        self.zoom = CAMERA_ZOOM_LEVELS.index(CAMERA_DEFAULT_CELL)
+        for i, cell in enumerate(CAMERA_ZOOM_LEVELS):
+            if cols * cell <= self.view_w and rows * cell <= self.view_h:
+                self.zoom = i
+
+    def zoom_by(self, delta: int) -> bool:
+        """Change de niveau de zoom autour du centre de la vue. Retourne False en butée."""
+        zoom = max(0, min(len(CAMERA_ZOOM_LEVELS) - 1, self.zoom + delta))
+        if zoom == self.zoom:
+            return False
+        old, new = self.cell, CAMERA_ZOOM_LEVELS[zoom]
+        self.x = (self.x + self.view_w // 2) * new // old - self.view_w // 2
+        self.y = (self.y + self.view_h // 2) * new // old - self.view_h // 2
+        self.zoom = zoom
+        return True
+
+    def follow(self, targets: Iterable[Tuple[int, int]], rows: int, cols: int):
+        """
+        Fait défiler la vue juste assez pour garder les cases targets visibles
+        (avec la marge) ; la dernière l'emporte (le curseur après le joueur).
+        """
+        targets = list(targets)
+        self.x = self._scroll(self.x, self.view_w, cols, [c for _, c in targets])
+        self.y = self._scroll(self.y, self.view_h, rows, [r for r, _ in targets])
+
+    def _scroll(self, offset: int, view: int, count: int, positions) -> int:
+        cell = self.cell
+        world = count * cell
+        if world <= view:
+            # Whole axis visible: centre it
+            return -((view - world) // 2)
+        margin = min(CAMERA_FOLLOW_MARGIN * cell, max(0, (view - cell) // 2))
+        for p in positions:
+            lo = p * cell - margin
+            hi = (p + 1) * cell + margin
+            if lo < offset:
+                offset = lo
+            elif hi > offset + view:
+                offset = hi - view
+        return max(0, min(world - view, offset))
+
+    def visible_cells(self, rows: int, cols: int) -> Tuple[int, int, int, int]:
+        """(r0, r1, c0, c1) : cases visibles, bornes de fin exclues."""
+        cell = self.cell
+        r0 = max(0, self.y // cell)
+        c0 = max(0, self.x // cell)
+        r1 = min(rows, -(-(self.y + self.view_h) // cell))
+        c1 = min(cols, -(-(self.x + self.view_w) // cell))
+        return r0, r1, c0, c1
+
+    def cell_rect(self, r: int, c: int) -> Tuple[int, int, int, int]:
+        """Rectangle (x, y, w, h) de la case à l'écran."""
+        cell = self.cell
+        return c * cell - self.x, r * cell - self.y, cell, cell
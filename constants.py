@@ -14,6 +14,10 @@ FONT_DIR = os.path.join(ASSETS_DIR, "fonts")
 AUDIO_DIR = os.path.join(ASSETS_DIR, "audio")
 MUSIC_DIR = os.path.join(AUDIO_DIR, "music")
 SFX_DIR = os.path.join(AUDIO_DIR, "effects")
+ROOM_DIR = os.path.join(ROOT_DIR, "rooms")
+
+# Decode every room image once at startup instead of on first use
+PRELOAD_ROOM_IMAGES = True
 
 
 WINDOW_WIDTH = 1256
@@ -28,6 +32,21 @@ PANEL_WIDTH = 260  # panel droit pour inventaire
 GRID_AREA_WIDTH = WINDOW_WIDTH - PANEL_WIDTH
 GRID_AREA_HEIGHT = WINDOW_HEIGHT
 
+# Grid camera: cell size in pixels per zoom level, default when the whole
+# manor does not fit, cells kept between the player / cursor and the view edge
+CAMERA_ZOOM_LEVELS = (24, 32, 48, 64, 80, 96, 120)
+CAMERA_DEFAULT_CELL = 64
+CAMERA_FOLLOW_MARGIN = 1
+
+# Room choice modal (centered box)
+MODAL_WIDTH = 620
+MODAL_HEIGHT = 280
+
+# Main loop: max wait for an event when nothing needs redrawing (ms)
+IDLE_WAIT_MS = 500
+# Shorter wait while room images are decoding in the background (ms)
+PREFETCH_POLL_MS = 16
+
 # Colors (RGB)
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -40,3 +59,6 @@ BLUE = (50, 100, 200)
 CURSOR_COLOR = (255, 100, 100)
 UNKNOWN_ROOM_COLOR = (30, 30, 30)
 GRID_LINE_COLOR = (80, 80, 80)
+DOOR_COLOR = (235, 225, 200)
+LOCKED_DOOR_COLOR = YELLOW
+CURSOR_BLOCKED_COLOR = (120, 120, 120)
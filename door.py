@@ -0,0 +1,109 @@
+# door.py
+"""
+Door model: 4-bit masks (N=1, E=2, S=4, W=8) and union-find connectivity.
+
+A room template describes its doors with the entrance on the south side (the
+way the room is drawn). When the room is placed, its masks are rotated so
+that one door faces the room the player comes from (see orient).
+
+Two neighbouring rooms are connected when both have a door facing the other
+and neither door is locked. Doors only ever get unlocked and rooms are only
+ever added, so connectivity only grows: a union-find answers "are these two
+rooms connected" (e.g. entrance and exit) in near-constant time.
+"""
+
+from typing import Callable, Dict, Hashable, Tuple
+
+N, E, S, W = 1, 2, 4, 8
+ALL_DOORS = N | E | S | W
+
+# Grid delta -> door bit (rows grow southwards)
+DOOR_BITS: Dict[Tuple[int, int], int] = {(-1, 0): N, (0, 1): E, (1, 0): S, (0, -1): W}
+BIT_DELTAS: Dict[int, Tuple[int, int]] = {bit: delta for delta, bit in DOOR_BITS.items()}
+
+# (door bit, row delta, col delta, bit of the facing door), for hot loops
+DOOR_STEPS: Tuple[Tuple[int, int, int, int], ...] = (
+    (N, -1, 0, S), (E, 0, 1, W), (S, 1, 0, N), (W, 0, -1, E))
+
+
+def rotate(mask: int, quarter_turns: int) -> int:
+    """Tourne un masque de portes de quarter_turns quarts de tour (sens horaire)."""
+    k = quarter_turns % 4
+    return ((mask << k) | (mask >> (4 - k))) & ALL_DOORS
+
+
+def opposite(bit: int) -> int:
+    """Porte d'en face (N <-> S, E <-> W)."""
+    return rotate(bit, 2)
+
+
+def door_bit(from_pos: Tuple[int, int], to_pos: Tuple[int, int]) -> int:
+    """Bit de la porte de from_pos vers to_pos (0 si les cases ne sont pas voisines)."""
+    return DOOR_BITS.get((to_pos[0] - from_pos[0], to_pos[1] - from_pos[1]), 0)
+
+
+def door_count(mask: int) -> int:
+    return bin(mask & ALL_DOORS).count("1")
+
+
+def orient(doors: int, locked: int, entry_bit: int,
+           opens_inside: Callable[[int], bool]) -> Tuple[int, int]:
+    """
+    Masques (portes, verrous) tournés pour que la salle ait une porte non
+    verrouillée côté entry_bit. Parmi les rotations possibles on garde celle
+    qui a le plus de portes donnant dans la grille (opens_inside(bit)),
+    puis la plus petite rotation : le choix est déterministe (replays).
+    """
+    best = None
+    for k in range(4):
+        d, l = rotate(doors, k), rotate(locked, k)
+        if not d & entry_bit:
+            continue
+        inside = sum(1 for bit in BIT_DELTAS if d & bit and opens_inside(bit))
+        if best is None or inside > best[0]:
+            best = (inside, d, l & ~entry_bit)
+    if best is None:
+        # Room without doors: give it the entry door
+        return entry_bit, 0
+    return best[1], best[2]
+
+
+class DisjointSet:
+    """Union-find creux (dict), union par taille et compression de chemin."""
+
+    __slots__ = ("parent", "size")
+
+    def __init__(self):
+        self.parent: Dict[Hashable, Hashable] = {}
+        self.size: Dict[Hashable, int] = {}
+
+    def add(self, item: Hashable):
+        if item not in self.parent:
+            self.parent[item] = item
+            self.size[item] = 1
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self.parent
+
+    def find(self, item: Hashable) -> Hashable:
+        parent = self.parent
+        root = item
+        while parent[root] != root:
+            root = parent[root]
+        while parent[item] != root:
+            parent[item], item = root, parent[item]
+        return root
+
+    def union(self, a: Hashable, b: Hashable) -> bool:
+        """Fusionne les ensembles de a et b. Retourne False s'ils l'étaient déjà."""
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size.pop(rb)
+        return True
+
+    def connected(self, a: Hashable, b: Hashable) -> bool:
+        return a in self.parent and b in self.parent and self.find(a) == self.find(b)
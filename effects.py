@@ -3,11 +3,26 @@ effects.py - Apply room effects when player enters.
 OBJECTS (food, tools) are INSIDE rooms, not rooms themselves.
 """
 
-def apply_room_effect(room, player, inventory, grid):
+import random
+
+# Random outcomes (shared with batch_engine so both stay in sync)
+FOOD_OPTIONS = (
+    ("une pomme", 2),
+    ("une banane", 3),
+    ("un gâteau", 10),
+)
+CHEST_REWARDS = ("gold", "food", "gems")
+DIG_REWARDS = ("gold", "gems", "nothing")
+
+def apply_room_effect(room, player, inventory, grid, rng=None):
     """
     Apply room effect when player enters.
     Rooms can contain objects that activate upon entry.
+    rng: random.Random of the game (global random module if None).
     """
+    if rng is None:
+        rng = random
+
     if room is None:
         return "Salle vide."
 
@@ -48,13 +63,7 @@ def apply_room_effect(room, player, inventory, grid):
     
     if t == "bedroom" and effect_data.get("has_food"):
         # Bedroom with food - randomly draw which food
-        import random
-        food_options = [
-            ("une pomme", 2),
-            ("une banane", 3),
-            ("un gâteau", 10),
-        ]
-        food_name, steps = random.choice(food_options)
+        food_name, steps = rng.choice(FOOD_OPTIONS)
         inventory.steps += steps
         return f"Vous trouvez {food_name} et récupérez {steps} pas."
 
@@ -73,8 +82,7 @@ def apply_room_effect(room, player, inventory, grid):
         if inventory.keys > 0:
             inventory.keys -= 1
             # Chest reward
-            import random
-            reward_type = random.choice(["gold", "food", "gems"])
+            reward_type = rng.choice(CHEST_REWARDS)
             if reward_type == "gold":
                 inventory.gold += 5
                 return f"Vous ouvrez un coffre avec une clé et trouvez 5 pièces d'or."
@@ -86,8 +94,7 @@ def apply_room_effect(room, player, inventory, grid):
                 return f"Vous ouvrez un coffre avec une clé et trouvez 1 gemme."
         elif inventory.hammer:
             # With hammer, no key needed
-            import random
-            reward_type = random.choice(["gold", "food", "gems"])
+            reward_type = rng.choice(CHEST_REWARDS)
             if reward_type == "gold":
                 inventory.gold += 5
                 return f"Vous brisez le coffre avec le marteau et trouvez 5 pièces d'or."
@@ -114,8 +121,7 @@ def apply_room_effect(room, player, inventory, grid):
         # Dig spot - requires shovel
         dig_spots = effect_data.get("dig_spots", 1)
         if inventory.shovel:
-            import random
-            reward_type = random.choice(["gold", "gems", "nothing"])
+            reward_type = rng.choice(DIG_REWARDS)
             if reward_type == "gold":
                 inventory.gold += 3
                 return f"Vous creusez avec la pelle et trouvez 3 pièces d'or."
@@ -0,0 +1,324 @@
+# engine.py
+"""
+GameEngine: headless game core (grid, player, inventory, room draws and effects).
+
+No pygame here: the engine is driven by commands (cursor moves, enter, choose a
+room, cancel...) so it can run without display, mixer or fonts, e.g. for
+simulations and tests. GameManager translates key presses into these commands
+and draws the engine state.
+
+Every random draw (room choices, room effects) goes through the engine's own
+random.Random, seeded at creation. Commands are recorded as short tokens, so a
+game is fully described by (seed, commands) and can be replayed (see replay.py).
+GameEngine(record=False) skips that recording and the save journal hooks
+(simulations).
+"""
+
+import random
+from typing import List, Optional, Tuple
+
+from constants import GRID_ROWS, GRID_COLS
+from grid import Grid, Room
+from player import Player
+from inventory import Inventory, JournaledInventory
+from effects import apply_room_effect
+from rooms_catalog import CATALOG, RoomCatalog
+
+
+class GameEngine:
+    """
+    État complet d'une partie et règles du jeu.
+
+    Attributes:
+        grid (Grid): le manoir.
+        inventory (Inventory): ressources du joueur.
+        player (Player): position du joueur et du curseur.
+        message (str): dernier message à afficher.
+        in_modal (bool): True quand le choix de salle est ouvert.
+        modal_options (list[Room]): salles proposées.
+        selected_choice_idx (int): salle sélectionnée dans le choix.
+        modal_target_pos (tuple | None): case de la porte ouverte.
+        won (bool): le joueur a atteint la sortie.
+        seed (int): graine du générateur aléatoire de la partie.
+        rng (random.Random): générateur utilisé pour tous les tirages.
+        commands (list[str] | None): commandes jouées (None si l'enregistrement est arrêté).
+        record (bool): enregistre les commandes et journalise l'inventaire
+            (False : simulations, rien n'est rejouable ni sauvegardable).
+        events (list[str]): événements pour le son / l'affichage (EV_*), voir drain_events.
+    """
+
+    # Sound / UI events (see drain_events)
+    EV_DOOR_OPEN = "door_open"
+    EV_DOOR_LOCKED = "door_locked"
+    EV_PICK_ITEM = "pick_item"
+    EV_GAME_OVER = "game_over"
+
+    # Command tokens (see execute)
+    CURSOR_MOVES = {"U": (-1, 0), "D": (1, 0), "L": (0, -1), "R": (0, 1)}
+    CURSOR_TOKENS = {delta: token for token, delta in CURSOR_MOVES.items()}
+
+    def __init__(self, rows: int = GRID_ROWS, cols: int = GRID_COLS,
+                 catalog: RoomCatalog = CATALOG, seed: Optional[int] = None,
+                 record: bool = True):
+        self.catalog = catalog
+        self.record = record
+        self.rows = rows
+        self.cols = cols
+        self.reset(seed)
+
+    def reset(self, seed: Optional[int] = None):
+        """Nouvelle partie : reconstruit la grille, l'inventaire et le joueur (même catalogue)."""
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.commands: Optional[List[str]] = [] if self.record else None
+
+        # Core model
+        self.grid = Grid(rows=self.rows, cols=self.cols)
+        self.inventory = JournaledInventory() if self.record else Inventory()
+
+        # Player starts at the entrance (bottom-left)
+        start_r, start_c = self.grid.start_pos
+        self.player = Player(start_row=start_r, start_col=start_c, inventory=self.inventory)
+        self.grid.discover(start_r, start_c)
+
+        # State
+        self.message = "ZQSD pour deplacer le curseur. Espace pour entrer."
+        self.in_modal = False
+        self.modal_options: List[Room] = []
+        self.selected_choice_idx = 0
+        self.modal_target_pos: Optional[Tuple[int, int]] = None
+        self.won = False
+        self.events: List[str] = []
+        self._death_reported = False
+
+    # --------------------
+    # State queries
+    # --------------------
+    @property
+    def lost(self) -> bool:
+        return self.inventory.is_dead()
+
+    @property
+    def finished(self) -> bool:
+        return self.won or self.lost
+
+    # --------------------
+    # Events
+    # --------------------
+    def drain_events(self) -> List[str]:
+        """Retourne et vide les événements survenus depuis le dernier appel."""
+        events, self.events = self.events, []
+        return events
+
+    def _apply_effect(self, room: Optional[Room]) -> str:
+        """apply_room_effect + événement pick_item si un objet ou une ressource a été gagné."""
+        inv = self.inventory
+        before = (inv.gems, inv.keys, inv.dice, inv.gold, inv.shovel, inv.hammer,
+                  inv.picklock_kit, inv.metal_detector, inv.rabbit_foot)
+        msg = apply_room_effect(room, self.player, inv, self.grid, self.rng)
+        after = (inv.gems, inv.keys, inv.dice, inv.gold, inv.shovel, inv.hammer,
+                 inv.picklock_kit, inv.metal_detector, inv.rabbit_foot)
+        if any(a > b for a, b in zip(after, before)):
+            self.events.append(self.EV_PICK_ITEM)
+        return msg
+
+    # --------------------
+    # Recording / replay
+    # --------------------
+    def _record(self, token: str):
+        if self.commands is not None:
+            self.commands.append(token)
+
+    def stop_recording(self):
+        """Arrête l'enregistrement (ex: partie chargée, non rejouable depuis la graine)."""
+        self.commands = None
+
+    def execute(self, token: str):
+        """
+        Rejoue une commande enregistrée :
+        U/D/L/R curseur, H recentrer, E entrer, O<r>,<c> ouvrir une porte,
+        < et > sélection, C valider la sélection, 0-9 valider la salle n, X annuler.
+        """
+        if token in self.CURSOR_MOVES:
+            self.move_cursor(*self.CURSOR_MOVES[token])
+        elif token == "H":
+            self.recenter()
+        elif token == "E":
+            self.enter()
+        elif token[0] == "O":
+            r, c = token[1:].split(",")
+            self.open_door(int(r), int(c))
+        elif token == "<":
+            self.move_choice(-1)
+        elif token == ">":
+            self.move_choice(1)
+        elif token == "C":
+            self.choose_room()
+        elif token.isdigit():
+            self.choose_room(int(token))
+        elif token == "X":
+            self.cancel()
+        else:
+            raise ValueError(f"Unknown command token {token!r}")
+
+    # --------------------
+    # Commands
+    # --------------------
+    def move_cursor(self, drow: int, dcol: int):
+        """Déplace le curseur de sélection (un pas dans une direction)."""
+        token = self.CURSOR_TOKENS.get((drow, dcol))
+        if token is not None:
+            self._record(token)
+            self.player.move_cursor(drow, dcol, self.grid.rows, self.grid.cols)
+        else:
+            # Déplacement de plusieurs cases : une commande par pas
+            for _ in range(abs(drow)):
+                self.move_cursor(1 if drow > 0 else -1, 0)
+            for _ in range(abs(dcol)):
+                self.move_cursor(0, 1 if dcol > 0 else -1)
+
+    def recenter(self):
+        """Replace le curseur sur le joueur."""
+        self._record("H")
+        self.player.reset_cursor_to_player()
+        self.message = "Curseur recentré."
+
+    def enter(self):
+        """
+        Action sur la case du curseur : entre dans une salle découverte
+        adjacente, ou ouvre la porte vers une case inconnue. Il faut une porte
+        entre les deux cases ; une porte verrouillée coûte une clé.
+        """
+        self._record("E")
+        sr, sc = self.player.sel_row, self.player.sel_col
+        if not self.player.can_move_to(sr, sc):
+            self.message = "La destination doit être adjacente au joueur."
+            return
+        if not self.player.can_move_to(sr, sc, self.grid):
+            self.message = "Pas de porte dans cette direction."
+            return
+        unlocked = self._unlock(sr, sc)
+        if unlocked is None:
+            return
+        if self.grid.is_discovered(sr, sc):
+            self.player.move_to(sr, sc)
+            room = self.grid.get_room(sr, sc)
+            effect_msg = self._apply_effect(room)
+            self.message = f"{unlocked}{effect_msg} | Pas restants: {self.inventory.steps}"
+            if room is not None and room.room_type == "exit":
+                self.message = "You Win! Appuyez sur ESC pour quitter."
+                self.won = True
+        else:
+            self._open_door(sr, sc)
+            self.message = unlocked + self.message
+
+    def _unlock(self, r: int, c: int) -> Optional[str]:
+        """
+        Porte verrouillée entre le joueur et (r, c) : consomme une clé.
+        Retourne le préfixe du message ("" sans verrou), None si pas de clé.
+        """
+        pr, pc = self.player.row, self.player.col
+        if not self.grid.door_locked(pr, pc, r, c):
+            return ""
+        if self.inventory.keys <= 0:
+            self.message = "Porte verrouillée : il faut une clé."
+            self.events.append(self.EV_DOOR_LOCKED)
+            return None
+        self.inventory.keys -= 1
+        self.grid.unlock_door(pr, pc, r, c)
+        return "Porte déverrouillée avec une clé. "
+
+    def open_door(self, r: int, c: int):
+        """
+        Ouvre le choix entre 3 salles tirées selon leur rareté
+        (au moins une salle gratuite).
+        """
+        self._record(f"O{r},{c}")
+        self._open_door(r, c)
+
+    def _open_door(self, r: int, c: int):
+        templates = self.catalog.draw_with_free(k=3, rng=self.rng)
+        self.in_modal = True
+        self.modal_options = [tpl.instantiate() for tpl in templates]
+        self.modal_target_pos = (r, c)
+        self.selected_choice_idx = 0
+        self.message = "Choisissez une salle avec Q/D et validez avec Entrée."
+        self.events.append(self.EV_DOOR_OPEN)
+
+    def move_choice(self, delta: int):
+        """Change la salle sélectionnée dans le choix (-1 / +1)."""
+        if not self.in_modal:
+            return
+        self._record("<" if delta < 0 else ">")
+        idx = self.selected_choice_idx + delta
+        self.selected_choice_idx = max(0, min(len(self.modal_options) - 1, idx))
+
+    def choose_room(self, idx: Optional[int] = None) -> bool:
+        """
+        Valide la salle choisie (la sélection courante si idx est None) :
+        paie la clé / les gemmes, place la salle et y déplace le joueur.
+        Retourne True si la salle a été placée.
+        """
+        if not self.in_modal:
+            return False
+        self._record("C" if idx is None else str(idx))
+        if not self.modal_options or self.modal_target_pos is None:
+            self.in_modal = False
+            return False
+        if idx is not None:
+            self.selected_choice_idx = max(0, min(len(self.modal_options) - 1, idx))
+
+        choice = self.modal_options[self.selected_choice_idx]
+
+        # Check if room requires key to enter
+        if choice.effect_data.get("requires_key_to_enter", False):
+            if self.inventory.keys > 0:
+                self.inventory.keys -= 1
+                self.message = f"Vous utilisez une clé pour entrer dans {choice.name}."
+            else:
+                self.message = f"Vous avez besoin d'une clé pour entrer dans {choice.name}."
+                self.events.append(self.EV_DOOR_LOCKED)
+                return False
+
+        # Check gem cost
+        cost = choice.cost_gems
+        if cost > 0:
+            ok = self.inventory.use_gems(cost)
+            if not ok:
+                self.message = f"Pas assez de gemmes pour choisir {choice.name}."
+                self.events.append(self.EV_DOOR_LOCKED)
+                return False
+
+        tr, tc = self.modal_target_pos
+        # Doors rotated so the new room opens onto the player's room
+        self.grid.orient_room(tr, tc, choice, (self.player.row, self.player.col))
+        self.grid.set_room(tr, tc, choice)
+        self.player.move_to(tr, tc)
+        effect_msg = self._apply_effect(choice)
+
+        self.in_modal = False
+        self.modal_options = []
+        self.selected_choice_idx = 0
+        self.modal_target_pos = None
+        self.message = f"{effect_msg} | Pas restants: {self.inventory.steps}"
+        return True
+
+    def cancel(self):
+        """Ferme le choix de salle sans rien placer."""
+        if not self.in_modal:
+            return
+        self._record("X")
+        self.in_modal = False
+        self.modal_options = []
+        self.modal_target_pos = None
+        self.selected_choice_idx = 0
+        self.message = "Choix annulé."
+
+    def update(self):
+        if self.inventory.is_dead():
+            self.message = "Vous n'avez plus de pas. Partie terminée. Appuyez sur ESC."
+            if not self._death_reported:
+                self._death_reported = True
+                self.events.append(self.EV_GAME_OVER)
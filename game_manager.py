@@ -2,26 +2,51 @@
 """GameManager: orchestrates the game, events, update and draw calls."""
 
 import os
-import random
+import dataclasses
 import pygame
 
 from constants import (
     WINDOW_WIDTH, WINDOW_HEIGHT, GRID_ROWS, GRID_COLS,
-    FONT_DIR, AUDIO_DIR, FPS,
+    FONT_DIR, FPS, PRELOAD_ROOM_IMAGES,
+    GRID_AREA_WIDTH, GRID_AREA_HEIGHT, PANEL_WIDTH, MODAL_WIDTH, MODAL_HEIGHT,
     BLACK, WHITE, CURSOR_COLOR
 )
-from grid import Grid, Room
-from player import Player
-from inventory import Inventory
+from camera import Camera
+from grid import Room
+from engine import GameEngine
 from ui import draw_grid, draw_inventory, draw_message
-from effects import apply_room_effect
+from asset_cache import room_images
+from sound_managener import audio
+from text_cache import render_text
+from ui_resources import ui_resources
 
 
 class GameManager:
-    """Main game class (GameManager)."""
-
-    def __init__(self, width: int | None = None, height: int | None = None):
-        pygame.init()
+    """
+    Main game class (GameManager).
+
+    Thin pygame adapter on top of GameEngine: turns key presses into engine
+    commands and draws the engine state.
+
+    Rendering is incremental: after each tick the visible state is compared
+    with the last drawn one and only the regions that changed (grid + message,
+    inventory panel, modal box) are marked dirty. render() redraws those
+    regions and returns their rects for pygame.display.update().
+    """
+
+    GRID_RECT = pygame.Rect(0, 0, GRID_AREA_WIDTH, WINDOW_HEIGHT)
+    PANEL_RECT = pygame.Rect(GRID_AREA_WIDTH, 0, PANEL_WIDTH, WINDOW_HEIGHT)
+    MODAL_RECT = pygame.Rect((WINDOW_WIDTH - MODAL_WIDTH) // 2, (WINDOW_HEIGHT - MODAL_HEIGHT) // 2,
+                             MODAL_WIDTH, MODAL_HEIGHT)
+
+    def __init__(self, width: int | None = None, height: int | None = None,
+                 seed: int | None = None):
+        # Reuse pygame / window if already initialised (main.py does it);
+        # the mixer is started by audio.init() below
+        if not pygame.display.get_init():
+            pygame.display.init()
+        if not pygame.font.get_init():
+            pygame.font.init()
         pygame.display.set_caption("Blue Prince - POO")
 
         if width is None:
@@ -29,19 +54,22 @@ class GameManager:
         if height is None:
             height = WINDOW_HEIGHT
 
-        self.screen = pygame.display.set_mode((width, height))
+        screen = pygame.display.get_surface()
+        if screen is None or screen.get_size() != (width, height):
+            screen = pygame.display.set_mode((width, height))
+        self.screen = screen
         self.clock = pygame.time.Clock()
         self.running = True
 
-        # Core model
-        self.grid = Grid(rows=GRID_ROWS, cols=GRID_COLS)
-        self.inventory = Inventory()
+        if PRELOAD_ROOM_IMAGES:
+            room_images.preload()
+
+        # Core model (headless)
+        self.engine = GameEngine(rows=GRID_ROWS, cols=GRID_COLS, seed=seed)
 
-        # Player starts at the entrance (bottom-left)
-        start_r = self.grid.rows - 1
-        start_c = 0
-        self.player = Player(start_row=start_r, start_col=start_c, inventory=self.inventory)
-        self.grid.discover(start_r, start_c)
+        # View on the grid (scrolls with the player / cursor, +/- to zoom)
+        self.camera = Camera(GRID_AREA_WIDTH, GRID_AREA_HEIGHT)
+        self.camera.fit(GRID_ROWS, GRID_COLS)
 
         # UI / fonts
         font_path = os.path.join(FONT_DIR, "OpenSans-Regular.ttf")
@@ -49,35 +77,87 @@ class GameManager:
             self.font = pygame.font.Font(font_path, 16)
             self.large_font = pygame.font.Font(font_path, 20)
         else:
-            self.font = pygame.font.SysFont("arial", 16)
-            self.large_font = pygame.font.SysFont("arial", 20, bold=True)
-
-        # Audio
-        try:
-            pygame.mixer.init()
-            music_path_mp3 = os.path.join(AUDIO_DIR, "main_theme.mp3")
-            music_path_wav = os.path.join(AUDIO_DIR, "main_theme.wav")
-            if os.path.exists(music_path_mp3):
-                pygame.mixer.music.load(music_path_mp3)
-                pygame.mixer.music.set_volume(0.5)
-                pygame.mixer.music.play(-1)
-            elif os.path.exists(music_path_wav):
-                pygame.mixer.music.load(music_path_wav)
-                pygame.mixer.music.set_volume(0.5)
-                pygame.mixer.music.play(-1)
-        except Exception:
-            pass  # audio not critical
-
-        # State
-        self.message = "ZQSD pour deplacer le curseur. Espace pour entrer."
-        self.in_modal = False
-        self.modal_options: list[Room] = []
-        self.selected_choice_idx = 0
-        self.modal_target_pos: tuple | None = None
+            self.font = ui_resources.font("arial", 16)
+            self.large_font = ui_resources.font("arial", 20, bold=True)
+
+        # Audio: effects preloaded in memory, music streamed (kept across games)
+        if audio.init():
+            audio.preload()
+            if not pygame.mixer.music.get_busy():
+                audio.play_music()
+
+        # Dirty regions (everything on first frame)
+        self._dirty: list[pygame.Rect] = []
+        self._drawn_state: tuple | None = None
+        self.invalidate()
+
+    def reset(self, seed: int | None = None):
+        """
+        Nouvelle partie dans la même session : seul l'état du jeu (grille,
+        inventaire, joueur) est reconstruit ; fenêtre, audio et polices restent.
+        """
+        self.engine.reset(seed)
+        # Rooms of the previous game are gone: free the images only they used
+        room_images.purge()
+        self.running = True
+        self._drawn_state = None
+        self.invalidate()
+
+    # --------------------
+    # Engine state (kept as attributes for main.py / save_manager)
+    # --------------------
+    @property
+    def grid(self):
+        return self.engine.grid
+
+    @property
+    def inventory(self):
+        return self.engine.inventory
+
+    @property
+    def player(self):
+        return self.engine.player
+
+    @property
+    def message(self) -> str:
+        return self.engine.message
+
+    @message.setter
+    def message(self, value: str):
+        self.engine.message = value
+
+    @property
+    def in_modal(self) -> bool:
+        return self.engine.in_modal
+
+    @property
+    def modal_options(self) -> list[Room]:
+        return self.engine.modal_options
+
+    @property
+    def selected_choice_idx(self) -> int:
+        return self.engine.selected_choice_idx
+
+    @property
+    def modal_target_pos(self) -> tuple | None:
+        return self.engine.modal_target_pos
 
     # --------------------
     # Event handling
     # --------------------
+    CURSOR_KEYS = {
+        pygame.K_z: (-1, 0), pygame.K_UP: (-1, 0),
+        pygame.K_s: (1, 0), pygame.K_DOWN: (1, 0),
+        pygame.K_q: (0, -1), pygame.K_LEFT: (0, -1),
+        pygame.K_d: (0, 1), pygame.K_RIGHT: (0, 1),
+    }
+
+    # Camera zoom: +1 = bigger cells
+    ZOOM_KEYS = {
+        pygame.K_PLUS: 1, pygame.K_KP_PLUS: 1, pygame.K_EQUALS: 1,
+        pygame.K_MINUS: -1, pygame.K_KP_MINUS: -1,
+    }
+
     def handle_events_from_main(self, events):
         """
         Maneja eventos pasados desde main.py
@@ -90,55 +170,20 @@ class GameManager:
                     self._handle_modal_key(event.key)
                     continue
 
-                # Cursor movement - ZQSD
-                if event.key == pygame.K_z:
-                    self.player.move_cursor(-1, 0, self.grid.rows, self.grid.cols)
-                    print(f"DEBUG: Cursor moved UP to ({self.player.sel_row}, {self.player.sel_col})")
-                elif event.key == pygame.K_s:
-                    self.player.move_cursor(1, 0, self.grid.rows, self.grid.cols)
-                    print(f"DEBUG: Cursor moved DOWN to ({self.player.sel_row}, {self.player.sel_col})")
-                elif event.key == pygame.K_q:
-                    self.player.move_cursor(0, -1, self.grid.rows, self.grid.cols)
-                    print(f"DEBUG: Cursor moved LEFT to ({self.player.sel_row}, {self.player.sel_col})")
-                elif event.key == pygame.K_d:
-                    self.player.move_cursor(0, 1, self.grid.rows, self.grid.cols)
-                    print(f"DEBUG: Cursor moved RIGHT to ({self.player.sel_row}, {self.player.sel_col})")
-                
-                # Arrow keys
-                elif event.key == pygame.K_UP:
-                    self.player.move_cursor(-1, 0, self.grid.rows, self.grid.cols)
-                    print(f"DEBUG: Cursor moved UP to ({self.player.sel_row}, {self.player.sel_col})")
-                elif event.key == pygame.K_DOWN:
-                    self.player.move_cursor(1, 0, self.grid.rows, self.grid.cols)
-                    print(f"DEBUG: Cursor moved DOWN to ({self.player.sel_row}, {self.player.sel_col})")
-                elif event.key == pygame.K_LEFT:
-                    self.player.move_cursor(0, -1, self.grid.rows, self.grid.cols)
-                    print(f"DEBUG: Cursor moved LEFT to ({self.player.sel_row}, {self.player.sel_col})")
-                elif event.key == pygame.K_RIGHT:
-                    self.player.move_cursor(0, 1, self.grid.rows, self.grid.cols)
-                    print(f"DEBUG: Cursor moved RIGHT to ({self.player.sel_row}, {self.player.sel_col})")
+                # Cursor movement - ZQSD / arrows
+                if event.key in self.CURSOR_KEYS:
+                    self.engine.move_cursor(*self.CURSOR_KEYS[event.key])
 
                 elif event.key == pygame.K_SPACE:
-                    print(f"DEBUG: SPACE pressed at cursor ({self.player.sel_row}, {self.player.sel_col})")
-                    sr, sc = self.player.sel_row, self.player.sel_col
-                    if self.player.can_move_to(sr, sc):
-                        if self.grid.is_discovered(sr, sc):
-                            self.player.move_to(sr, sc)
-                            room = self.grid.get_room(sr, sc)
-                            effect_msg = apply_room_effect(room, self.player, self.inventory, self.grid)
-                            self.message = f"{effect_msg} | Pas restants: {self.inventory.steps}"
-                            if room.room_type == "exit":
-                                self.message = "You Win! Appuyez sur ESC pour quitter."
-                                self.running = False
-                        else:
-                            self.open_door_modal(sr, sc)
-                    else:
-                        self.message = "La destination doit être adjacente au joueur."
+                    self.engine.enter()
+                    if self.engine.won:
+                        self.running = False
 
                 elif event.key == pygame.K_RETURN:
-                    self.player.reset_cursor_to_player()
-                    self.message = "Curseur recentré."
-                    print(f"DEBUG: Cursor reset to player position ({self.player.row}, {self.player.col})")
+                    self.engine.recenter()
+
+                elif event.key in self.ZOOM_KEYS:
+                    self.camera.zoom_by(self.ZOOM_KEYS[event.key])
 
     def handle_events(self):
         """Método original - NO USAR, solo para compatibilidad"""
@@ -150,166 +195,129 @@ class GameManager:
     def _handle_modal_key(self, key):
         """Handle key presses when modal is open"""
         if key in (pygame.K_q, pygame.K_LEFT):
-            self.selected_choice_idx = max(0, self.selected_choice_idx - 1)
+            self.engine.move_choice(-1)
         elif key in (pygame.K_d, pygame.K_RIGHT):
-            self.selected_choice_idx = min(len(self.modal_options) - 1, self.selected_choice_idx + 1)
+            self.engine.move_choice(1)
         elif key == pygame.K_RETURN or key == pygame.K_SPACE:
-            if not self.modal_options or self.modal_target_pos is None:
-                self.in_modal = False
-                return
-
-            choice = self.modal_options[self.selected_choice_idx]
-            
-            # Check if room requires key to enter
-            if choice.effect_data.get("requires_key_to_enter", False):
-                if self.inventory.keys > 0:
-                    self.inventory.keys -= 1
-                    self.message = f"Vous utilisez une clé pour entrer dans {choice.name}."
-                else:
-                    self.message = f"Vous avez besoin d'une clé pour entrer dans {choice.name}."
-                    return
-            
-            # Check gem cost
-            cost = choice.cost_gems
-            if cost > 0:
-                ok = self.inventory.use_gems(cost)
-                if not ok:
-                    self.message = f"Pas assez de gemmes pour choisir {choice.name}."
-                    return
-
-            tr, tc = self.modal_target_pos
-            self.grid.set_room(tr, tc, choice)
-            self.player.move_to(tr, tc)
-            effect_msg = apply_room_effect(choice, self.player, self.inventory, self.grid)
-
-            self.in_modal = False
-            self.modal_options = []
-            self.selected_choice_idx = 0
-            self.modal_target_pos = None
-            self.message = f"{effect_msg} | Pas restants: {self.inventory.steps}"
-
+            self.engine.choose_room()
         elif key == pygame.K_ESCAPE:
-            self.in_modal = False
-            self.modal_options = []
-            self.message = "Choix annulé."
+            self.engine.cancel()
 
     # --------------------
     # Door / room generation
     # --------------------
     def open_door_modal(self, r: int, c: int):
-        """
-        Opens modal to choose from 3 randomly drawn rooms.
-        Only includes actual ROOMS, not items (items are inside rooms).
-        """
-        # Catalog of actual ROOMS (not items/objects)
-        candidate_rooms = [
-            # Blue rooms (common, neutral)
-            Room("Couloir", image_name="Couloir.png", room_type="neutral", 
-                 cost_gems=0, color_type="blue", rarity=0),
-            Room("Salle Vide", image_name="room_default.png", room_type="neutral", 
-                 cost_gems=0, color_type="blue", rarity=0),
-            
-            # Green rooms (gardens - contain permanent items or dig spots)
-            Room("Bibliothèque", image_name="bibliotheque.png", room_type="bibliotheque", 
-                 cost_gems=1, color_type="green", rarity=1, 
-                 effect_data={"gems": 1}),
-            Room("Veranda", image_name="Veranda.png", room_type="veranda", 
-                 cost_gems=2, color_type="green", rarity=2,
-                 effect_data={"boost_green": True}),
-            
-            # Yellow rooms (workshops - contain keys)
-            Room("Atelier", image_name="atelier.png", room_type="atelier", 
-                 cost_gems=1, color_type="yellow", rarity=1,
-                 effect_data={"keys": 1}),
-            
-            # Violet rooms (bedrooms - contain food)
-            Room("Chambre", image_name="Chambre.png", room_type="bedroom", 
-                 cost_gems=1, color_type="violet", rarity=1,
-                 effect_data={"has_food": True}),
-            
-            # Orange rooms (corridors - many doors)
-            Room("Grand Couloir", image_name="room_default.png", room_type="corridor", 
-                 cost_gems=0, color_type="orange", rarity=0),
-            
-            # Red rooms (dangerous - traps)
-            Room("Salle Piégée", image_name="piege.png", room_type="piege", 
-                 cost_gems=0, color_type="red", rarity=1,
-                 effect_data={"trap_damage": 5}),
-            
-            # Special rooms with containers
-            Room("Salle Trésor", image_name="salle_tresor.png", room_type="tresor", 
-                 cost_gems=2, color_type="yellow", rarity=2,
-                 effect_data={"gold": 5}),
-            Room("Salle aux Coffres", image_name="coffre.png", room_type="coffre", 
-                 cost_gems=1, color_type="blue", rarity=1,
-                 effect_data={"chest_count": 1, "requires_key": True}),
-            Room("Vestiaire", image_name="casiers.png", room_type="casier", 
-                 cost_gems=1, color_type="blue", rarity=1,
-                 effect_data={"locker_count": 2, "requires_key": True}),
-            Room("Jardin", image_name="Jardin.png", room_type="creuser", 
-                 cost_gems=1, color_type="green", rarity=1,
-                 effect_data={"dig_spots": 1, "requires_shovel": True}),
-            
-            # Locked room (requires key to enter)
-            Room("Coffre-Fort", image_name="coffre.png", room_type="locked_room",
-                 cost_gems=2, color_type="yellow", rarity=2,
-                 effect_data={"gold": 10, "gems": 2, "requires_key_to_enter": True}),
-        ]
-
-        # Filter out exit room
-        candidate_rooms = [rm for rm in candidate_rooms if rm.room_type != "exit"]
-
-        # Select 3 rooms
-        if len(candidate_rooms) <= 3:
-            choices = candidate_rooms[:]
-        else:
-            # Draw according to rarity weights
-            weights = [rm.get_probability_weight() for rm in candidate_rooms]
-            choices = random.choices(candidate_rooms, weights=weights, k=3)
-
-        # Ensure at least one free room (cost_gems == 0)
-        if not any(rm.cost_gems == 0 for rm in choices):
-            free_rooms = [rm for rm in candidate_rooms if rm.cost_gems == 0]
-            if free_rooms:
-                choices[0] = random.choice(free_rooms)
-
-        self.in_modal = True
-        self.modal_options = choices
-        self.modal_target_pos = (r, c)
-        self.selected_choice_idx = 0
-        self.message = "Choisissez une salle avec Q/D et validez avec Entrée."
+        """Opens modal to choose from 3 randomly drawn rooms."""
+        self.engine.open_door(r, c)
 
     # --------------------
     # Update / Draw / Loop
     # --------------------
     def update(self):
-        if self.inventory.is_dead():
-            self.message = "Vous n'avez plus de pas. Partie terminée. Appuyez sur ESC."
+        self.engine.update()
+        for event in self.engine.drain_events():
+            audio.play(event)
+        if self.engine.lost:
             self.running = False
 
+    # --------------------
+    # Dirty regions
+    # --------------------
+    def invalidate(self, rect: pygame.Rect | None = None):
+        """Marque une zone à redessiner (tout l'écran si rect est None)."""
+        full = self.screen.get_rect()
+        if rect is None or rect == full:
+            self._dirty = [full]
+        elif not (self._dirty and self._dirty[0] == full) and rect not in self._dirty:
+            self._dirty.append(rect)
+
+    @property
+    def needs_redraw(self) -> bool:
+        return bool(self._dirty)
+
+    def prefetch_room_images(self) -> int:
+        """Décode en arrière-plan les images des salles découvertes (après un chargement)."""
+        return room_images.prefetch(
+            room.image_name for _, _, room, discovered in self.grid.iter_cells()
+            if discovered and room is not None)
+
+    def _view_state(self) -> tuple:
+        """Ce qui est affiché, groupé par zone: (grille, panneau, modal, sélection)."""
+        p = self.player
+        grid_state = (p.row, p.col, p.sel_row, p.sel_col, self.message, self.camera.zoom)
+        panel_state = dataclasses.astuple(self.inventory)
+        modal_state = (self.in_modal, tuple(id(r) for r in self.modal_options))
+        return grid_state, panel_state, modal_state, self.selected_choice_idx
+
+    def sync_dirty(self):
+        """Compare l'état visible avec le dernier dessiné et marque les zones modifiées."""
+        if room_images.poll():
+            # Background-decoded room images arrived
+            self.invalidate(self.GRID_RECT)
+        state = self._view_state()
+        old = self._drawn_state
+        self._drawn_state = state
+        if old is None or state[2] != old[2]:
+            # Modal opened / closed: the translucent overlay covers everything
+            self.invalidate()
+            return
+        if self.in_modal:
+            if state[:2] != old[:2]:
+                self.invalidate()
+            elif state[3] != old[3]:
+                self.invalidate(self.MODAL_RECT)
+            return
+        if state[0] != old[0]:
+            self.invalidate(self.GRID_RECT)
+        if state[1] != old[1]:
+            self.invalidate(self.PANEL_RECT)
+
+    def render(self) -> list[pygame.Rect]:
+        """Redessine uniquement les zones sales et retourne leurs rects."""
+        self.sync_dirty()
+        if not self._dirty:
+            return []
+        rects, self._dirty = self._dirty, []
+        if rects[0] == self.screen.get_rect():
+            self.draw()
+            return rects
+        for rect in rects:
+            self.screen.set_clip(rect)
+            if rect == self.MODAL_RECT:
+                self._draw_modal(box_only=True)
+            elif rect == self.GRID_RECT:
+                self.screen.fill(BLACK, rect)
+                draw_grid(self.screen, self.grid, (self.player.row, self.player.col),
+                          (self.player.sel_row, self.player.sel_col), self.camera)
+                draw_message(self.screen, self.font, self.message)
+            elif rect == self.PANEL_RECT:
+                draw_inventory(self.screen, self.inventory, self.font)
+            else:
+                self.draw()
+        self.screen.set_clip(None)
+        return rects
+
     def draw(self):
         self.screen.fill(BLACK)
         draw_grid(self.screen, self.grid, (self.player.row, self.player.col),
-                  (self.player.sel_row, self.player.sel_col))
+                  (self.player.sel_row, self.player.sel_col), self.camera)
         draw_inventory(self.screen, self.inventory, self.font)
         draw_message(self.screen, self.font, self.message)
         if self.in_modal and self.modal_options:
             self._draw_modal()
 
-    def _draw_modal(self):
-        """Draw modal with room name, color, and cost"""
-        overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
+    def _draw_modal(self, box_only: bool = False):
+        """Draw modal with room name, color, and cost (box_only: skip the overlay)"""
+        if not box_only:
+            overlay = ui_resources.overlay((WINDOW_WIDTH, WINDOW_HEIGHT), (0, 0, 0, 180))
+            self.screen.blit(overlay, (0, 0))
 
-        w, h = 620, 280
-        x = (WINDOW_WIDTH - w) // 2
-        y = (WINDOW_HEIGHT - h) // 2
+        x, y, w, h = self.MODAL_RECT
         pygame.draw.rect(self.screen, WHITE, (x, y, w, h))
         pygame.draw.rect(self.screen, BLACK, (x, y, w, h), 3)
 
         # Title
-        title_txt = self.large_font.render("Choisissez une salle:", True, BLACK)
+        title_txt = render_text(self.large_font, "Choisissez une salle:", True, BLACK)
         self.screen.blit(title_txt, (x + 20, y + 15))
 
         spacing = 20
@@ -326,24 +334,24 @@ class GameManager:
             pygame.draw.rect(self.screen, BLACK, rect, 2)
             
             # Room name
-            name_txt = self.font.render(room.name, True, BLACK)
+            name_txt = render_text(self.font, room.name, True, BLACK)
             self.screen.blit(name_txt, (rect.x + 6, rect.y + 6))
             
             # Color type
-            color_txt = self.font.render(f"({room.color_type})", True, BLACK)
+            color_txt = render_text(self.font, f"({room.color_type})", True, BLACK)
             self.screen.blit(color_txt, (rect.x + 6, rect.y + 26))
             
             # Gem cost
-            cost_txt = self.font.render(f"Cout: {room.cost_gems} gemmes", True, BLACK)
+            cost_txt = render_text(self.font, f"Cout: {room.cost_gems} gemmes", True, BLACK)
             self.screen.blit(cost_txt, (rect.x + 6, rect.y + 46))
             
             # Rarity
-            rarity_txt = self.font.render(f"Rarete: {room.rarity}/3", True, BLACK)
+            rarity_txt = render_text(self.font, f"Rarete: {room.rarity}/3", True, BLACK)
             self.screen.blit(rarity_txt, (rect.x + 6, rect.y + 66))
             
             # Key requirement indicator
             if room.effect_data.get("requires_key_to_enter", False):
-                key_txt = self.font.render("Cle requise!", True, (200, 0, 0))
+                key_txt = render_text(self.font, "Cle requise!", True, (200, 0, 0))
                 self.screen.blit(key_txt, (rect.x + 6, rect.y + 86))
             
             # Highlight if selected
@@ -1,9 +1,8 @@
-import os
-import random
-import pygame
+import weakref
+from collections import deque
 
-ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
-ROOM_DIR = os.path.join(ROOT_DIR, "rooms")
+from door import (ALL_DOORS, BIT_DELTAS, DOOR_STEPS, E, N, W, DisjointSet, door_bit,
+                  opposite, orient)
 
 # Colors
 ROOM_COLORS = {
@@ -21,7 +20,8 @@ ROOM_COLORS = {
 # ----------------------------
 class Room:
     def __init__(self, name, image_name=None, room_type="normal", cost_gems=0,
-                 effect_data=None, color_type="neutral", rarity=0):
+                 effect_data=None, color_type="neutral", rarity=0,
+                 doors=ALL_DOORS, locked_doors=0):
         """
         :param name: nombre de la sala
         :param image_name: nombre archivo PNG
@@ -30,6 +30,8 @@ class Room:
         :param effect_data: diccionario con efectos (keys, gems, gold, food, etc.)
         :param color_type: "yellow", "green", "violet", "orange", "red", "blue", "neutral"
         :param rarity: 0 a 3 (0 más común, divide probabilidad por 3 cada nivel)
+        :param doors: máscara de puertas N=1, E=2, S=4, W=8 (ver door.py)
+        :param locked_doors: puertas cerradas con llave (subconjunto de doors)
         """
         self.name = name
         self.image_name = image_name
@@ -38,16 +40,38 @@ class Room:
         self.effect_data = effect_data if effect_data else {}
         self.color_type = color_type
         self.rarity = rarity
+        self.doors = doors
+        self.locked_doors = locked_doors & doors
 
-        self.image = None
-        if image_name:
-            full_path = os.path.join(ROOM_DIR, image_name)
-            if os.path.exists(full_path):
-                self.image = pygame.image.load(full_path).convert_alpha()
+        # L'image est prise dans le registre au premier accès (voir image)
+        self._image = None
+        self._image_bound = False
 
         # Asignar color según color_type
         self.color = ROOM_COLORS.get(color_type, ROOM_COLORS["neutral"])
 
+    @property
+    def image(self):
+        """
+        Image partagée du registre, obtenue au premier accès seulement.
+        Sans affichage (simulation, tests) aucune image n'est jamais chargée
+        et pygame n'est pas importé. None tant que l'image est en cours de
+        décodage en arrière-plan (ImageRegistry.prefetch).
+        """
+        if not self._image_bound:
+            if not self.image_name:
+                self._image_bound = True
+                return None
+            from asset_cache import room_images
+            if room_images.is_pending(self.image_name):
+                # Still decoding in the background: try again next frame
+                return None
+            self._image_bound = True
+            self._image = room_images.acquire(self.image_name)
+            if self._image is not None:
+                weakref.finalize(self, room_images.release, self.image_name)
+        return self._image
+
     def get_probability_weight(self) -> float:
         """
         Calcula el peso de probabilidad según rareza.
@@ -65,62 +89,463 @@ class Room:
         }
         return rarity_names.get(self.rarity, f"Rareté {self.rarity}")
 
+# ----------------------------
+# Chunks
+# ----------------------------
+# Chunks of CHUNK_SIZE x CHUNK_SIZE cells (power of two: index by shifts)
+CHUNK_SHIFT = 4
+CHUNK_SIZE = 1 << CHUNK_SHIFT
+CHUNK_MASK = CHUNK_SIZE - 1
+
+
+class Chunk:
+    """
+    Bloc de CHUNK_SIZE x CHUNK_SIZE cases, alloué à la première case écrite.
+    La case (ligne, colonne) du bloc est à l'indice (ligne << CHUNK_SHIFT) | colonne.
+    """
+
+    __slots__ = ("rooms", "discovered")
+
+    def __init__(self):
+        self.rooms = [None] * (CHUNK_SIZE * CHUNK_SIZE)
+        self.discovered = bytearray(CHUNK_SIZE * CHUNK_SIZE)
+
+    def used(self):
+        """Indices des cases non vierges (salle ou découverte)."""
+        rooms, discovered = self.rooms, self.discovered
+        return [i for i in range(CHUNK_SIZE * CHUNK_SIZE) if discovered[i] or rooms[i] is not None]
+
+
 # ----------------------------
 # Grid
 # ----------------------------
 class Grid:
+    """
+    Manoir : salles placées + cases découvertes.
+
+    Stockage creux : les cases sont rangées par chunks de CHUNK_SIZE x
+    CHUNK_SIZE alloués seulement là où une case est écrite, la mémoire suit
+    donc le nombre de salles et pas la surface (rows x cols). iter_chunks /
+    iter_cells ne parcourent que ces chunks (sauvegarde, rendu, index).
+
+    Index de déplacement tenu à jour de façon incrémentale (dicts / sets creux) :
+    une case est praticable si elle contient une salle découverte, deux salles
+    voisines sont reliées si leurs portes se font face sans verrou (door.py) ;
+    _sets regroupe les salles reliées (union-find), _dist donne la distance
+    (en pas) jusqu'à exit_pos, _reachable les salles atteignables depuis
+    start_pos et _frontier les cases non praticables derrière une porte d'une
+    salle atteignable. Placer ou découvrir une salle, ouvrir un verrou ne met
+    à jour que les cases dont la valeur change.
+    """
+
     def __init__(self, rows, cols):
         self.rows = rows
         self.cols = cols
-        self.grid = [[None for _ in range(cols)] for _ in range(rows)]
-        self.discovered = [[False for _ in range(cols)] for _ in range(rows)]
+        # (chunk row, chunk col) -> Chunk, only where a cell was set
+        self._chunks = {}
+        # Journal de sauvegarde (save_journal.SaveJournal) notifié des changements
+        self.journal = None
 
         # Entree 
         self.start_pos = (rows - 1, 0)
-        self.grid[rows - 1][0] = Room(
+        self.load_cell(rows - 1, 0, Room(
             "Entrée", 
             image_name="entry.png", 
             room_type="start", 
             color_type="blue",
-            rarity=0
-        )
-        self.discovered[rows - 1][0] = True
+            rarity=0,
+            doors=N | E | W
+        ))
 
         # Sortie 
         exit_r = 0
         exit_c = cols // 2
         self.exit_pos = (exit_r, exit_c)
-        self.grid[exit_r][exit_c] = Room(
+        self.load_cell(exit_r, exit_c, Room(
             "Antichambre", 
             image_name="sortie.png", 
             room_type="exit", 
             effect_data={"escape": True}, 
             color_type="blue",
             rarity=0
-        )
-        self.discovered[exit_r][exit_c] = True
+        ))
+
+        self.rebuild_index()
+
+    # ----------------------------
+    # Chunk storage
+    # ----------------------------
+    def _chunk_for(self, r, c):
+        """Chunk contenant (r, c), créé au besoin."""
+        key = (r >> CHUNK_SHIFT, c >> CHUNK_SHIFT)
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            chunk = self._chunks[key] = Chunk()
+        return chunk
+
+    def iter_chunks(self):
+        """(première ligne, première colonne, Chunk) des chunks alloués."""
+        for (cr, cc), chunk in self._chunks.items():
+            yield cr << CHUNK_SHIFT, cc << CHUNK_SHIFT, chunk
+
+    def iter_cells(self):
+        """
+        (r, c, room, découverte) pour chaque case non vierge (salle ou découverte),
+        en ne parcourant que les chunks alloués.
+        """
+        for r0, c0, chunk in self.iter_chunks():
+            rooms, discovered = chunk.rooms, chunk.discovered
+            for i in chunk.used():
+                yield r0 + (i >> CHUNK_SHIFT), c0 + (i & CHUNK_MASK), rooms[i], bool(discovered[i])
+
+    def iter_region(self, r0, r1, c0, c1):
+        """
+        Comme iter_cells, limité aux lignes r0..r1-1 et colonnes c0..c1-1 : seuls
+        les chunks qui recoupent la zone sont consultés (rendu de la partie visible).
+        """
+        for cr in range(r0 >> CHUNK_SHIFT, ((r1 - 1) >> CHUNK_SHIFT) + 1):
+            for cc in range(c0 >> CHUNK_SHIFT, ((c1 - 1) >> CHUNK_SHIFT) + 1):
+                chunk = self._chunks.get((cr, cc))
+                if chunk is None:
+                    continue
+                base_r, base_c = cr << CHUNK_SHIFT, cc << CHUNK_SHIFT
+                rooms, discovered = chunk.rooms, chunk.discovered
+                for i in chunk.used():
+                    r, c = base_r + (i >> CHUNK_SHIFT), base_c + (i & CHUNK_MASK)
+                    if r0 <= r < r1 and c0 <= c < c1:
+                        yield r, c, rooms[i], bool(discovered[i])
+
+    @property
+    def chunk_count(self):
+        return len(self._chunks)
+
+    def clear(self):
+        """Vide toutes les cases (chargement d'une sauvegarde, voir load_cell)."""
+        self._chunks.clear()
+
+    def load_cell(self, r, c, room, discovered=True):
+        """
+        Écrit une case sans journal ni mise à jour de l'index : pour remplir la
+        grille d'un coup (chargement), suivi d'un appel à rebuild_index().
+        """
+        if room is None and not discovered:
+            # Blank cell: never allocate a chunk for it
+            chunk = self._chunks.get((r >> CHUNK_SHIFT, c >> CHUNK_SHIFT))
+            if chunk is None:
+                return
+        else:
+            chunk = self._chunk_for(r, c)
+        i = ((r & CHUNK_MASK) << CHUNK_SHIFT) | (c & CHUNK_MASK)
+        chunk.rooms[i] = room
+        chunk.discovered[i] = discovered
 
     # Getters
     def get_room(self, r, c):
         if 0 <= r < self.rows and 0 <= c < self.cols:
-            return self.grid[r][c]
+            chunk = self._chunks.get((r >> CHUNK_SHIFT, c >> CHUNK_SHIFT))
+            if chunk is not None:
+                return chunk.rooms[((r & CHUNK_MASK) << CHUNK_SHIFT) | (c & CHUNK_MASK)]
         return None
 
     def is_discovered(self, r, c):
-        return self.discovered[r][c]
+        chunk = self._chunks.get((r >> CHUNK_SHIFT, c >> CHUNK_SHIFT))
+        return chunk is not None and bool(
+            chunk.discovered[((r & CHUNK_MASK) << CHUNK_SHIFT) | (c & CHUNK_MASK)])
 
     # Set room
     def set_room(self, r, c, room):
         """Coloca una room en la posición especificada"""
         if (r, c) == self.exit_pos:
             return False
-        self.grid[r][c] = room
-        self.discovered[r][c] = True
+        replaced = (r, c) in self._passable
+        self.load_cell(r, c, room)
+        if room is None or replaced:
+            # Removal / replacement (never happens in play): doors may close, recompute
+            self.rebuild_index()
+        else:
+            self._open_cell((r, c))
+        if self.journal is not None:
+            self.journal.room_placed(r, c, room)
         return True
 
     def discover(self, r, c):
         if 0 <= r < self.rows and 0 <= c < self.cols:
-            self.discovered[r][c] = True
+            room = self.get_room(r, c)
+            self.load_cell(r, c, room)
+            if room is not None and (r, c) not in self._passable:
+                self._open_cell((r, c))
+            if self.journal is not None:
+                self.journal.cell_discovered(r, c)
 
     def in_bounds(self, r, c):
-        return 0 <= r < self.rows and 0 <= c < self.cols
\ No newline at end of file
+        return 0 <= r < self.rows and 0 <= c < self.cols
+
+    # ----------------------------
+    # Doors
+    # ----------------------------
+    def door_between(self, r, c, nr, nc):
+        """
+        Passage de (r, c) vers la case voisine (nr, nc) : la salle de départ a une
+        porte de ce côté et, si la case d'arrivée a une salle, celle-ci a la porte
+        d'en face. Deux tests de bits, aucun parcours de la grille.
+        """
+        bit = door_bit((r, c), (nr, nc))
+        room = self.get_room(r, c)
+        if not bit or room is None or not room.doors & bit or not self.in_bounds(nr, nc):
+            return False
+        other = self.get_room(nr, nc)
+        return other is None or bool(other.doors & opposite(bit))
+
+    def door_locked(self, r, c, nr, nc):
+        """La porte entre (r, c) et (nr, nc) est verrouillée (d'un côté ou de l'autre)."""
+        bit = door_bit((r, c), (nr, nc))
+        room = self.get_room(r, c)
+        other = self.get_room(nr, nc)
+        return bool((room is not None and room.locked_doors & bit)
+                    or (other is not None and other.locked_doors & opposite(bit)))
+
+    def unlock_door(self, r, c, nr, nc):
+        """Déverrouille la porte entre (r, c) et (nr, nc) des deux côtés."""
+        bit = door_bit((r, c), (nr, nc))
+        for pos, b in (((r, c), bit), ((nr, nc), opposite(bit))):
+            room = self.get_room(*pos)
+            if room is not None:
+                room.locked_doors &= ~b
+        if ((r, c) in self._passable and (nr, nc) in self._passable
+                and self._linked((r, c), (nr, nc), opposite(bit))):
+            self._link_added((r, c), (nr, nc))
+        if self.journal is not None:
+            self.journal.door_unlocked(r, c, nr, nc)
+
+    def orient_room(self, r, c, room, from_pos):
+        """Tourne les portes de room pour qu'une porte donne sur from_pos (avant set_room)."""
+        entry = door_bit((r, c), from_pos)
+        if not entry:
+            return
+        room.doors, room.locked_doors = orient(
+            room.doors, room.locked_doors, entry,
+            lambda bit: self.in_bounds(r + BIT_DELTAS[bit][0], c + BIT_DELTAS[bit][1]))
+
+    # ----------------------------
+    # Movement index
+    # ----------------------------
+    def _door_cells(self, pos):
+        """(case voisine, bit de la porte d'en face) pour chaque porte de la salle en pos."""
+        r, c = pos
+        room = self.get_room(r, c)
+        if room is None:
+            return
+        doors = room.doors
+        for bit, dr, dc, back in DOOR_STEPS:
+            if doors & bit:
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < self.rows and 0 <= nc < self.cols:
+                    yield (nr, nc), back
+
+    def _linked(self, u, n, back):
+        """
+        Passage ouvert de u vers sa voisine n (back : bit de la porte de n vers u) :
+        portes face à face, non verrouillées.
+        """
+        a = self.get_room(*u)
+        b = self.get_room(*n)
+        return (a is not None and b is not None
+                and a.doors & ~a.locked_doors & opposite(back) != 0
+                and b.doors & ~b.locked_doors & back != 0)
+
+    def _links(self, pos):
+        """Salles praticables reliées à pos par une porte ouverte."""
+        room = self.get_room(*pos)
+        if room is None:
+            return
+        for n, back in self._door_cells(pos):
+            if n in self._passable and not room.locked_doors & opposite(back):
+                other = self.get_room(*n)
+                if other.doors & ~other.locked_doors & back:
+                    yield n
+
+    def rebuild_index(self):
+        """Recalcule tout l'index (après load_cell ; ne parcourt que les chunks alloués)."""
+        self._passable = {(r, c) for r, c, room, discovered in self.iter_cells()
+                          if room is not None and discovered}
+        self._sets = DisjointSet()
+        for pos in self._passable:
+            self._sets.add(pos)
+            for n in self._links(pos):
+                self._sets.add(n)
+                self._sets.union(pos, n)
+        self._dist = {}
+        self._reachable = set()
+        self._frontier = set()
+        if self.exit_pos in self._passable:
+            self._dist[self.exit_pos] = 0
+            self._relax_from([self.exit_pos])
+        if self.start_pos in self._passable:
+            self._reach_from(self.start_pos)
+
+    def _open_cell(self, pos):
+        """La case pos devient praticable : mise à jour locale des distances et de l'accessibilité."""
+        self._passable.add(pos)
+        self._frontier.discard(pos)
+        self._sets.add(pos)
+        links = list(self._links(pos))
+        for n in links:
+            self._sets.union(pos, n)
+
+        if pos == self.exit_pos:
+            self._dist[pos] = 0
+        else:
+            known = [self._dist[n] for n in links if n in self._dist]
+            if known:
+                self._dist[pos] = min(known) + 1
+        if pos in self._dist:
+            self._relax_from([pos])
+
+        if pos == self.start_pos or any(n in self._reachable for n in links):
+            self._reach_from(pos)
+
+    def _link_added(self, u, n):
+        """Une porte s'ouvre entre deux salles praticables (déverrouillage)."""
+        self._sets.union(u, n)
+        for a, b in ((u, n), (n, u)):
+            if a in self._dist and self._dist.get(b, self._dist[a] + 2) > self._dist[a] + 1:
+                self._dist[b] = self._dist[a] + 1
+                self._relax_from([b])
+        if (u in self._reachable) != (n in self._reachable):
+            self._reach_from(n if u in self._reachable else u)
+
+    def _relax_from(self, sources):
+        """BFS : propage les distances raccourcies (les passages ne font qu'être ajoutés)."""
+        queue = deque(sources)
+        while queue:
+            u = queue.popleft()
+            d = self._dist[u] + 1
+            for n in self._links(u):
+                if self._dist.get(n, d + 1) > d:
+                    self._dist[n] = d
+                    queue.append(n)
+
+    def _reach_from(self, pos):
+        """Ajoute la composante de pos aux salles atteignables et met à jour la frontière."""
+        self._reachable.add(pos)
+        queue = deque([pos])
+        while queue:
+            u = queue.popleft()
+            for n, back in self._door_cells(u):
+                if n not in self._passable:
+                    self._frontier.add(n)
+                elif n not in self._reachable and self._linked(u, n, back):
+                    self._reachable.add(n)
+                    queue.append(n)
+
+    def is_passable(self, r, c):
+        """Salle découverte où le joueur peut marcher."""
+        return (r, c) in self._passable
+
+    def is_reachable(self, r, c):
+        """Salle atteignable à pied depuis l'entrée."""
+        return (r, c) in self._reachable
+
+    def connected(self, a, b):
+        """Les salles a et b sont reliées par des portes ouvertes (union-find)."""
+        return self._sets.connected(a, b)
+
+    def exit_reachable(self):
+        """La sortie est reliée à l'entrée par des portes ouvertes."""
+        return self._sets.connected(self.start_pos, self.exit_pos)
+
+    def distance_to_exit(self, r, c):
+        """Nombre de pas jusqu'à la sortie par les portes ouvertes (None si pas de chemin)."""
+        return self._dist.get((r, c))
+
+    @property
+    def frontier(self):
+        """Cases fermées derrière une porte d'une salle atteignable (lecture seule)."""
+        return self._frontier
+
+    def valid_moves(self, r, c, locked=True):
+        """
+        Cases où aller depuis (r, c) : derrière une porte de la salle, vers une
+        case vide (ouvrir la porte) ou une salle qui a la porte d'en face.
+        Les portes verrouillées sont incluses (une clé les ouvre) sauf si locked=False.
+        """
+        room = self.get_room(r, c)
+        if room is None:
+            return []
+        doors = room.doors if locked else room.doors & ~room.locked_doors
+        moves = []
+        for bit, dr, dc, back in DOOR_STEPS:
+            if doors & bit:
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < self.rows and 0 <= nc < self.cols:
+                    other = self.get_room(nr, nc)
+                    if other is None or (other.doors & back
+                                         and (locked or not other.locked_doors & back)):
+                        moves.append((nr, nc))
+        return moves
+
+
+if __name__ == "__main__":
+    # Self-check: the incremental index must match a full rebuild_index()
+    import random
+    from door import ALL_DOORS as _ALL
+
+    def index_state(grid):
+        groups = {}
+        for pos in grid._passable:
+            groups.setdefault(grid._sets.find(pos), set()).add(pos)
+        return (dict(grid._dist), set(grid._reachable), set(grid._frontier),
+                {frozenset(g) for g in groups.values()})
+
+    def check(grid):
+        incremental = index_state(grid)
+        grid.rebuild_index()
+        return incremental == index_state(grid)
+
+    # Random games on the engine (doors, keys, locks, room effects)
+    from engine import GameEngine
+    GAMES, ACTIONS = 100, 150
+    tokens = ["U", "D", "L", "R", "E", "E", "0", "1", "2", "X"]
+    rng = random.Random(1)
+    checks = mismatches = 0
+    for _ in range(GAMES):
+        engine = GameEngine(seed=rng.getrandbits(32))
+        for _ in range(ACTIONS):
+            if engine.finished:
+                break
+            engine.execute(rng.choice(tokens))
+            checks += 1
+            mismatches += not check(engine.grid)
+    print(f"Engine games: {mismatches} mismatch(es) on {checks} checks")
+
+    # Random edits on a larger grid: mostly new rooms with many doors next to
+    # passable ones (so distances and reachability grow), some undiscovered
+    # rooms, unlocks and replaced rooms (full rebuild)
+    checks = mismatches = 0
+    for _ in range(10):
+        grid = Grid(20, 20)
+        for _ in range(300):
+            roll = rng.random()
+            empty = [(r, c) for r in range(grid.rows) for c in range(grid.cols)
+                     if grid.get_room(r, c) is None
+                     and any(grid.is_passable(r + dr, c + dc) for dr, dc in BIT_DELTAS.values())]
+            if roll < 0.7 and empty:
+                r, c = rng.choice(empty)
+                doors = _ALL & ~rng.choice([0, 0] + list(BIT_DELTAS))
+                locked = rng.choice(list(BIT_DELTAS)) & doors if rng.random() < 0.2 else 0
+                grid.set_room(r, c, Room("X", doors=doors, locked_doors=locked))
+                if rng.random() < 0.9:
+                    grid.discover(r, c)
+            else:
+                r, c = rng.randrange(grid.rows), rng.randrange(grid.cols)
+                if roll < 0.8:
+                    grid.discover(r, c)
+                elif roll < 0.95:
+                    dr, dc = rng.choice(list(BIT_DELTAS.values()))
+                    if grid.in_bounds(r + dr, c + dc):
+                        grid.unlock_door(r, c, r + dr, c + dc)
+                elif grid.get_room(r, c) is not None:
+                    grid.set_room(r, c, Room("Y", doors=rng.randrange(1, _ALL + 1)))
+            checks += 1
+            mismatches += not check(grid)
+    print(f"Random edits: {mismatches} mismatch(es) on {checks} checks")
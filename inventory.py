@@ -66,3 +66,19 @@ class Inventory:
     def is_dead(self) -> bool:
         """Perdu si plus de pas."""
         return self.steps <= 0
+
+
+class JournaledInventory(Inventory):
+    """
+    Inventaire dont chaque modification est notifiée au journal de sauvegarde
+    (voir save_journal.py). Inventory seul n'a pas ce coût : simulations.
+    """
+
+    # Journal de sauvegarde (pas un champ : hors de __eq__ / __repr__)
+    journal = None
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        journal = self.journal
+        if journal is not None and name != "journal":
+            journal.inventory_changed(name, value)
@@ -1,54 +1,115 @@
 # main.py
-"""Entry point with main menu, save and victory"""
+"""Entry point with main menu, save and victory
+
+Startup timings: python main.py --profile-startup (see startup_profile.py).
+"""
+
+from startup_profile import profiler
 
 import pygame
-import os
 from game_manager import GameManager
-from save_manager import save_game, load_game
-from menu import show_main_menu, draw_pause_overlay, show_victory_screen
-from constants import WINDOW_WIDTH, WINDOW_HEIGHT, FPS, BLACK
+from preloader import AssetPreloader
+from menu import show_main_menu, show_load_menu, draw_pause_overlay, show_victory_screen, CachedLayer
+from text_cache import render_text
+from ui_resources import ui_resources
+from asset_cache import room_images
+from constants import WINDOW_WIDTH, WINDOW_HEIGHT, FPS, IDLE_WAIT_MS, PREFETCH_POLL_MS
+
+# Events meaning the window content was lost and must be fully redrawn
+EXPOSE_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED)
 
 def main():
-    pygame.init()
-    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-    pygame.display.set_caption("Blue Prince - POO")
+    profiler.mark("imports")
+    # Only what the menu needs: the mixer is started by the preloader, after the first frame
+    with profiler.phase("pygame init (display, font)"):
+        pygame.display.init()
+        pygame.font.init()
+    with profiler.phase("set_mode"):
+        screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        pygame.display.set_caption("Blue Prince - POO")
     clock = pygame.time.Clock()
+    # Images, icons and sounds are decoded in the background while the menu is shown
+    preloader = AssetPreloader()
+    # Save subsystem, loaded when the first game starts
+    save_service = journal = None
     
+    # One session for the whole run: new games only reset its state
+    gm = None
     running = True
     
     while running:
         #  Display main menu
-        menu_choice = show_main_menu(screen)
+        menu_choice = show_main_menu(screen, preloader)
         
         if menu_choice == "quit":
             running = False
             break
+        # Usually already done while the menu was displayed
+        preloader.finish()
+
+        if save_service is None:
+            from save_manager import load_game, SaveService, SLOT_COUNT, slot_path, free_slot
+            from save_journal import SaveJournal
+            from replay import save_replay
+            # Saves are written on a background thread (never stalls a frame)
+            save_service = SaveService()
+            # Autosave = snapshot + journal of the changes of each turn
+            journal = SaveJournal(save_service)
+
+        filename = None
+        if menu_choice == "load":
+            filename = show_load_menu(screen)
+            if filename is None:
+                continue
+
+        # Ctrl+S writes to the loaded slot, or to a free one for a new game
+        slots = {slot_path(s): s for s in range(1, SLOT_COUNT + 1)}
+        current_slot = slots.get(filename) or free_slot()
         
         # Create new game or load
-        gm = GameManager()
+        if gm is None:
+            gm = GameManager()
+        else:
+            gm.reset()
         
-        if menu_choice == "load":
-            success = load_game(gm.grid, gm.inventory, gm.player)
+        if filename is not None:
+            success = load_game(gm.grid, gm.inventory, gm.player, filename)
             if success:
+                # State no longer follows from the seed: no replay for this game
+                gm.engine.stop_recording()
                 gm.message = "Partie chargée avec succès!"
+                # First frame shows room colours, images arrive in the background
+                gm.prefetch_room_images()
             else:
                 gm.message = "Aucune sauvegarde trouvée. Nouvelle partie."
+            gm.invalidate()
+        journal.attach(gm.grid, gm.inventory, gm.player)
         
         # Main game loop
         game_running = True
         paused = False
         victory = False
         game_over = False
+        overlay_state = (paused, victory, game_over)
         
         while game_running:
-            # Obtain events
-            events = pygame.event.get()
+            # Obtain events (block while there is nothing to redraw)
+            if gm.needs_redraw:
+                events = pygame.event.get()
+            else:
+                first = pygame.event.wait(PREFETCH_POLL_MS if room_images.has_pending
+                                          else IDLE_WAIT_MS)
+                events = [] if first.type == pygame.NOEVENT else [first]
+                events += pygame.event.get()
             
             # Manage global events first
             for event in events:
                 if event.type == pygame.QUIT:
                     game_running = False
                     running = False
+
+                elif event.type in EXPOSE_EVENTS:
+                    gm.invalidate()
                 
                 elif event.type == pygame.KEYDOWN:
 
@@ -57,7 +118,10 @@ def main():
                             game_running = False  
                         elif event.key == pygame.K_r:
 
-                            gm = GameManager()
+                            gm.reset()
+                            journal.attach(gm.grid, gm.inventory, gm.player)
+                            # New game: Ctrl+S must not overwrite the loaded slot
+                            current_slot = free_slot()
                             victory = False
                             game_over = False
                             paused = False
@@ -69,8 +133,17 @@ def main():
                     # Save game (Ctrl+S)
                     elif event.key == pygame.K_s and pygame.key.get_mods() & pygame.KMOD_CTRL:
                         if not victory and not game_over:
-                            save_game(gm.grid, gm.inventory, gm.player)
-                            gm.message = "Partie sauvegardée!"
+                            if current_slot is None:
+                                # Every slot was taken when the game started: retry
+                                current_slot = free_slot()
+                            if current_slot is None:
+                                # Never overwrite the save of another game
+                                gm.message = f"Aucun emplacement libre ({SLOT_COUNT} sauvegardes)!"
+                            else:
+                                save_service.request_save(gm.grid, gm.inventory, gm.player,
+                                                          slot_path(current_slot))
+                                save_replay(gm.engine)
+                                gm.message = f"Partie sauvegardée (emplacement {current_slot})!"
                     
 
                     elif paused and event.key == pygame.K_ESCAPE:
@@ -90,8 +163,26 @@ def main():
 
                 if gm.inventory.is_dead():
                     game_over = True
+
+                if victory or game_over:
+                    save_replay(gm.engine)
+                    journal.detach(flush=False)
+                else:
+                    journal.flush()
             
-            gm.draw()
+            # Overlay shown / hidden: everything changes
+            if (paused, victory, game_over) != overlay_state:
+                overlay_state = (paused, victory, game_over)
+                gm.invalidate()
+
+            gm.sync_dirty()
+            if not gm.needs_redraw:
+                continue
+
+            # Overlays are translucent over the whole screen: redraw all under them
+            if paused or victory or game_over:
+                gm.invalidate()
+            dirty_rects = gm.render()
             
             if paused:
                 draw_pause_overlay(screen)
@@ -102,30 +193,43 @@ def main():
             if game_over:
                 show_game_over_screen(screen)
             
-            pygame.display.flip()
+            pygame.display.update(dirty_rects)
             clock.tick(FPS)
+
+        journal.detach()
     
+    if save_service is not None:
+        save_service.shutdown()
     pygame.quit()
 
 
-def show_game_over_screen(screen):
-    """Muestra pantalla de Game Over"""
-    font_large = pygame.font.SysFont("arial", 48, bold=True)
-    font_small = pygame.font.SysFont("arial", 24)
+def _build_game_over_layer(size):
+    w, h = size
+    font_large = ui_resources.font("arial", 48, bold=True)
+    font_small = ui_resources.font("arial", 24)
     
-    overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 200))
-    screen.blit(overlay, (0, 0))
+    layer = pygame.Surface(size, pygame.SRCALPHA)
+    layer.fill((0, 0, 0, 200))
     
-    title = font_large.render("GAME OVER", True, (255, 50, 50))
-    subtitle = font_small.render("Vous n'avez plus de pas!", True, (255, 255, 255))
-    hint1 = font_small.render("ESC - Retour au menu", True, (200, 200, 200))
-    hint2 = font_small.render("R - Recommencer", True, (200, 200, 200))
+    title = render_text(font_large, "GAME OVER", True, (255, 50, 50))
+    subtitle = render_text(font_small, "Vous n'avez plus de pas!", True, (255, 255, 255))
+    hint1 = render_text(font_small, "ESC - Retour au menu", True, (200, 200, 200))
+    hint2 = render_text(font_small, "R - Recommencer", True, (200, 200, 200))
     
-    screen.blit(title, ((WINDOW_WIDTH - title.get_width()) // 2, 200))
-    screen.blit(subtitle, ((WINDOW_WIDTH - subtitle.get_width()) // 2, 270))
-    screen.blit(hint1, ((WINDOW_WIDTH - hint1.get_width()) // 2, 340))
-    screen.blit(hint2, ((WINDOW_WIDTH - hint2.get_width()) // 2, 380))
+    layer.blit(title, ((w - title.get_width()) // 2, 200))
+    layer.blit(subtitle, ((w - subtitle.get_width()) // 2, 270))
+    layer.blit(hint1, ((w - hint1.get_width()) // 2, 340))
+    layer.blit(hint2, ((w - hint2.get_width()) // 2, 380))
+    return layer
+
+
+_game_over_layer = CachedLayer(_build_game_over_layer)
+
+
+def show_game_over_screen(screen):
+    """Muestra pantalla de Game Over (composée une seule fois)"""
+    size = screen.get_size()
+    screen.blit(_game_over_layer.get(size, size), (0, 0))
 
 
 if __name__ == "__main__":
@@ -148,11 +252,12 @@ blue_prince/
 ├── constants.py               
 ├── menu.py                    
 ├── save_manager.py            
+├── save_format.py             
 ├── item.py                    
 ├── room.py                    
 ├── door.py                    
 ├── rooms_catalog.py           
-├── sound_manager.py           
+├── sound_managener.py         
 │
 ├── assets/
 │   ├── rooms/                 
@@ -190,5 +295,5 @@ blue_prince/
 │       └── effects/           
 │
 └── saves/                     
-    └── save.json              
+    └── save.bps               
 """
\ No newline at end of file
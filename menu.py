@@ -2,21 +2,73 @@
 
 
 import pygame
-from typing import Tuple
-from constants import WINDOW_WIDTH, WINDOW_HEIGHT
+from typing import Optional, Tuple
+from startup_profile import profiler
+from text_cache import render_text
+from ui_resources import ui_resources
 
 FONT_NAME = None  
 
-def show_main_menu(screen: pygame.Surface) -> str:
+
+class CachedLayer:
+    """
+    Écran pré-composé dans une surface, reconstruit seulement quand sa clé change.
+
+    build(size, *args) dessine la surface (taille de la fenêtre, SRCALPHA) ;
+    la clé doit résumer tout ce qui est affiché (taille, snapshot d'inventaire...).
+    """
+
+    def __init__(self, build):
+        self.build = build
+        self.key = None
+        self.surface = None
+
+    def get(self, key, size: Tuple[int, int], *args) -> pygame.Surface:
+        if self.surface is None or key != self.key:
+            self.surface = self.build(size, *args)
+            self.key = key
+        return self.surface
+
+    def clear(self):
+        self.key = None
+        self.surface = None
+
+
+def _new_layer(size: Tuple[int, int], rgba: Tuple[int, int, int, int]) -> pygame.Surface:
+    layer = pygame.Surface(size, pygame.SRCALPHA)
+    layer.fill(rgba)
+    return layer
+
+
+def inventory_snapshot(inventory) -> tuple:
+    """Valeurs affichées par l'écran de victoire (clé du cache)."""
+    return (inventory.steps, inventory.gold, inventory.gems, inventory.keys, inventory.dice,
+            inventory.shovel, inventory.hammer, inventory.picklock_kit,
+            inventory.metal_detector, inventory.rabbit_foot)
+
+def draw_preload_progress(screen: pygame.Surface, preloader, y: int):
+    """Barre de progression du préchargement des ressources."""
+    w = screen.get_width()
+    tiny = ui_resources.font("arial", 16)
+    bar = pygame.Rect((w - 300) // 2, y, 300, 8)
+    pygame.draw.rect(screen, (60, 60, 90), bar)
+    pygame.draw.rect(screen, (150, 200, 255), (bar.x, bar.y, int(bar.w * preloader.progress), bar.h))
+    txt = render_text(tiny, f"Chargement des ressources... {int(preloader.progress * 100)}%",
+                      True, (150, 150, 150))
+    screen.blit(txt, ((w - txt.get_width()) // 2, y + 14))
+
+
+def show_main_menu(screen: pygame.Surface, preloader=None) -> str:
     """
     Muestra un menú simple. Devuelve 'new', 'load' o 'quit'.
     Bloqueante - espera la selección del usuario.
+    Si se da un preloader (preloader.AssetPreloader), se arranca después de
+    la primera imagen; sus recursos se registran en cada frame y se muestra
+    el progreso.
     """
     clock = pygame.time.Clock()
     w, h = screen.get_size()
-    font = pygame.font.SysFont("arial", 32, bold=True)
-    small = pygame.font.SysFont("arial", 20)
-    tiny = pygame.font.SysFont("arial", 16)
+    small = ui_resources.font("arial", 20)
     
     selected = 0
     options = ["Nouvelle Partie", "Charger Partie", "Quitter"]
@@ -40,13 +92,8 @@ def show_main_menu(screen: pygame.Surface) -> str:
                         return "quit"
         
 
-        screen.fill((10, 10, 30))
-        
-        title = font.render(" BLUE PRINCE", True, (150, 200, 255))
-        screen.blit(title, ((w - title.get_width()) // 2, 80))
-        
-        subtitle = tiny.render("Projet POO 2025", True, (180, 180, 180))
-        screen.blit(subtitle, ((w - subtitle.get_width()) // 2, 130))
+        # Static background (title, hints) composed once
+        screen.blit(_menu_background.get((w, h), (w, h)), (0, 0))
         
         for i, opt in enumerate(options):
             if i == selected:
@@ -56,68 +103,154 @@ def show_main_menu(screen: pygame.Surface) -> str:
                 color = (200, 200, 200)
                 prefix = "  "
             
-            txt = small.render(prefix + opt, True, color)
+            txt = render_text(small, prefix + opt, True, color)
             screen.blit(txt, ((w - txt.get_width()) // 2, 220 + i * 50))
-        
-        hint1 = tiny.render("↑↓ ou Z/S pour naviguer", True, (150, 150, 150))
-        hint2 = tiny.render("Entrée pour sélectionner", True, (150, 150, 150))
-        screen.blit(hint1, ((w - hint1.get_width()) // 2, h - 80))
-        screen.blit(hint2, ((w - hint2.get_width()) // 2, h - 55))
-        
 
-        save_hint = tiny.render("Ctrl+S pour sauvegarder pendant le jeu", True, (100, 150, 100))
-        screen.blit(save_hint, ((w - save_hint.get_width()) // 2, h - 25))
+        if preloader is not None and not preloader.done:
+            preloader.poll()
+            draw_preload_progress(screen, preloader, 400)
         
         pygame.display.flip()
+        profiler.first_frame()
+        if preloader is not None:
+            preloader.start()
         clock.tick(30)
 
 
-def draw_pause_overlay(screen: pygame.Surface):
-    """Dibuja overlay de pausa (no bloqueante)."""
+def slot_label(index: int, info: Optional[dict]) -> str:
+    """Ligne affichée pour un emplacement (info None = vide)."""
+    name = f"Emplacement {index + 1}"
+    if info is None:
+        return f"{name} - vide"
+    if info["slot"] is None:
+        name = "Sauvegarde auto"
+    return (f"{name} - {info['save_date']}   Pas {info['steps']}   "
+            f"Or {info['gold']}   Gemmes {info['gems']}")
+
+
+def show_load_menu(screen: pygame.Surface) -> Optional[str]:
+    """
+    Liste des emplacements de sauvegarde. Devuelve el archivo elegido,
+    o None para volver al menú principal.
+    Les infos viennent des en-têtes des sauvegardes (aucune grille lue).
+    """
+    from save_manager import list_slots
+
+    clock = pygame.time.Clock()
     w, h = screen.get_size()
-    overlay = pygame.Surface((w, h), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 150))
-    screen.blit(overlay, (0, 0))
+    small = ui_resources.font("arial", 20)
+
+    slots = list_slots()
+    autosave = slots.pop()
+    entries = list(enumerate(slots))
+    if autosave is not None:
+        entries.append((len(slots), autosave))
+    labels = [slot_label(i, info) for i, info in entries] + ["Retour"]
+    selected = 0
+
+    while True:
+        for ev in pygame.event.get():
+            if ev.type == pygame.QUIT:
+                return None
+            if ev.type == pygame.KEYDOWN:
+                if ev.key == pygame.K_ESCAPE:
+                    return None
+                if ev.key in (pygame.K_UP, pygame.K_z):
+                    selected = (selected - 1) % len(labels)
+                elif ev.key in (pygame.K_DOWN, pygame.K_s):
+                    selected = (selected + 1) % len(labels)
+                elif ev.key == pygame.K_RETURN or ev.key == pygame.K_SPACE:
+                    if selected == len(entries):
+                        return None
+                    info = entries[selected][1]
+                    if info is not None:
+                        return info["filename"]
+
+        screen.blit(_menu_background.get((w, h), (w, h)), (0, 0))
+
+        for i, label in enumerate(labels):
+            empty = i < len(entries) and entries[i][1] is None
+            if i == selected:
+                color = (255, 255, 100)
+                prefix = "▶ "
+            else:
+                color = (120, 120, 120) if empty else (200, 200, 200)
+                prefix = "  "
+
+            txt = render_text(small, prefix + label, True, color)
+            screen.blit(txt, ((w - txt.get_width()) // 2, 180 + i * 42))
+
+        pygame.display.flip()
+        clock.tick(30)
+
+
+def _build_menu_background(size: Tuple[int, int]) -> pygame.Surface:
+    w, h = size
+    layer = pygame.Surface(size)
+    layer.fill((10, 10, 30))
+    font = ui_resources.font("arial", 32, bold=True)
+    tiny = ui_resources.font("arial", 16)
+
+    title = render_text(font, " BLUE PRINCE", True, (150, 200, 255))
+    layer.blit(title, ((w - title.get_width()) // 2, 80))
+
+    subtitle = render_text(tiny, "Projet POO 2025", True, (180, 180, 180))
+    layer.blit(subtitle, ((w - subtitle.get_width()) // 2, 130))
+
+    hint1 = render_text(tiny, "↑↓ ou Z/S pour naviguer", True, (150, 150, 150))
+    hint2 = render_text(tiny, "Entrée pour sélectionner", True, (150, 150, 150))
+    layer.blit(hint1, ((w - hint1.get_width()) // 2, h - 80))
+    layer.blit(hint2, ((w - hint2.get_width()) // 2, h - 55))
+
+    save_hint = render_text(tiny, "Ctrl+S pour sauvegarder pendant le jeu", True, (100, 150, 100))
+    layer.blit(save_hint, ((w - save_hint.get_width()) // 2, h - 25))
+    return layer.convert()
+
+
+def _build_pause_layer(size: Tuple[int, int]) -> pygame.Surface:
+    w, h = size
+    layer = _new_layer((w, h), (0, 0, 0, 150))
     
-    font_large = pygame.font.SysFont("arial", 36, bold=True)
-    font_small = pygame.font.SysFont("arial", 20)
+    font_large = ui_resources.font("arial", 36, bold=True)
+    font_small = ui_resources.font("arial", 20)
     
-    title = font_large.render("⏸  PAUSE", True, (255, 255, 255))
-    screen.blit(title, ((w - title.get_width()) // 2, h // 2 - 60))
+    title = render_text(font_large, "⏸  PAUSE", True, (255, 255, 255))
+    layer.blit(title, ((w - title.get_width()) // 2, h // 2 - 60))
     
-    hint1 = font_small.render("P - Reprendre", True, (200, 200, 200))
-    hint2 = font_small.render("Ctrl+S - Sauvegarder", True, (200, 200, 200))
-    hint3 = font_small.render("ESC - Quitter au menu", True, (200, 200, 200))
+    hint1 = render_text(font_small, "P - Reprendre", True, (200, 200, 200))
+    hint2 = render_text(font_small, "Ctrl+S - Sauvegarder", True, (200, 200, 200))
+    hint3 = render_text(font_small, "ESC - Quitter au menu", True, (200, 200, 200))
     
-    screen.blit(hint1, ((w - hint1.get_width()) // 2, h // 2))
-    screen.blit(hint2, ((w - hint2.get_width()) // 2, h // 2 + 35))
-    screen.blit(hint3, ((w - hint3.get_width()) // 2, h // 2 + 70))
+    layer.blit(hint1, ((w - hint1.get_width()) // 2, h // 2))
+    layer.blit(hint2, ((w - hint2.get_width()) // 2, h // 2 + 35))
+    layer.blit(hint3, ((w - hint3.get_width()) // 2, h // 2 + 70))
+    return layer
 
 
-def show_victory_screen(screen: pygame.Surface, inventory):
-    """
-    Écran de victoire lorsque vous atteignez la ligne d'arrivée.
-    Affiche les statistiques finales.
-    """
-    w, h = screen.get_size()
-    overlay = pygame.Surface((w, h), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 200))
-    screen.blit(overlay, (0, 0))
+def draw_pause_overlay(screen: pygame.Surface):
+    """Dibuja overlay de pausa (no bloqueante)."""
+    size = screen.get_size()
+    screen.blit(_pause_layer.get(size, size), (0, 0))
+
+
+def _build_victory_layer(size: Tuple[int, int], inventory) -> pygame.Surface:
+    w, h = size
+    layer = _new_layer((w, h), (0, 0, 0, 200))
     
-    font_huge = pygame.font.SysFont("arial", 56, bold=True)
-    font_large = pygame.font.SysFont("arial", 28, bold=True)
-    font_medium = pygame.font.SysFont("arial", 22)
-    font_small = pygame.font.SysFont("arial", 18)
+    font_huge = ui_resources.font("arial", 56, bold=True)
+    font_large = ui_resources.font("arial", 28, bold=True)
+    font_medium = ui_resources.font("arial", 22)
+    font_small = ui_resources.font("arial", 18)
     
-    title = font_huge.render(" VICTOIRE! ", True, (255, 215, 0))
-    screen.blit(title, ((w - title.get_width()) // 2, 60))
+    title = render_text(font_huge, " VICTOIRE! ", True, (255, 215, 0))
+    layer.blit(title, ((w - title.get_width()) // 2, 60))
     
-    subtitle = font_large.render("Vous avez atteint l'Antichambre!", True, (200, 255, 200))
-    screen.blit(subtitle, ((w - subtitle.get_width()) // 2, 130))
+    subtitle = render_text(font_large, "Vous avez atteint l'Antichambre!", True, (200, 255, 200))
+    layer.blit(subtitle, ((w - subtitle.get_width()) // 2, 130))
     
     stats_y = 200
-    stats_title = font_medium.render(" Statistiques finales:", True, (255, 255, 255))
-    screen.blit(stats_title, ((w - stats_title.get_width()) // 2, stats_y))
+    stats_title = render_text(font_medium, " Statistiques finales:", True, (255, 255, 255))
+    layer.blit(stats_title, ((w - stats_title.get_width()) // 2, stats_y))
     
     stats = [
         f"Pas restants: {inventory.steps}",
@@ -129,13 +262,13 @@ def show_victory_screen(screen: pygame.Surface, inventory):
     
     stats_y += 50
     for stat in stats:
-        txt = font_small.render(stat, True, (220, 220, 220))
-        screen.blit(txt, ((w - txt.get_width()) // 2, stats_y))
+        txt = render_text(font_small, stat, True, (220, 220, 220))
+        layer.blit(txt, ((w - txt.get_width()) // 2, stats_y))
         stats_y += 30
     
     perms_y = stats_y + 20
-    perms_title = font_medium.render(" Objets obtenus:", True, (255, 255, 255))
-    screen.blit(perms_title, ((w - perms_title.get_width()) // 2, perms_y))
+    perms_title = render_text(font_medium, " Objets obtenus:", True, (255, 255, 255))
+    layer.blit(perms_title, ((w - perms_title.get_width()) // 2, perms_y))
     
     perms = []
     if inventory.shovel:
@@ -152,41 +285,63 @@ def show_victory_screen(screen: pygame.Surface, inventory):
     if perms:
         perms_y += 40
         for perm in perms:
-            txt = font_small.render(perm, True, (150, 255, 150))
-            screen.blit(txt, ((w - txt.get_width()) // 2, perms_y))
+            txt = render_text(font_small, perm, True, (150, 255, 150))
+            layer.blit(txt, ((w - txt.get_width()) // 2, perms_y))
             perms_y += 28
     else:
         perms_y += 40
-        txt = font_small.render("Aucun objet permanent", True, (180, 180, 180))
-        screen.blit(txt, ((w - txt.get_width()) // 2, perms_y))
+        txt = render_text(font_small, "Aucun objet permanent", True, (180, 180, 180))
+        layer.blit(txt, ((w - txt.get_width()) // 2, perms_y))
     
     hint_y = h - 80
-    hint1 = font_medium.render("ESC - Retour au menu", True, (200, 200, 200))
-    hint2 = font_medium.render("R - Rejouer", True, (200, 200, 200))
+    hint1 = render_text(font_medium, "ESC - Retour au menu", True, (200, 200, 200))
+    hint2 = render_text(font_medium, "R - Rejouer", True, (200, 200, 200))
     
-    screen.blit(hint1, ((w - hint1.get_width()) // 2, hint_y))
-    screen.blit(hint2, ((w - hint2.get_width()) // 2, hint_y + 35))
+    layer.blit(hint1, ((w - hint1.get_width()) // 2, hint_y))
+    layer.blit(hint2, ((w - hint2.get_width()) // 2, hint_y + 35))
+    return layer
 
 
-def show_game_over_screen(screen: pygame.Surface):
-    """Pantalla de derrota"""
-    w, h = screen.get_size()
-    overlay = pygame.Surface((w, h), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 200))
-    screen.blit(overlay, (0, 0))
+def show_victory_screen(screen: pygame.Surface, inventory):
+    """
+    Écran de victoire lorsque vous atteignez la ligne d'arrivée.
+    Affiche les statistiques finales.
+    La surface est composée une fois et réutilisée tant que l'inventaire ne change pas.
+    """
+    size = screen.get_size()
+    screen.blit(_victory_layer.get((size, inventory_snapshot(inventory)), size, inventory), (0, 0))
+
+
+def _build_game_over_layer(size: Tuple[int, int]) -> pygame.Surface:
+    w, h = size
+    layer = _new_layer((w, h), (0, 0, 0, 200))
     
-    font_huge = pygame.font.SysFont("arial", 56, bold=True)
-    font_large = pygame.font.SysFont("arial", 28)
-    font_medium = pygame.font.SysFont("arial", 22)
+    font_huge = ui_resources.font("arial", 56, bold=True)
+    font_large = ui_resources.font("arial", 28)
+    font_medium = ui_resources.font("arial", 22)
     
-    title = font_huge.render(" GAME OVER ", True, (255, 80, 80))
-    screen.blit(title, ((w - title.get_width()) // 2, 180))
+    title = render_text(font_huge, " GAME OVER ", True, (255, 80, 80))
+    layer.blit(title, ((w - title.get_width()) // 2, 180))
     
-    subtitle = font_large.render("Vous n'avez plus de pas!", True, (255, 255, 255))
-    screen.blit(subtitle, ((w - subtitle.get_width()) // 2, 260))
+    subtitle = render_text(font_large, "Vous n'avez plus de pas!", True, (255, 255, 255))
+    layer.blit(subtitle, ((w - subtitle.get_width()) // 2, 260))
     
-    hint1 = font_medium.render("ESC - Retour au menu", True, (200, 200, 200))
-    hint2 = font_medium.render("R - Recommencer", True, (200, 200, 200))
+    hint1 = render_text(font_medium, "ESC - Retour au menu", True, (200, 200, 200))
+    hint2 = render_text(font_medium, "R - Recommencer", True, (200, 200, 200))
     
-    screen.blit(hint1, ((w - hint1.get_width()) // 2, 350))
-    screen.blit(hint2, ((w - hint2.get_width()) // 2, 390))
\ No newline at end of file
+    layer.blit(hint1, ((w - hint1.get_width()) // 2, 350))
+    layer.blit(hint2, ((w - hint2.get_width()) // 2, 390))
+    return layer
+
+
+def show_game_over_screen(screen: pygame.Surface):
+    """Pantalla de derrota"""
+    size = screen.get_size()
+    screen.blit(_game_over_layer.get(size, size), (0, 0))
+
+
+# Pre-composed screens (rebuilt only when their key changes)
+_menu_background = CachedLayer(_build_menu_background)
+_pause_layer = CachedLayer(_build_pause_layer)
+_victory_layer = CachedLayer(_build_victory_layer)
+_game_over_layer = CachedLayer(_build_game_over_layer)
@@ -1,8 +1,6 @@
 # player.py
 """Player class: position, movement, selection cursor and reference to inventory."""
 
-from typing import Tuple
-
 class Player:
     """
     Représente le joueur / curseur dans la grille.
@@ -20,6 +18,8 @@ class Player:
         self.sel_row = self.row
         self.sel_col = self.col
         self.inventory = inventory
+        # Journal de sauvegarde notifié des déplacements (voir save_journal.py)
+        self.journal = None
 
     def move_cursor(self, drow: int, dcol: int, max_rows: int, max_cols: int):
         """Déplace le curseur de sélection (ZQSD)."""
@@ -31,11 +31,17 @@ class Player:
         """Replace le curseur sur la position du joueur."""
         self.sel_row, self.sel_col = self.row, self.col
 
-    def can_move_to(self, dest_row: int, dest_col: int) -> bool:
-        """Vérification simple: adjacency 4-voisin (ne vérifie pas portes)."""
+    def can_move_to(self, dest_row: int, dest_col: int, grid=None) -> bool:
+        """
+        Adjacency 4-voisin ; avec grid, vérifie aussi qu'une porte relie les
+        deux cases (Grid.door_between, test de bits). Les verrous ne sont pas
+        vérifiés ici (une clé les ouvre, voir GameEngine.enter).
+        """
         dr = abs(self.row - dest_row)
         dc = abs(self.col - dest_col)
-        return (dr + dc) == 1
+        if (dr + dc) != 1:
+            return False
+        return grid is None or grid.door_between(self.row, self.col, dest_row, dest_col)
 
     def move_to(self, dest_row: int, dest_col: int):
         """
@@ -45,5 +51,7 @@ class Player:
         if self.inventory is not None:
             self.inventory.decrement_steps(1)
         self.row, self.col = dest_row, dest_col
+        if self.journal is not None:
+            self.journal.player_moved(dest_row, dest_col)
         # after move bring cursor to player
         self.reset_cursor_to_player()
@@ -0,0 +1,142 @@
+# preloader.py
+"""
+Background asset preloader, started while the main menu is displayed.
+
+Files are read and decoded on a thread pool (room images, icons, sound
+effects, and the music stream is opened). Only the surface conversion
+(convert_alpha, which needs the display) and the registration in the shared
+caches of asset_cache.py happen on the main thread, in poll(), within a small
+time budget per frame so the menu stays smooth.
+"""
+
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import pygame
+
+from asset_cache import IMAGE_EXTENSIONS, icons, room_images, sounds
+from constants import AUDIO_DIR, ICON_DIR, ROOM_DIR, SFX_DIR
+from sound_managener import MUSIC_FILES, MUSIC_VOLUME, audio
+from startup_profile import profiler
+
+PRELOAD_WORKERS = 4
+SOUND_EXTENSIONS = (".wav", ".ogg")
+
+# Main-thread time spent in poll() per menu frame (s)
+POLL_BUDGET = 0.004
+
+
+def _list_files(directory: str, extensions: Tuple[str, ...]) -> List[str]:
+    if not os.path.isdir(directory):
+        return []
+    return sorted(f for f in os.listdir(directory) if f.lower().endswith(extensions))
+
+
+def _load_music(path: str) -> str:
+    pygame.mixer.music.load(path)
+    return path
+
+
+class AssetPreloader:
+    """
+    Précharge les ressources en arrière-plan.
+
+    start() met les fichiers en file ; poll() (thread principal, à chaque frame)
+    convertit et enregistre ce qui est prêt ; progress va de 0.0 à 1.0 ;
+    finish() attend la fin (bloquant).
+    """
+
+    def __init__(self, workers: int = PRELOAD_WORKERS):
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # (kind, name, future) in submission order
+        self._jobs: List[Tuple[str, str, Future]] = []
+        self.total = 0
+        self.completed = 0
+        self._started_at = 0.0
+        self.errors: List[str] = []
+
+    def start(self):
+        """
+        Lance la lecture / le décodage (display.set_mode doit déjà être fait).
+        Initialise aussi l'audio (le mixer n'est pas démarré avant le menu).
+        """
+        if self._executor is not None:
+            return
+        self._started_at = time.perf_counter()
+        audio.init()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                            thread_name_prefix="preload")
+        submit = self._executor.submit
+
+        for name in _list_files(ROOM_DIR, IMAGE_EXTENSIONS):
+            if name not in room_images:
+                self._jobs.append(("room", name, submit(pygame.image.load, os.path.join(ROOM_DIR, name))))
+        for name in _list_files(ICON_DIR, IMAGE_EXTENSIONS):
+            self._jobs.append(("icon", name, submit(pygame.image.load, os.path.join(ICON_DIR, name))))
+
+        if pygame.mixer.get_init():
+            for name in _list_files(SFX_DIR, SOUND_EXTENSIONS):
+                if name not in sounds:
+                    self._jobs.append(("sound", name, submit(pygame.mixer.Sound, os.path.join(SFX_DIR, name))))
+            if not pygame.mixer.music.get_busy():
+                for name in MUSIC_FILES:
+                    path = os.path.join(AUDIO_DIR, name)
+                    if os.path.exists(path):
+                        self._jobs.append(("music", name, submit(_load_music, path)))
+                        break
+
+        self.total = len(self._jobs)
+        self._executor.shutdown(wait=False)
+        if not self._jobs:
+            profiler.add("asset preload (background)", time.perf_counter() - self._started_at)
+
+    @property
+    def progress(self) -> float:
+        return self.completed / self.total if self.total else 1.0
+
+    @property
+    def done(self) -> bool:
+        return self.completed >= self.total
+
+    def poll(self, budget: float = POLL_BUDGET) -> int:
+        """Enregistre les ressources décodées, dans la limite de budget secondes."""
+        deadline = time.perf_counter() + budget
+        handled = 0
+        remaining = []
+        for job in self._jobs:
+            if job[2].done() and time.perf_counter() < deadline:
+                self._register(*job)
+                handled += 1
+            else:
+                remaining.append(job)
+        self._jobs = remaining
+        return handled
+
+    def finish(self):
+        """Attend et enregistre tout ce qui reste (avant de lancer une partie)."""
+        self.start()
+        for job in self._jobs:
+            self._register(*job)
+        self._jobs = []
+
+    def _register(self, kind: str, name: str, future: Future):
+        self.completed += 1
+        if self.done:
+            profiler.add("asset preload (background)", time.perf_counter() - self._started_at)
+        try:
+            result = future.result()
+            if kind == "room":
+                room_images.add(name, result.convert_alpha())
+            elif kind == "icon":
+                icons.add_source(name, result.convert_alpha())
+            elif kind == "sound":
+                sounds.add(name, result)
+            elif kind == "music":
+                pygame.mixer.music.set_volume(MUSIC_VOLUME)
+                pygame.mixer.music.play(-1)
+        except (pygame.error, OSError) as e:
+            self.errors.append(f"{name}: {e}")
+            print(f"Asset not preloaded: {name} ({e})")
@@ -0,0 +1,140 @@
+# replay.py
+"""
+Replays: a game is fully described by its seed and its command stream.
+
+A replay file (saves/replays/<name>.replay) is binary: magic "BPRP", version,
+grid size, the seed, then the space-separated command stream compressed with
+zlib (commands repeat a lot: a long game takes a few hundred bytes).
+A file ending in .json is the older JSON document, still readable:
+    {"version": 2, "seed": 123, "rows": 5, "cols": 9, "commands": "U E 1 R E C"}
+
+Replays run on the headless GameEngine, at full speed.
+
+Usage:
+    python replay.py saves/replays/last.replay
+"""
+
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import List
+
+from constants import GRID_ROWS, GRID_COLS
+from engine import GameEngine
+
+# 2: door and lock rules (door.py); version 1 replays no longer play back the same game
+REPLAY_VERSION = 2
+REPLAY_DIR = os.path.join("saves", "replays")
+LAST_REPLAY = os.path.join(REPLAY_DIR, "last.replay")
+
+REPLAY_MAGIC = b"BPRP"
+# magic, version, rows, cols, seed length (seed as decimal ASCII), commands length
+_REPLAY_HEADER = struct.Struct("<4sBHHBI")
+
+
+@dataclass
+class ReplayLog:
+    """Graine + commandes d'une partie."""
+    seed: int
+    commands: List[str] = field(default_factory=list)
+    rows: int = GRID_ROWS
+    cols: int = GRID_COLS
+
+    @classmethod
+    def from_engine(cls, engine: GameEngine) -> "ReplayLog":
+        if engine.commands is None:
+            raise ValueError("This game was not recorded (loaded from a save?)")
+        return cls(seed=engine.seed, commands=list(engine.commands),
+                   rows=engine.grid.rows, cols=engine.grid.cols)
+
+    def to_dict(self) -> dict:
+        return {
+            "version": REPLAY_VERSION,
+            "seed": self.seed,
+            "rows": self.rows,
+            "cols": self.cols,
+            "commands": " ".join(self.commands),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ReplayLog":
+        if data.get("version") != REPLAY_VERSION:
+            raise ValueError(f"Unsupported replay version: {data.get('version')}")
+        commands = data.get("commands", "")
+        return cls(seed=data["seed"], commands=commands.split() if commands else [],
+                   rows=data.get("rows", GRID_ROWS), cols=data.get("cols", GRID_COLS))
+
+    def to_bytes(self) -> bytes:
+        seed = str(self.seed).encode("ascii")
+        commands = zlib.compress(" ".join(self.commands).encode("ascii"), 9)
+        header = _REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.rows, self.cols,
+                                     len(seed), len(commands))
+        return header + seed + commands
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "ReplayLog":
+        if len(blob) < _REPLAY_HEADER.size:
+            raise ValueError("Truncated replay")
+        magic, version, rows, cols, seed_len, length = _REPLAY_HEADER.unpack_from(blob)
+        if magic != REPLAY_MAGIC:
+            raise ValueError("Not a replay file")
+        if version != REPLAY_VERSION:
+            raise ValueError(f"Unsupported replay version: {version}")
+        pos = _REPLAY_HEADER.size
+        seed = int(blob[pos:pos + seed_len].decode("ascii"))
+        pos += seed_len
+        commands = zlib.decompress(blob[pos:pos + length]).decode("ascii")
+        return cls(seed=seed, commands=commands.split(), rows=rows, cols=cols)
+
+
+def save_replay(engine: GameEngine, filename: str = LAST_REPLAY) -> bool:
+    """Écrit le replay de la partie. Retourne False si la partie n'est pas rejouable."""
+    if engine.commands is None:
+        return False
+    try:
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        log = ReplayLog.from_engine(engine)
+        if filename.endswith(".json"):
+            with open(filename, "w", encoding="utf-8") as f:
+                json.dump(log.to_dict(), f)
+        else:
+            with open(filename, "wb") as f:
+                f.write(log.to_bytes())
+        return True
+    except OSError as e:
+        print(f"Erreur lors de l'écriture du replay: {e}")
+        return False
+
+
+def load_replay(filename: str) -> ReplayLog:
+    """Lit un replay binaire ou JSON (détecté par le magic)."""
+    with open(filename, "rb") as f:
+        blob = f.read()
+    if blob[:len(REPLAY_MAGIC)] == REPLAY_MAGIC:
+        return ReplayLog.from_bytes(blob)
+    return ReplayLog.from_dict(json.loads(blob.decode("utf-8")))
+
+
+def run_replay(log: ReplayLog) -> GameEngine:
+    """Rejoue toutes les commandes sur un moteur neuf et retourne le moteur final."""
+    engine = GameEngine(rows=log.rows, cols=log.cols, seed=log.seed)
+    for token in log.commands:
+        engine.execute(token)
+    return engine
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else LAST_REPLAY
+    log = load_replay(path)
+    t0 = time.perf_counter()
+    engine = run_replay(log)
+    elapsed = time.perf_counter() - t0
+    inv = engine.inventory
+    print(f"Replay {path}: seed {log.seed}, {len(log.commands)} commandes en {elapsed * 1000:.1f} ms")
+    print(f"Résultat: {'victoire' if engine.won else 'défaite' if engine.lost else 'en cours'}")
+    print(f"Pas: {inv.steps}  Or: {inv.gold}  Gemmes: {inv.gems}  Clés: {inv.keys}")
+    print(f"Position: ({engine.player.row}, {engine.player.col})")
@@ -0,0 +1,268 @@
+# rooms_catalog.py
+"""
+Catalogue statique des salles tirables et échantillonnage par table d'alias.
+
+Les modèles de salles (RoomTemplate) sont immuables et créés une seule fois au
+chargement du module. Pour chaque filtre (rareté maximale, couleur, salles
+gratuites / payantes) une table d'alias de Walker/Vose est construite une seule
+fois : un tirage coûte alors O(1), quel que soit le nombre de salles du catalogue.
+"""
+
+import math
+import random
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from door import ALL_DOORS, E, N, S, W
+
+
+@dataclass(frozen=True)
+class RoomTemplate:
+    """
+    Description immuable d'un type de salle du catalogue.
+
+    doors / locked_doors : masques de portes (door.py), entrée côté sud ;
+    tournés au placement (Grid.orient_room).
+    """
+    name: str
+    image_name: Optional[str] = None
+    room_type: str = "normal"
+    cost_gems: int = 0
+    color_type: str = "neutral"
+    rarity: int = 0
+    effect_data: Mapping = field(default_factory=dict)
+    doors: int = ALL_DOORS
+    locked_doors: int = 0
+
+    def __post_init__(self):
+        # effect_data en lecture seule pour que le modèle reste immuable
+        object.__setattr__(self, "effect_data", MappingProxyType(dict(self.effect_data)))
+
+    @property
+    def weight(self) -> float:
+        """Poids de tirage : chaque niveau de rareté divise la probabilité par 3."""
+        return 1.0 / (3 ** self.rarity)
+
+    @property
+    def is_free(self) -> bool:
+        return self.cost_gems == 0
+
+    def instantiate(self):
+        """Crée une Room jouable (effect_data copié, image partagée)."""
+        from grid import Room
+        return Room(self.name, image_name=self.image_name, room_type=self.room_type,
+                    cost_gems=self.cost_gems, effect_data=dict(self.effect_data),
+                    color_type=self.color_type, rarity=self.rarity,
+                    doors=self.doors, locked_doors=self.locked_doors)
+
+
+class AliasTable:
+    """
+    Table d'alias de Vose pour tirer un indice selon des poids fixes.
+
+    Construction en O(n), tirage en O(1) : un nombre aléatoire choisit une
+    colonne, un second décide entre la colonne et son alias.
+    """
+
+    __slots__ = ("prob", "alias", "n", "total")
+
+    def __init__(self, weights: Sequence[float]):
+        n = len(weights)
+        if n == 0:
+            raise ValueError("AliasTable needs at least one weight")
+        total = float(sum(weights))
+        if total <= 0:
+            raise ValueError("AliasTable needs a positive total weight")
+        self.n = n
+        self.total = total
+        self.prob = [0.0] * n
+        self.alias = [0] * n
+
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] = (scaled[l] + scaled[s]) - 1.0
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+        # Résidus d'arrondi : probabilité 1
+        for i in large:
+            self.prob[i] = 1.0
+        for i in small:
+            self.prob[i] = 1.0
+
+    def sample(self, rng=random) -> int:
+        """Tire un indice en O(1)."""
+        u = rng.random() * self.n
+        i = int(u)
+        if i >= self.n:
+            i = self.n - 1
+        return i if (u - i) < self.prob[i] else self.alias[i]
+
+
+class _Pool:
+    """Sous-ensemble du catalogue avec sa table d'alias."""
+
+    __slots__ = ("templates", "table")
+
+    def __init__(self, templates: Tuple[RoomTemplate, ...]):
+        self.templates = templates
+        self.table = AliasTable([t.weight for t in templates]) if templates else None
+
+    def sample(self, rng=random) -> RoomTemplate:
+        return self.templates[self.table.sample(rng)]
+
+
+class RoomCatalog:
+    """
+    Catalogue de modèles de salles avec tables d'alias précalculées.
+
+    Les tables sont construites à la première demande d'un filtre puis
+    réutilisées ; le catalogue lui-même ne change jamais.
+    """
+
+    def __init__(self, templates: Sequence[RoomTemplate]):
+        # La sortie n'est jamais tirée
+        self.templates: Tuple[RoomTemplate, ...] = tuple(
+            t for t in templates if t.room_type != "exit")
+        self._pools: Dict[Tuple[Optional[int], Optional[str]], Tuple[_Pool, _Pool, _Pool]] = {}
+
+    def __len__(self):
+        return len(self.templates)
+
+    def _pools_for(self, max_rarity: Optional[int], color_type: Optional[str]):
+        """(toutes, gratuites, payantes) pour un filtre donné."""
+        key = (max_rarity, color_type)
+        pools = self._pools.get(key)
+        if pools is None:
+            selected = tuple(
+                t for t in self.templates
+                if (max_rarity is None or t.rarity <= max_rarity)
+                and (color_type is None or t.color_type == color_type))
+            pools = (
+                _Pool(selected),
+                _Pool(tuple(t for t in selected if t.is_free)),
+                _Pool(tuple(t for t in selected if not t.is_free)),
+            )
+            self._pools[key] = pools
+        return pools
+
+    def draw(self, k: int = 3, rng=random, max_rarity: Optional[int] = None,
+             color_type: Optional[str] = None) -> List[RoomTemplate]:
+        """Tire k modèles (avec remise) selon les poids de rareté."""
+        everything, _, _ = self._pools_for(max_rarity, color_type)
+        if not everything.templates:
+            return []
+        if len(everything.templates) <= k:
+            return list(everything.templates)
+        return [everything.sample(rng) for _ in range(k)]
+
+    def draw_with_free(self, k: int = 3, rng=random, max_rarity: Optional[int] = None,
+                       color_type: Optional[str] = None) -> List[RoomTemplate]:
+        """
+        Tire k modèles en garantissant au moins une salle gratuite.
+
+        Le tirage suit exactement la loi de draw() conditionnée à « au moins une
+        salle gratuite » : on tire le nombre j de salles gratuites selon une loi
+        binomiale tronquée (j >= 1), on place ces j salles à des positions
+        aléatoires, puis chaque case est tirée dans la table gratuite ou payante.
+        """
+        everything, free, paid = self._pools_for(max_rarity, color_type)
+        if not everything.templates:
+            return []
+        if len(everything.templates) <= k:
+            choices = list(everything.templates)
+            if free.templates and not any(t.is_free for t in choices):
+                choices[0] = free.sample(rng)
+            return choices
+        if not free.templates:
+            return self.draw(k, rng, max_rarity, color_type)
+        if not paid.templates:
+            return [free.sample(rng) for _ in range(k)]
+
+        p = free.table.total / everything.table.total
+        j = _truncated_binomial(k, p, rng)
+        free_slots = set(rng.sample(range(k), j))
+        return [free.sample(rng) if i in free_slots else paid.sample(rng)
+                for i in range(k)]
+
+
+def _truncated_binomial(n: int, p: float, rng=random) -> int:
+    """Tire j ~ Binomiale(n, p) conditionnée à j >= 1."""
+    q = 1.0 - p
+    norm = 1.0 - q ** n
+    u = rng.random() * norm
+    acc = 0.0
+    for j in range(1, n + 1):
+        acc += math.comb(n, j) * (p ** j) * (q ** (n - j))
+        if u < acc:
+            return j
+    return n
+
+
+# ----------------------------
+# Catalogue du jeu
+# ----------------------------
+ROOM_TEMPLATES: Tuple[RoomTemplate, ...] = (
+    # Blue rooms (common, neutral)
+    RoomTemplate("Couloir", image_name="Couloir.png", room_type="neutral",
+                 cost_gems=0, color_type="blue", rarity=0, doors=N | S),
+    RoomTemplate("Salle Vide", image_name="room_default.png", room_type="neutral",
+                 cost_gems=0, color_type="blue", rarity=0, doors=S | W),
+
+    # Green rooms (gardens - contain permanent items or dig spots)
+    RoomTemplate("Bibliothèque", image_name="bibliotheque.png", room_type="bibliotheque",
+                 cost_gems=1, color_type="green", rarity=1,
+                 effect_data={"gems": 1}, doors=E | S),
+    RoomTemplate("Veranda", image_name="Veranda.png", room_type="veranda",
+                 cost_gems=2, color_type="green", rarity=2,
+                 effect_data={"boost_green": True}, doors=ALL_DOORS, locked_doors=N),
+
+    # Yellow rooms (workshops - contain keys)
+    RoomTemplate("Atelier", image_name="atelier.png", room_type="atelier",
+                 cost_gems=1, color_type="yellow", rarity=1,
+                 effect_data={"keys": 1}, doors=S),
+
+    # Violet rooms (bedrooms - contain food)
+    RoomTemplate("Chambre", image_name="Chambre.png", room_type="bedroom",
+                 cost_gems=1, color_type="violet", rarity=1,
+                 effect_data={"has_food": True}, doors=S),
+
+    # Orange rooms (corridors - many doors)
+    RoomTemplate("Grand Couloir", image_name="room_default.png", room_type="corridor",
+                 cost_gems=0, color_type="orange", rarity=0, doors=ALL_DOORS),
+
+    # Red rooms (dangerous - traps)
+    RoomTemplate("Salle Piégée", image_name="piege.png", room_type="piege",
+                 cost_gems=0, color_type="red", rarity=1,
+                 effect_data={"trap_damage": 5}, doors=N | E | S),
+
+    # Special rooms with containers
+    RoomTemplate("Salle Trésor", image_name="salle_tresor.png", room_type="tresor",
+                 cost_gems=2, color_type="yellow", rarity=2,
+                 effect_data={"gold": 5}, doors=S),
+    RoomTemplate("Salle aux Coffres", image_name="coffre.png", room_type="coffre",
+                 cost_gems=1, color_type="blue", rarity=1,
+                 effect_data={"chest_count": 1, "requires_key": True}, doors=S | W),
+    RoomTemplate("Vestiaire", image_name="casiers.png", room_type="casier",
+                 cost_gems=1, color_type="blue", rarity=1,
+                 effect_data={"locker_count": 2, "requires_key": True}, doors=E | S),
+    RoomTemplate("Jardin", image_name="Jardin.png", room_type="creuser",
+                 cost_gems=1, color_type="green", rarity=1,
+                 effect_data={"dig_spots": 1, "requires_shovel": True},
+                 doors=E | S | W, locked_doors=W),
+
+    # Locked room (requires key to enter)
+    RoomTemplate("Coffre-Fort", image_name="coffre.png", room_type="locked_room",
+                 cost_gems=2, color_type="yellow", rarity=2,
+                 effect_data={"gold": 10, "gems": 2, "requires_key_to_enter": True}, doors=S),
+)
+
+CATALOG = RoomCatalog(ROOM_TEMPLATES)
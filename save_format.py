@@ -0,0 +1,458 @@
+# save_format.py
+"""
+Compact binary save format (versioned), and the legacy JSON format for migration.
+
+A save is first captured into a SaveState: every distinct room is interned
+once in a template table and only the non-blank cells are stored (the grid is
+sparse, see grid.Chunk), so a save costs O(rooms), not O(rows * cols). The
+binary file is:
+
+    header  (fixed size, never compressed)
+        magic "BPSV", version, flags, save time, steps, gold, gems,
+        player row/col, grid rows/cols, payload length
+    payload (zlib if FLAG_ZLIB)
+        keys, dice, permanents (bits)
+        template table: count, then for each template its strings, numbers
+            and one byte of doors: doors | locked_doors << 4
+        cells (sparse), cell index i = row * cols + col:
+            rooms: count (uint32), indices, then template ids (uint16 each)
+            discovered: count (uint32), indices
+            indices are increasing uint32, each stored as the gap from the
+            previous one (compresses well)
+
+The header holds everything shown in a save list, so it can be read without
+the payload (see read_header).
+"""
+
+import json
+import struct
+import sys
+import zlib
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import accumulate
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from door import ALL_DOORS
+
+MAGIC = b"BPSV"
+FORMAT_VERSION = 1
+FLAG_ZLIB = 0x01
+
+BINARY_EXTENSION = ".bps"
+
+HEADER = struct.Struct("<4sBBHdiiiiiHHI")
+_PAYLOAD_INVENTORY = struct.Struct("<iiB")
+_TEMPLATE_NUMBERS = struct.Struct("<hB")
+_TEMPLATE_DOORS = struct.Struct("<B")
+_COUNT = struct.Struct("<H")
+_CELL_COUNT = struct.Struct("<I")
+
+# Order of the permanent items in the bit field
+PERMANENTS = ("shovel", "hammer", "picklock_kit", "metal_detector", "rabbit_foot")
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# (name, image_name, room_type, cost_gems, effect_data, color_type, rarity, doors, locked_doors)
+TemplateKey = Tuple[str, Optional[str], str, int, str, str, int, int, int]
+
+
+class SaveFormatError(ValueError):
+    """Fichier de sauvegarde illisible (mauvais magic, version inconnue, tronqué)."""
+
+
+@dataclass
+class SaveState:
+    """
+    État complet d'une partie sous forme compacte.
+
+    templates contient chaque salle distincte une seule fois (effect_data en
+    JSON trié). Les cases sont indexées par i = ligne * cols + colonne :
+    cells[i] est l'indice du template de la salle en i (cases vides absentes),
+    discovered contient les indices des cases découvertes.
+    """
+    rows: int
+    cols: int
+    templates: List[TemplateKey] = field(default_factory=list)
+    cells: Dict[int, int] = field(default_factory=dict)
+    discovered: Set[int] = field(default_factory=set)
+    inventory: Dict[str, Any] = field(default_factory=dict)
+    player: Tuple[int, int] = (0, 0)
+    save_time: float = 0.0
+
+    @property
+    def save_date(self) -> str:
+        return datetime.fromtimestamp(self.save_time).strftime(DATE_FORMAT)
+
+
+# ----------------------------
+# Capture / apply
+# ----------------------------
+def capture(grid: Any, inventory: Any, player: Any) -> SaveState:
+    """Copie l'état du jeu (thread principal) en internant les salles identiques."""
+    ids: Dict[TemplateKey, int] = {}
+    templates: List[TemplateKey] = []
+    cols = grid.cols
+    cells: Dict[int, int] = {}
+    discovered: Set[int] = set()
+    # Only the allocated chunks of the grid are visited
+    for r, c, room, disc in grid.iter_cells():
+        i = r * cols + c
+        if disc:
+            discovered.add(i)
+        if room is None:
+            continue
+        key = (room.name, room.image_name, room.room_type, room.cost_gems,
+               json.dumps(dict(room.effect_data), sort_keys=True, separators=(",", ":")),
+               room.color_type, room.rarity, room.doors, room.locked_doors)
+        idx = ids.get(key)
+        if idx is None:
+            idx = ids[key] = len(templates)
+            templates.append(key)
+        cells[i] = idx
+
+    inv = {name: getattr(inventory, name) for name in ("steps", "gems", "keys", "dice", "gold")}
+    inv.update({name: bool(getattr(inventory, name)) for name in PERMANENTS})
+    return SaveState(rows=grid.rows, cols=grid.cols, templates=templates, cells=cells,
+                     discovered=discovered, inventory=inv, player=(player.row, player.col),
+                     save_time=datetime.now().timestamp())
+
+
+def apply(state: SaveState, grid: Any, inventory: Any, player: Any):
+    """Reconstruit la grille, l'inventaire et la position du joueur."""
+    from grid import Room
+
+    if (state.rows, state.cols) != (grid.rows, grid.cols):
+        raise SaveFormatError(
+            f"Grid size mismatch: save {state.rows}x{state.cols}, game {grid.rows}x{grid.cols}")
+    # effect_data décodé une fois par template, copié pour chaque salle
+    effects = [json.loads(t[4]) for t in state.templates]
+    grid.clear()
+    cols = state.cols
+    for i, idx in state.cells.items():
+        (name, image_name, room_type, cost_gems, _, color_type, rarity,
+         doors, locked_doors) = state.templates[idx]
+        grid.load_cell(i // cols, i % cols,
+                       Room(name=name, image_name=image_name, room_type=room_type,
+                            cost_gems=cost_gems, effect_data=dict(effects[idx]),
+                            color_type=color_type, rarity=rarity,
+                            doors=doors, locked_doors=locked_doors),
+                       i in state.discovered)
+    for i in state.discovered:
+        if i not in state.cells:
+            grid.load_cell(i // cols, i % cols, None, True)
+    grid.rebuild_index()
+
+    for name, value in state.inventory.items():
+        setattr(inventory, name, value)
+    player.row, player.col = state.player
+    player.reset_cursor_to_player()
+
+
+# ----------------------------
+# Binary format
+# ----------------------------
+def _pack_str(out: bytearray, text: Optional[str]):
+    """Chaîne préfixée par sa longueur (0xFFFF = None)."""
+    if text is None:
+        out += _COUNT.pack(0xFFFF)
+        return
+    raw = text.encode("utf-8")
+    out += _COUNT.pack(len(raw))
+    out += raw
+
+
+def _unpack_str(buf: memoryview, pos: int) -> Tuple[Optional[str], int]:
+    (n,) = _COUNT.unpack_from(buf, pos)
+    pos += _COUNT.size
+    if n == 0xFFFF:
+        return None, pos
+    return bytes(buf[pos:pos + n]).decode("utf-8"), pos + n
+
+
+def _le_array(typecode: str, values: List[int]) -> bytes:
+    """Tableau d'entiers en little-endian."""
+    arr = array(typecode, values)
+    if sys.byteorder != "little":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _gaps(indices: List[int]) -> List[int]:
+    """Indices croissants -> écarts avec l'indice précédent (le premier tel quel)."""
+    return [b - a for a, b in zip([0] + indices, indices)]
+
+
+def _read_le_array(typecode: str, buf: memoryview, pos: int, count: int) -> Tuple[array, int]:
+    arr = array(typecode)
+    end = pos + count * arr.itemsize
+    arr.frombytes(bytes(buf[pos:end]))
+    if len(arr) != count:
+        raise SaveFormatError("Truncated save")
+    if sys.byteorder != "little":
+        arr.byteswap()
+    return arr, end
+
+
+def to_bytes(state: SaveState, compress: bool = True) -> bytes:
+    """Encode un SaveState au format binaire."""
+    if len(state.templates) >= 0xFFFF:
+        raise SaveFormatError("Too many distinct rooms for the binary format")
+    inv = state.inventory
+    perm_bits = sum(1 << i for i, name in enumerate(PERMANENTS) if inv.get(name))
+
+    payload = bytearray(_PAYLOAD_INVENTORY.pack(inv.get("keys", 0), inv.get("dice", 0), perm_bits))
+    payload += _COUNT.pack(len(state.templates))
+    for (name, image_name, room_type, cost_gems, effect_json, color_type, rarity,
+         doors, locked_doors) in state.templates:
+        for text in (name, image_name, room_type, color_type, effect_json):
+            _pack_str(payload, text)
+        payload += _TEMPLATE_NUMBERS.pack(cost_gems, rarity)
+        payload += _TEMPLATE_DOORS.pack(doors | locked_doors << 4)
+
+    indices = sorted(state.cells)
+    payload += _CELL_COUNT.pack(len(indices))
+    payload += _le_array("I", _gaps(indices))
+    payload += _le_array("H", [state.cells[i] for i in indices])
+    discovered = sorted(state.discovered)
+    payload += _CELL_COUNT.pack(len(discovered))
+    payload += _le_array("I", _gaps(discovered))
+
+    flags = 0
+    body = bytes(payload)
+    if compress:
+        body = zlib.compress(body)
+        flags |= FLAG_ZLIB
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, flags, 0, state.save_time,
+                         inv.get("steps", 0), inv.get("gold", 0), inv.get("gems", 0),
+                         state.player[0], state.player[1], state.rows, state.cols, len(body))
+    return header + body
+
+
+def is_binary(blob: bytes) -> bool:
+    return blob[:len(MAGIC)] == MAGIC
+
+
+def read_header(blob: bytes) -> dict:
+    """Métadonnées de l'en-tête seul (sans décompresser le contenu)."""
+    if len(blob) < HEADER.size or not is_binary(blob):
+        raise SaveFormatError("Not a binary save")
+    (_, version, flags, _, save_time, steps, gold, gems,
+     row, col, rows, cols, length) = HEADER.unpack_from(blob)
+    if version != FORMAT_VERSION:
+        raise SaveFormatError(f"Unsupported save version: {version}")
+    return {
+        "version": version,
+        "flags": flags,
+        "save_time": save_time,
+        "save_date": datetime.fromtimestamp(save_time).strftime(DATE_FORMAT),
+        "steps": steps,
+        "gold": gold,
+        "gems": gems,
+        "player": (row, col),
+        "rows": rows,
+        "cols": cols,
+        "payload_length": length,
+    }
+
+
+def from_bytes(blob: bytes) -> SaveState:
+    """Décode un fichier binaire complet."""
+    head = read_header(blob)
+    body = blob[HEADER.size:HEADER.size + head["payload_length"]]
+    if len(body) != head["payload_length"]:
+        raise SaveFormatError("Truncated save")
+    if head["flags"] & FLAG_ZLIB:
+        body = zlib.decompress(body)
+    buf = memoryview(body)
+
+    keys, dice, perm_bits = _PAYLOAD_INVENTORY.unpack_from(buf, 0)
+    pos = _PAYLOAD_INVENTORY.size
+    (count,) = _COUNT.unpack_from(buf, pos)
+    pos += _COUNT.size
+    templates = []
+    for _ in range(count):
+        name, pos = _unpack_str(buf, pos)
+        image_name, pos = _unpack_str(buf, pos)
+        room_type, pos = _unpack_str(buf, pos)
+        color_type, pos = _unpack_str(buf, pos)
+        effect_json, pos = _unpack_str(buf, pos)
+        cost_gems, rarity = _TEMPLATE_NUMBERS.unpack_from(buf, pos)
+        pos += _TEMPLATE_NUMBERS.size
+        (packed,) = _TEMPLATE_DOORS.unpack_from(buf, pos)
+        pos += _TEMPLATE_DOORS.size
+        doors, locked_doors = packed & ALL_DOORS, packed >> 4
+        templates.append((name, image_name, room_type, cost_gems, effect_json, color_type, rarity,
+                          doors, locked_doors))
+
+    (count,) = _CELL_COUNT.unpack_from(buf, pos)
+    gaps, pos = _read_le_array("I", buf, pos + _CELL_COUNT.size, count)
+    ids, pos = _read_le_array("H", buf, pos, count)
+    cells = dict(zip(accumulate(gaps), ids))
+    (count,) = _CELL_COUNT.unpack_from(buf, pos)
+    gaps, pos = _read_le_array("I", buf, pos + _CELL_COUNT.size, count)
+    discovered = set(accumulate(gaps))
+
+    inv = {"steps": head["steps"], "gold": head["gold"], "gems": head["gems"],
+           "keys": keys, "dice": dice}
+    inv.update({name: bool(perm_bits >> i & 1) for i, name in enumerate(PERMANENTS)})
+    return SaveState(rows=head["rows"], cols=head["cols"], templates=templates,
+                     cells=cells, discovered=discovered,
+                     inventory=inv, player=head["player"], save_time=head["save_time"])
+
+
+# ----------------------------
+# Legacy JSON format
+# ----------------------------
+def to_json_dict(state: SaveState) -> dict:
+    """Ancien format JSON (une entrée complète par case)."""
+    effects = [json.loads(t[4]) for t in state.templates]
+    cells = []
+    for r in range(state.rows):
+        row = []
+        for c in range(state.cols):
+            i = r * state.cols + c
+            idx = state.cells.get(i)
+            if idx is None:
+                row.append({"exists": False, "discovered": i in state.discovered})
+                continue
+            (name, image_name, room_type, cost_gems, _, color_type, rarity,
+             doors, locked_doors) = state.templates[idx]
+            row.append({
+                "exists": True,
+                "discovered": i in state.discovered,
+                "name": name,
+                "image_name": image_name,
+                "room_type": room_type,
+                "cost_gems": cost_gems,
+                "effect_data": dict(effects[idx]),
+                "color_type": color_type,
+                "rarity": rarity,
+                "doors": doors,
+                "locked_doors": locked_doors,
+            })
+        cells.append(row)
+
+    inv = state.inventory
+    return {
+        "grid": {"rows": state.rows, "cols": state.cols, "cells": cells},
+        "inventory": {
+            "steps": inv.get("steps", 0),
+            "gems": inv.get("gems", 0),
+            "keys": inv.get("keys", 0),
+            "dice": inv.get("dice", 0),
+            "gold": inv.get("gold", 0),
+            "permanents": {name: inv.get(name, False) for name in PERMANENTS},
+        },
+        "player": {"row": state.player[0], "col": state.player[1]},
+        "metadata": {"save_date": state.save_date, "game_version": "1.0"},
+    }
+
+
+def from_json_dict(data: dict, rows: int, cols: int) -> SaveState:
+    """
+    Lit une sauvegarde JSON (ancien format) avec les mêmes valeurs par défaut
+    que l'ancien chargeur. rows / cols : taille de la grille du jeu.
+    """
+    ids: Dict[TemplateKey, int] = {}
+    templates: List[TemplateKey] = []
+    cells: Dict[int, int] = {}
+    discovered: Set[int] = set()
+    for r, row in enumerate(data.get("grid", {}).get("cells", [])[:rows]):
+        for c, cell in enumerate(row[:cols]):
+            i = r * cols + c
+            if cell.get("discovered", False):
+                discovered.add(i)
+            if not cell.get("exists"):
+                continue
+            key = (cell.get("name", "Unknown"), cell.get("image_name"),
+                   cell.get("room_type", "normal"), cell.get("cost_gems", 0),
+                   json.dumps(cell.get("effect_data") or {}, sort_keys=True, separators=(",", ":")),
+                   cell.get("color_type", "neutral"), cell.get("rarity", 0),
+                   cell.get("doors", ALL_DOORS), cell.get("locked_doors", 0))
+            idx = ids.get(key)
+            if idx is None:
+                idx = ids[key] = len(templates)
+                templates.append(key)
+            cells[i] = idx
+
+    inv_data = data.get("inventory", {})
+    perms = inv_data.get("permanents", {})
+    inv = {
+        "steps": inv_data.get("steps", 70),
+        "gems": inv_data.get("gems", 2),
+        "keys": inv_data.get("keys", 0),
+        "dice": inv_data.get("dice", 0),
+        "gold": inv_data.get("gold", 0),
+    }
+    inv.update({name: perms.get(name, False) for name in PERMANENTS})
+
+    player_data = data.get("player", {})
+    save_date = data.get("metadata", {}).get("save_date")
+    try:
+        save_time = datetime.strptime(save_date, DATE_FORMAT).timestamp()
+    except (TypeError, ValueError):
+        save_time = 0.0
+    return SaveState(rows=rows, cols=cols, templates=templates, cells=cells,
+                     discovered=discovered, inventory=inv,
+                     player=(player_data.get("row", rows - 1), player_data.get("col", 0)),
+                     save_time=save_time)
+
+
+if __name__ == "__main__":
+    # Self-check: binary (and JSON) round trips of random games
+    import random
+    from engine import GameEngine
+
+    def contents(state: SaveState) -> tuple:
+        """Ce que décrit la sauvegarde, indépendamment de l'ordre des templates."""
+        return ({i: state.templates[t] for i, t in state.cells.items()},
+                state.discovered, state.inventory, state.player)
+
+    def index(grid: Any) -> tuple:
+        return dict(grid._dist), set(grid._reachable), set(grid._frontier)
+
+    tokens = ["U", "D", "L", "R", "E", "E", "0", "1", "2", "X"]
+    rng = random.Random(1)
+    failures = []
+    sizes = [(5, 9)] * 40 + [(30, 30)] * 5 + [(2000, 2000)]
+    for rows, cols in sizes:
+        engine = GameEngine(rows, cols, seed=rng.getrandbits(32))
+        for _ in range(rng.randrange(300)):
+            if engine.finished:
+                break
+            engine.execute(rng.choice(tokens))
+        state = capture(engine.grid, engine.inventory, engine.player)
+        perturbed = rng.random() < 0.5
+        if perturbed:
+            # Undiscovered rooms and discovered empty cells
+            state.discovered.symmetric_difference_update(
+                rng.randrange(rows * cols) for _ in range(5))
+
+        for compress in (True, False):
+            if from_bytes(to_bytes(state, compress)) != state:
+                failures.append(f"{rows}x{cols}: binary round trip (compress={compress})")
+        if contents(from_json_dict(to_json_dict(state), rows, cols)) != contents(state):
+            failures.append(f"{rows}x{cols}: JSON round trip")
+
+        loaded = GameEngine(rows, cols, seed=0)
+        apply(from_bytes(to_bytes(state)), loaded.grid, loaded.inventory, loaded.player)
+        if contents(capture(loaded.grid, loaded.inventory, loaded.player)) != contents(state):
+            failures.append(f"{rows}x{cols}: state after apply()")
+        # Index rebuilt on load == index kept up to date during the game
+        if not perturbed and index(loaded.grid) != index(engine.grid):
+            failures.append(f"{rows}x{cols}: movement index after apply()")
+
+    blob = to_bytes(state)
+    for bad in (blob[:HEADER.size - 1], blob[:-3], b"XXXX" + blob[4:]):
+        try:
+            from_bytes(bad)
+            failures.append("corrupted file accepted")
+        except SaveFormatError:
+            pass
+
+    print(f"{len(sizes)} saves, {len(failures)} failure(s)")
+    for failure in failures:
+        print(" ", failure)
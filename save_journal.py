@@ -0,0 +1,240 @@
+# save_journal.py
+"""
+Append-only journal of state deltas between two full snapshots.
+
+Grid.set_room / Grid.discover / Grid.unlock_door, Player.move_to and every Inventory field
+assignment notify the attached SaveJournal, which buffers one JSON line per
+change. flush() appends the buffered lines to <save>.journal (one write per
+frame); every `checkpoint_every` entries a full snapshot is written by the
+SaveService, then the entries it covers are dropped from the journal.
+
+Each snapshot is identified by its save time. Before a snapshot is queued,
+a ["base", save_time] line is written to the journal, at its exact place
+among the entries; when the journal is compacted it starts with that line.
+Loading = snapshot + replay of the entries that follow the base line of this
+very snapshot (see save_manager.load_game). A journal without that line
+(snapshot of another game, or written before the journal caught up) is
+ignored instead of being replayed onto the wrong state.
+"""
+
+import json
+import os
+from typing import Any, List, Optional, Tuple
+
+from save_manager import AUTOSAVE_FILE, SaveService, snapshot_state
+
+# Full snapshot every N journal entries
+CHECKPOINT_EVERY = 200
+
+
+def journal_path(filename: str) -> str:
+    """saves/autosave.bps -> saves/autosave.journal"""
+    return os.path.splitext(filename)[0] + ".journal"
+
+
+class SaveJournal:
+    """
+    Journal attaché à une partie (grid, inventory, player).
+
+    attach() vide le journal et programme un snapshot complet (écrit par le
+    SaveService) ; ensuite chaque modification ne coûte qu'une ligne ajoutée
+    au fichier.
+    """
+
+    def __init__(self, save_service: SaveService, filename: str = AUTOSAVE_FILE,
+                 checkpoint_every: int = CHECKPOINT_EVERY):
+        self.save_service = save_service
+        self.filename = filename
+        self.path = journal_path(filename)
+        self.checkpoint_every = checkpoint_every
+        self._targets: Optional[Tuple[Any, Any, Any]] = None
+        self._file = None
+        self._seq = 0
+        # (seq, line) not yet covered by a snapshot on disk (base lines included)
+        self._entries: List[Tuple[int, str]] = []
+        self._unflushed: List[str] = []
+        self._requested = 0
+        # (seq, save time) of the latest snapshot on disk, set by the writer thread
+        self._persisted: Tuple[int, float] = (0, 0.0)
+        self._compacted = 0
+
+    # ----------------------------
+    # Attach / detach
+    # ----------------------------
+    def attach(self, grid: Any, inventory: Any, player: Any):
+        """
+        Suit cette partie à partir d'un snapshot complet, écrit en arrière-plan.
+        Le journal de la partie précédente est vidé avant (rien ne peut être
+        rejoué sur le nouveau snapshot) ; la ligne de base du nouveau snapshot
+        le précède sur le disque.
+        """
+        # The new snapshot supersedes whatever the previous game had not written
+        self.detach(flush=False)
+        self._entries.clear()
+        self._unflushed.clear()
+        # Strictly above every seq of the previous game: its pending checkpoint
+        # callbacks can't pass for this snapshot
+        self._seq += 1
+        self._compacted = self._seq - 1
+        self._rewrite(None)
+        self._targets = (grid, inventory, player)
+        grid.journal = inventory.journal = player.journal = self
+        self.checkpoint()
+
+    def detach(self, flush: bool = True):
+        """
+        Arrête le suivi. flush=False abandonne les entrées pas encore écrites
+        (partie terminée : la sauvegarde reste sur le dernier état jouable).
+        """
+        if self._targets is None:
+            return
+        if flush:
+            self.flush()
+        for obj in self._targets:
+            obj.journal = None
+        self._targets = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # ----------------------------
+    # Notifications (Grid, Player, Inventory)
+    # ----------------------------
+    def _append(self, entry: list):
+        self._seq += 1
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+        self._entries.append((self._seq, line))
+        self._unflushed.append(line)
+
+    def room_placed(self, r: int, c: int, room: Any):
+        self._append(["room", r, c, room.name, room.image_name, room.room_type,
+                      room.cost_gems, dict(room.effect_data), room.color_type, room.rarity,
+                      room.doors, room.locked_doors])
+
+    def cell_discovered(self, r: int, c: int):
+        self._append(["disc", r, c])
+
+    def door_unlocked(self, r: int, c: int, nr: int, nc: int):
+        self._append(["unlock", r, c, nr, nc])
+
+    def player_moved(self, r: int, c: int):
+        self._append(["pos", r, c])
+
+    def inventory_changed(self, name: str, value: Any):
+        self._append(["inv", name, value])
+
+    # ----------------------------
+    # Disk
+    # ----------------------------
+    def flush(self):
+        """Ajoute les nouvelles entrées au fichier ; checkpoint si le journal est long."""
+        if self._targets is None:
+            return
+        persisted, save_time = self._persisted
+        if persisted > self._compacted:
+            # A snapshot reached the disk: drop the entries it covers
+            self._compacted = persisted
+            self._entries = [(seq, line) for seq, line in self._entries if seq > persisted]
+            self._unflushed.clear()
+            self._rewrite(save_time)
+        else:
+            self._write_unflushed()
+
+        if self._seq - self._requested >= self.checkpoint_every:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """
+        Programme un snapshot complet (écrit par le thread du SaveService).
+        Sa ligne de base est écrite dans le journal avant qu'il puisse arriver
+        sur le disque.
+        """
+        if self._targets is None:
+            return
+        seq = self._requested = self._seq
+        state = snapshot_state(*self._targets)
+        line = _base_line(state.save_time)
+        self._entries.append((seq, line))
+        self._unflushed.append(line)
+        self._write_unflushed()
+
+        def on_written():
+            # Worker thread: the main thread compacts on its next flush()
+            if seq > self._persisted[0]:
+                self._persisted = (seq, state.save_time)
+
+        self.save_service.request_write(state, self.filename, on_written)
+
+    def _write_unflushed(self):
+        if self._unflushed:
+            self._file.write("\n".join(self._unflushed) + "\n")
+            self._file.flush()
+            self._unflushed.clear()
+
+    def _rewrite(self, save_time: Optional[float]):
+        """
+        Réécrit le journal de façon atomique : ligne de base du snapshot save_time
+        (None : aucune), puis les entrées qu'il ne couvre pas.
+        """
+        if self._file is not None:
+            self._file.close()
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            if save_time is not None:
+                f.write(_base_line(save_time) + "\n")
+            for _, line in self._entries:
+                f.write(line + "\n")
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+
+def _base_line(save_time: float) -> str:
+    return json.dumps(["base", save_time])
+
+
+def replay_journal(path: str, grid: Any, inventory: Any, player: Any, save_time: float) -> int:
+    """
+    Rejoue sur l'état chargé depuis le snapshot (sauvegardé à save_time) les
+    entrées qui suivent sa ligne de base. Sans cette ligne, rien n'est rejoué.
+    Une dernière ligne incomplète (arrêt pendant l'écriture) est ignorée.
+    Retourne le nombre d'entrées appliquées.
+    """
+    from grid import Room
+
+    # Entries after the base line of this snapshot (None: line not found yet)
+    entries = None
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break
+            if entry[0] == "base":
+                if entry[1] == save_time:
+                    entries = []
+            elif entries is not None:
+                entries.append(entry)
+
+    count = 0
+    for entry in entries or ():
+        kind = entry[0]
+        if kind == "room":
+            (_, r, c, name, image_name, room_type, cost_gems, effect_data, color_type, rarity,
+             doors, locked_doors) = entry
+            grid.set_room(r, c, Room(name=name, image_name=image_name, room_type=room_type,
+                                     cost_gems=cost_gems, effect_data=effect_data,
+                                     color_type=color_type, rarity=rarity,
+                                     doors=doors, locked_doors=locked_doors))
+        elif kind == "unlock":
+            grid.unlock_door(*entry[1:5])
+        elif kind == "disc":
+            grid.discover(entry[1], entry[2])
+        elif kind == "pos":
+            player.row, player.col = entry[1], entry[2]
+        elif kind == "inv":
+            setattr(inventory, entry[1], entry[2])
+        count += 1
+    player.reset_cursor_to_player()
+    return count
@@ -2,9 +2,19 @@
 """
 HOW SAVING WORKS:
 ==========================
-1. Press Ctrl+S during gameplay.
-2. The entire state (grid, inventory, player) is serialised to JSON.
-3. It is saved in: saves/save.json
+1. Press Ctrl+S during gameplay (saves to the slot the game was loaded from,
+   or to a free slot for a new game).
+2. The entire state (grid, inventory, player) is captured with every distinct
+   room interned once (see save_format.py).
+3. It is saved in: saves/save.bps (compact binary: struct layout, only the
+   placed and discovered cells, zlib). A filename ending in .json is still written in
+   the old JSON format.
+   The state is copied on the main thread; a SaveService thread writes it
+   (temporary file + fsync + os.replace), so a frame never waits on the disk
+   and a crash never leaves a truncated save.
+4. Autosave: saves/autosave.bps is a full snapshot and saves/autosave.journal
+   the changes made since (one line per change, appended every frame), see
+   save_journal.py.
 
 WHAT IS SAVED:
 ==============
@@ -15,112 +25,186 @@ WHAT IS SAVED:
 
 HOW TO LOAD:
 ============
-1. Select ‘Charger Partie’ from the menu
-2. Reads saves/save.json
+1. Select ‘Charger Partie’ from the menu, then a slot (SLOT_COUNT slots:
+   saves/save.bps, saves/save_2.bps, ... and the autosave). The list only
+   reads the fixed-size header of each slot, never the grid data.
+2. Reads the chosen file (slot 1 falls back to the old saves/save.json if
+   there is no binary save yet)
 3. Reconstructs the exact state of the game
 """
 
 import json
 import os
-from typing import Any
-from datetime import datetime
+import stat
+import tempfile
+import threading
+from typing import Any, Optional
+
+import save_format
+from save_format import SaveState, SaveFormatError
 
 SAVE_DIR = "saves"
-SAVE_FILE = os.path.join(SAVE_DIR, "save.json")
+SAVE_FILE = os.path.join(SAVE_DIR, "save" + save_format.BINARY_EXTENSION)
+AUTOSAVE_FILE = os.path.join(SAVE_DIR, "autosave" + save_format.BINARY_EXTENSION)
+# Previous JSON save, still read when there is no binary save (migration)
+LEGACY_SAVE_FILE = os.path.join(SAVE_DIR, "save.json")
 
+# Mode of new save files (mkstemp creates 0600): the usual 0666 & ~umask.
+# Read once at import, os.umask can't be queried safely from the writer thread.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+NEW_FILE_MODE = 0o666 & ~_UMASK
 
-def save_game(grid: Any, inventory: Any, player: Any, filename: str = SAVE_FILE) -> bool:
+# Save slots shown by the load menu (slot 1 is SAVE_FILE)
+SLOT_COUNT = 5
 
-    try:
-        # Crear carpeta saves/ si no existe
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        
-        # Construir estructura de datos
-        data = {}
-        
-        # ========================================
-        # 1. SERIALIZAR GRID (todas las rooms)
-        # ========================================
-        cells = []
-        for r in range(grid.rows):
-            row = []
-            for c in range(grid.cols):
-                room = grid.get_room(r, c)
-                is_discovered = grid.is_discovered(r, c)
-                
-                if room is None:
-                    # Casilla vacía (no room aún)
-                    row.append({
-                        "exists": False,
-                        "discovered": is_discovered
-                    })
-                else:
-                    # Serializar room completa
-                    row.append({
-                        "exists": True,
-                        "discovered": is_discovered,
-                        "name": room.name,
-                        "image_name": room.image_name,
-                        "room_type": room.room_type,
-                        "cost_gems": room.cost_gems,
-                        "effect_data": room.effect_data,
-                        "color_type": room.color_type,
-                        "rarity": room.rarity,
-                    })
-            cells.append(row)
-        
-        data["grid"] = {
-            "rows": grid.rows,
-            "cols": grid.cols,
-            "cells": cells
-        }
-        
 
-        data["inventory"] = {
-
-            "steps": inventory.steps,
-            "gems": inventory.gems,
-            "keys": inventory.keys,
-            "dice": inventory.dice,
-            "gold": inventory.gold,
-            
-
-            "permanents": {
-                "shovel": inventory.shovel,
-                "hammer": inventory.hammer,
-                "picklock_kit": inventory.picklock_kit,
-                "metal_detector": inventory.metal_detector,
-                "rabbit_foot": inventory.rabbit_foot,
-            }
-        }
-        
+def snapshot_state(grid: Any, inventory: Any, player: Any) -> SaveState:
+    """
+    Copie l'état du jeu (rapide, à faire sur le thread principal).
+    Les salles identiques sont internées une fois (voir save_format.capture),
+    le jeu peut donc continuer pendant l'écriture.
+    """
+    return save_format.capture(grid, inventory, player)
 
-        data["player"] = {
-            "row": player.row,
-            "col": player.col
-        }
-        
 
-        data["metadata"] = {
-            "save_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "game_version": "1.0"
-        }
-        
+def encode_save(state: SaveState, filename: str) -> bytes:
+    """Format choisi par l'extension : .json pour l'ancien format, binaire sinon."""
+    if filename.endswith(".json"):
+        data = save_format.to_json_dict(state)
+        return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    return save_format.to_bytes(state)
 
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        
+
+def write_save_atomic(state: SaveState, filename: str = SAVE_FILE):
+    """
+    Écrit la sauvegarde sans jamais laisser de fichier tronqué :
+    fichier temporaire dans le même dossier, fsync, puis os.replace.
+    Le fichier garde les droits de celui qu'il remplace (sinon NEW_FILE_MODE).
+    """
+    blob = encode_save(state, filename)
+    directory = os.path.dirname(filename) or "."
+    os.makedirs(directory, exist_ok=True)
+    try:
+        mode = stat.S_IMODE(os.stat(filename).st_mode)
+    except OSError:
+        mode = NEW_FILE_MODE
+    fd, tmp_path = tempfile.mkstemp(prefix=".save-", suffix=".tmp", dir=directory)
+    try:
+        os.chmod(tmp_path, mode)
+        with os.fdopen(fd, "wb") as f:
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filename)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    # Persist the rename itself (POSIX only)
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def save_game(grid: Any, inventory: Any, player: Any, filename: str = SAVE_FILE) -> bool:
+    """Sauvegarde synchrone (atomique). Voir SaveService pour la version en arrière-plan."""
+    try:
+        write_save_atomic(snapshot_state(grid, inventory, player), filename)
         print(f"Partie sauvegardée: {filename}")
         return True
-        
+
     except Exception as e:
         print(f"Erreur lors de la sauvegarde: {e}")
         return False
 
 
+class SaveService:
+    """
+    Sauvegarde en arrière-plan (write-behind).
+
+    Le thread principal ne fait que la copie de l'état (snapshot_state) ;
+    l'encodage et l'écriture atomique se font sur un thread dédié.
+    Les demandes sont fusionnées : si plusieurs sauvegardes du même fichier
+    arrivent avant l'écriture, seule la plus récente est écrite.
+    L'autosave passe aussi par ici (snapshots du journal, voir save_journal.py).
+    """
+
+    def __init__(self):
+        self.last_error: Exception | None = None
+        self._pending: dict[str, tuple] = {}
+        self._busy = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._worker, name="save-writer", daemon=True)
+        self._thread.start()
+
+    def request_save(self, grid: Any, inventory: Any, player: Any,
+                     filename: str = SAVE_FILE, on_written=None):
+        """
+        Copie l'état maintenant et programme son écriture (retourne immédiatement).
+        on_written() est appelé sur le thread d'écriture une fois le fichier en place.
+        """
+        self.request_write(snapshot_state(grid, inventory, player), filename, on_written)
+
+    def request_write(self, state: SaveState, filename: str = SAVE_FILE, on_written=None):
+        """Programme l'écriture d'un état déjà copié (voir request_save)."""
+        with self._cond:
+            self._pending[filename] = (state, on_written)
+            self._cond.notify()
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending and self._closed:
+                    return
+                filename, (state, on_written) = self._pending.popitem()
+                self._busy = True
+            try:
+                write_save_atomic(state, filename)
+                self.last_error = None
+                if on_written is not None:
+                    on_written()
+            except Exception as e:
+                self.last_error = e
+                print(f"Erreur lors de la sauvegarde: {e}")
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Attend que toutes les sauvegardes en attente soient écrites."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def shutdown(self, timeout: float | None = 5.0):
+        """Écrit ce qui reste puis arrête le thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+
+def read_save(filename: str, rows: int, cols: int) -> SaveState:
+    """Lit une sauvegarde binaire ou JSON (détectée par le magic)."""
+    with open(filename, "rb") as f:
+        blob = f.read()
+    if save_format.is_binary(blob):
+        return save_format.from_bytes(blob)
+    return save_format.from_json_dict(json.loads(blob.decode("utf-8")), rows, cols)
+
+
 def load_game(grid: Any, inventory: Any, player: Any, filename: str = SAVE_FILE) -> bool:
     """
-    Carga una partida guardada desde JSON.
+    Carga una partida guardada (formato binario o JSON antiguo).
     
     Args:
         grid: Grid object (se modificará con datos cargados)
@@ -131,66 +215,24 @@ def load_game(grid: Any, inventory: Any, player: Any, filename: str = SAVE_FILE)
     Returns:
         True si se cargó exitosamente, False si no existe o hay error
     """
+    if not os.path.exists(filename) and filename == SAVE_FILE and os.path.exists(LEGACY_SAVE_FILE):
+        # Old JSON save: read it, the next save is written in the binary format
+        filename = LEGACY_SAVE_FILE
+
     if not os.path.exists(filename):
         print(f" Aucune sauvegarde trouvée: {filename}")
         return False
     
     try:
+        state = read_save(filename, grid.rows, grid.cols)
+        save_format.apply(state, grid, inventory, player)
 
-        with open(filename, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        
-
-        grid_data = data.get("grid", {})
-        cells = grid_data.get("cells", [])
-        
-        for r, row in enumerate(cells):
-            for c, cell in enumerate(row):
-                if cell.get("exists"):
-
-                    from grid import Room
-                    room = Room(
-                        name=cell.get("name", "Unknown"),
-                        image_name=cell.get("image_name"),
-                        room_type=cell.get("room_type", "normal"),
-                        cost_gems=cell.get("cost_gems", 0),
-                        effect_data=cell.get("effect_data", {}),
-                        color_type=cell.get("color_type", "neutral"),
-                        rarity=cell.get("rarity", 0)
-                    )
-                    grid.grid[r][c] = room
-                else:
-                    grid.grid[r][c] = None
-                
-
-                grid.discovered[r][c] = cell.get("discovered", False)
-        
-
-        inv_data = data.get("inventory", {})
-        inventory.steps = inv_data.get("steps", 70)
-        inventory.gems = inv_data.get("gems", 2)
-        inventory.keys = inv_data.get("keys", 0)
-        inventory.dice = inv_data.get("dice", 0)
-        inventory.gold = inv_data.get("gold", 0)
-        
-        perms = inv_data.get("permanents", {})
-        inventory.shovel = perms.get("shovel", False)
-        inventory.hammer = perms.get("hammer", False)
-        inventory.picklock_kit = perms.get("picklock_kit", False)
-        inventory.metal_detector = perms.get("metal_detector", False)
-        inventory.rabbit_foot = perms.get("rabbit_foot", False)
-        
-
-        player_data = data.get("player", {})
-        player.row = player_data.get("row", grid.rows - 1)
-        player.col = player_data.get("col", 0)
-        player.reset_cursor_to_player()
-        
-
-        metadata = data.get("metadata", {})
-        save_date = metadata.get("save_date", "Unknown")
-        print(f" Partie chargée (sauvegardée le: {save_date})")
-        
+        # Changes made after the last snapshot (see save_journal.py)
+        from save_journal import journal_path, replay_journal
+        journal = journal_path(filename)
+        if os.path.exists(journal):
+            replay_journal(journal, grid, inventory, player, state.save_time)
+        print(f" Partie chargée (sauvegardée le: {state.save_date})")
         return True
         
     except Exception as e:
@@ -201,7 +243,7 @@ def load_game(grid: Any, inventory: Any, player: Any, filename: str = SAVE_FILE)
 def get_save_info(filename: str = SAVE_FILE) -> dict:
     """
     Obtiene información de una partida guardada sin cargarla.
-    Útil para mostrar en el menú.
+    Útil para mostrar en el menú. En formato binario solo se lee la cabecera.
     
     Returns:
         dict con: save_date, steps, gold, position, etc.
@@ -210,26 +252,91 @@ def get_save_info(filename: str = SAVE_FILE) -> dict:
         return None
     
     try:
-        with open(filename, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        
-        metadata = data.get("metadata", {})
-        inv_data = data.get("inventory", {})
-        player_data = data.get("player", {})
+        with open(filename, "rb") as f:
+            head = f.read(save_format.HEADER.size)
+            if save_format.is_binary(head):
+                info = save_format.read_header(head)
+                row, col = info["player"]
+            else:
+                data = json.loads((head + f.read()).decode("utf-8"))
+                inv_data = data.get("inventory", {})
+                player_data = data.get("player", {})
+                info = {
+                    "save_date": data.get("metadata", {}).get("save_date", "Unknown"),
+                    "steps": inv_data.get("steps", 0),
+                    "gold": inv_data.get("gold", 0),
+                    "gems": inv_data.get("gems", 0),
+                }
+                row, col = player_data.get("row", 0), player_data.get("col", 0)
         
         return {
-            "save_date": metadata.get("save_date", "Unknown"),
-            "steps": inv_data.get("steps", 0),
-            "gold": inv_data.get("gold", 0),
-            "gems": inv_data.get("gems", 0),
-            "position": f"({player_data.get('row', 0)}, {player_data.get('col', 0)})"
+            "save_date": info["save_date"],
+            "steps": info["steps"],
+            "gold": info["gold"],
+            "gems": info["gems"],
+            "position": f"({row}, {col})"
         }
-    except:
+    except (OSError, ValueError, SaveFormatError):
         return None
 
 
 
+def slot_path(slot: int) -> str:
+    """Fichier de l'emplacement slot (1..SLOT_COUNT)."""
+    if slot == 1:
+        return SAVE_FILE
+    return os.path.join(SAVE_DIR, f"save_{slot}{save_format.BINARY_EXTENSION}")
+
+
+def _slot_file(slot: int) -> str:
+    """Fichier à lire pour l'emplacement slot (slot 1 : l'ancien save.json tant qu'il n'y a pas de .bps)."""
+    filename = slot_path(slot)
+    if slot == 1 and not os.path.exists(filename) and os.path.exists(LEGACY_SAVE_FILE):
+        return LEGACY_SAVE_FILE
+    return filename
+
+
+def list_slots(count: int = SLOT_COUNT) -> list:
+    """
+    Infos des emplacements 1..count (None pour un emplacement vide), plus
+    l'autosave en dernier. Seuls les en-têtes sont lus : le coût ne dépend
+    ni de la taille des grilles ni du nombre d'autres fichiers dans saves/.
+    """
+    entries = []
+    for slot in range(1, count + 1):
+        filename = _slot_file(slot)
+        info = get_save_info(filename)
+        if info is not None:
+            info["filename"] = filename
+            info["slot"] = slot
+        entries.append(info)
+
+    info = get_save_info(AUTOSAVE_FILE)
+    if info is not None:
+        info["filename"] = AUTOSAVE_FILE
+        info["slot"] = None
+    entries.append(info)
+    return entries
+
+
+def free_slot(count: int = SLOT_COUNT) -> Optional[int]:
+    """
+    Premier emplacement vide, None si tous sont pris (une sauvegarde n'est
+    jamais écrasée par une autre partie). L'ancien save.json occupe l'emplacement 1.
+    """
+    for slot in range(1, count + 1):
+        if not os.path.exists(_slot_file(slot)):
+            return slot
+    return None
+
 if __name__ == "__main__":
+    import time
+
+    # Never touch the player's saves: everything below runs in a temporary directory
+    workdir = tempfile.TemporaryDirectory()
+    previous_cwd = os.getcwd()
+    os.chdir(workdir.name)
+
     print("=" * 70)
     print("TEST")
     print("=" * 70)
@@ -239,14 +346,21 @@ if __name__ == "__main__":
         def __init__(self):
             self.rows = 5
             self.cols = 9
-            self.grid = [[None for _ in range(9)] for _ in range(5)]
-            self.discovered = [[False for _ in range(9)] for _ in range(5)]
-        
-        def get_room(self, r, c):
-            return self.grid[r][c]
+            # (r, c) -> (room, discovered)
+            self.cells = {}
         
-        def is_discovered(self, r, c):
-            return self.discovered[r][c]
+        def iter_cells(self):
+            for (r, c), (room, discovered) in self.cells.items():
+                yield r, c, room, discovered
+
+        def clear(self):
+            self.cells.clear()
+
+        def load_cell(self, r, c, room, discovered=True):
+            self.cells[(r, c)] = (room, discovered)
+
+        def rebuild_index(self):
+            pass
     
     class MockInventory:
         def __init__(self):
@@ -298,5 +412,30 @@ if __name__ == "__main__":
         if info:
             for key, value in info.items():
                 print(f"   {key}: {value}")
-    
+
+    # Test: taille / temps JSON vs binaire sur une grande grille
+    from grid import Grid
+    from rooms_catalog import CATALOG
+    import random
+    big = Grid(200, 200)
+    rng = random.Random(0)
+    for r in range(big.rows):
+        for c in range(big.cols):
+            if rng.random() < 0.6 and big.get_room(r, c) is None:
+                big.set_room(r, c, CATALOG.draw(1, rng)[0].instantiate())
+    state = snapshot_state(big, inventory, player)
+    print("\n Grille 200x200:")
+    for ext in (".json", save_format.BINARY_EXTENSION):
+        path = os.path.join(SAVE_DIR, "bench" + ext)
+        t0 = time.perf_counter()
+        write_save_atomic(state, path)
+        t1 = time.perf_counter()
+        read_save(path, big.rows, big.cols)
+        t2 = time.perf_counter()
+        print(f"   {ext}: {os.path.getsize(path)} octets, "
+              f"écriture {(t1 - t0) * 1000:.1f} ms, lecture {(t2 - t1) * 1000:.1f} ms")
+        os.remove(path)
+
+    os.chdir(previous_cwd)
+    workdir.cleanup()
     print("\n" + "=" * 70)
\ No newline at end of file
@@ -0,0 +1,352 @@
+# simulator.py
+"""
+Monte Carlo simulator: plays many complete runs on the headless GameEngine.
+
+Runs are split into chunks spread over a ProcessPoolExecutor. Each chunk has
+its own seed derived from the base seed and the chunk index, so results do
+not depend on the number of workers.
+
+Usage:
+    python simulator.py --runs 100000 --policy greedy-gems --workers 8 --seed 1
+"""
+
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from engine import GameEngine
+
+# Safety net: every action costs a step, so only a run that keeps gaining
+# steps (food rooms entered again and again) gets there
+MAX_ACTIONS = 500
+
+CHUNK_SIZE = 500
+
+
+# ----------------------------
+# Policies
+# ----------------------------
+class Policy:
+    """
+    Stratégie de jeu d'un bot.
+
+    pick_target() choisit la case où aller parmi moves (cases voisines où
+    entrer coûte un pas, jamais vide), pick_room() choisit l'indice de la
+    salle dans le choix proposé (None pour annuler).
+    """
+    name = "base"
+
+    def pick_target(self, engine: GameEngine, rng: random.Random,
+                    moves: List[Tuple[int, int]]) -> Tuple[int, int]:
+        raise NotImplementedError
+
+    def pick_room(self, engine: GameEngine, rng: random.Random) -> Optional[int]:
+        affordable = affordable_choices(engine)
+        return rng.choice(affordable) if affordable else None
+
+
+def neighbors(engine: GameEngine) -> List[Tuple[int, int]]:
+    """
+    Cases voisines accessibles par une porte (verrouillées seulement avec une
+    clé). Vide quand le joueur est bloqué.
+    """
+    p = engine.player
+    return engine.grid.valid_moves(p.row, p.col, locked=engine.inventory.keys > 0)
+
+
+def affordable_choices(engine: GameEngine) -> List[int]:
+    """Indices des salles du choix que le joueur peut payer."""
+    inv = engine.inventory
+    result = []
+    for i, room in enumerate(engine.modal_options):
+        if room.cost_gems > inv.gems:
+            continue
+        if room.effect_data.get("requires_key_to_enter") and inv.keys <= 0:
+            continue
+        result.append(i)
+    return result
+
+
+class RandomPolicy(Policy):
+    """Case adjacente et salle abordable au hasard."""
+    name = "random"
+
+    def pick_target(self, engine, rng, moves):
+        return rng.choice(moves)
+
+
+class GreedyGemsPolicy(Policy):
+    """Explore en priorité les cases inconnues et choisit la salle la plus rentable en gemmes."""
+    name = "greedy-gems"
+
+    def pick_target(self, engine, rng, moves):
+        unknown = [rc for rc in moves if not engine.grid.is_discovered(*rc)]
+        return rng.choice(unknown or moves)
+
+    def pick_room(self, engine, rng):
+        affordable = affordable_choices(engine)
+        if not affordable:
+            return None
+
+        def score(i):
+            room = engine.modal_options[i]
+            return room.effect_data.get("gems", 0) - room.cost_gems
+        best = max(score(i) for i in affordable)
+        return rng.choice([i for i in affordable if score(i) == best])
+
+
+class ShortestPathPolicy(Policy):
+    """
+    Va vers la sortie avec les salles les moins chères : suit Grid.distance_to_exit
+    si un chemin par les portes existe déjà, sinon marche (BFS par les portes)
+    vers la case fermée la plus proche de la sortie (distance de Manhattan).
+    """
+    name = "shortest-path"
+
+    def pick_target(self, engine, rng, moves):
+        grid = engine.grid
+        p = engine.player
+        here = (p.row, p.col)
+        d = grid.distance_to_exit(*here)
+        if d is not None:
+            closer = [rc for rc in moves if grid.distance_to_exit(*rc) == d - 1]
+            if closer:
+                return rng.choice(closer)
+
+        er, ec = grid.exit_pos
+        has_key = engine.inventory.keys > 0
+        first_step = {here: None}
+        queue = [here]
+        best, best_key = None, None
+        for u in queue:
+            for n in (moves if u == here else grid.valid_moves(*u, locked=has_key)):
+                if n in first_step:
+                    continue
+                first_step[n] = n if u == here else first_step[u]
+                if grid.is_passable(*n):
+                    queue.append(n)
+                else:
+                    key = (abs(n[0] - er) + abs(n[1] - ec), len(queue))
+                    if best_key is None or key < best_key:
+                        best, best_key = n, key
+        if best is not None:
+            return first_step[best]
+        return rng.choice(moves)
+
+    def pick_room(self, engine, rng):
+        affordable = affordable_choices(engine)
+        if not affordable:
+            return None
+        safe = [i for i in affordable if engine.modal_options[i].room_type != "piege"] or affordable
+        cheapest = min(engine.modal_options[i].cost_gems for i in safe)
+        return rng.choice([i for i in safe if engine.modal_options[i].cost_gems == cheapest])
+
+
+POLICIES: Dict[str, type] = {
+    RandomPolicy.name: RandomPolicy,
+    GreedyGemsPolicy.name: GreedyGemsPolicy,
+    ShortestPathPolicy.name: ShortestPathPolicy,
+}
+
+
+# ----------------------------
+# Single run
+# ----------------------------
+@dataclass
+class RunResult:
+    won: bool
+    steps_used: int
+    gems: int
+    gold: int
+    keys: int
+    rooms_placed: int
+    # No door left to go through (the run ends there, lost)
+    stuck: bool = False
+    # Stopped by MAX_ACTIONS before the game was over (should not happen)
+    truncated: bool = False
+
+
+def play_run(policy: Policy, rng: random.Random) -> RunResult:
+    """Joue une partie complète avec la stratégie donnée (graine tirée de rng)."""
+    engine = GameEngine(seed=rng.getrandbits(32), record=False)
+    start_steps = engine.inventory.steps
+    rooms_placed = 0
+    stuck = False
+    # Doors whose room choice was refused since the last step: not retried
+    refused = set()
+    for _ in range(MAX_ACTIONS):
+        if engine.finished:
+            break
+        moves = [rc for rc in neighbors(engine) if rc not in refused]
+        if not moves:
+            stuck = True
+            break
+        tr, tc = policy.pick_target(engine, rng, moves)
+        # Nothing is recorded: put the cursor there directly
+        engine.player.sel_row, engine.player.sel_col = tr, tc
+        engine.enter()
+        if engine.in_modal:
+            idx = policy.pick_room(engine, rng)
+            if idx is not None and engine.choose_room(idx):
+                rooms_placed += 1
+            else:
+                engine.cancel()
+                refused.add((tr, tc))
+                continue
+        refused.clear()
+    inv = engine.inventory
+    return RunResult(
+        won=engine.won,
+        steps_used=start_steps - inv.steps,
+        gems=inv.gems,
+        gold=inv.gold,
+        keys=inv.keys,
+        rooms_placed=rooms_placed,
+        stuck=stuck,
+        truncated=not engine.finished and not stuck,
+    )
+
+
+# ----------------------------
+# Aggregated statistics
+# ----------------------------
+@dataclass
+class SimulationStats:
+    """Statistiques agrégées (fusionnables entre processus)."""
+    runs: int = 0
+    wins: int = 0
+    stuck: int = 0
+    truncated: int = 0
+    # Steps used by the finished runs only (a truncated run may even have gained steps)
+    steps_hist: Dict[int, int] = field(default_factory=dict)
+    totals: Dict[str, int] = field(default_factory=lambda: {
+        "gems": 0, "gold": 0, "keys": 0, "rooms_placed": 0})
+
+    def add(self, res: RunResult):
+        self.runs += 1
+        self.wins += res.won
+        self.stuck += res.stuck
+        if res.truncated:
+            self.truncated += 1
+        else:
+            self.steps_hist[res.steps_used] = self.steps_hist.get(res.steps_used, 0) + 1
+        self.totals["gems"] += res.gems
+        self.totals["gold"] += res.gold
+        self.totals["keys"] += res.keys
+        self.totals["rooms_placed"] += res.rooms_placed
+
+    def merge(self, other: "SimulationStats"):
+        self.runs += other.runs
+        self.wins += other.wins
+        self.stuck += other.stuck
+        self.truncated += other.truncated
+        for k, v in other.steps_hist.items():
+            self.steps_hist[k] = self.steps_hist.get(k, 0) + v
+        for k, v in other.totals.items():
+            self.totals[k] += v
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.runs if self.runs else 0.0
+
+    def steps_percentile(self, q: float) -> int:
+        """Percentile (0..1) du nombre de pas utilisés (parties terminées)."""
+        target = q * (self.runs - self.truncated)
+        acc = 0
+        for steps in sorted(self.steps_hist):
+            acc += self.steps_hist[steps]
+            if acc >= target:
+                return steps
+        return 0
+
+    def mean(self, key: str) -> float:
+        return self.totals[key] / self.runs if self.runs else 0.0
+
+    def report(self) -> str:
+        finished = self.runs - self.truncated
+        mean_steps = (sum(k * v for k, v in self.steps_hist.items()) / finished
+                      if finished else 0.0)
+        lines = [
+            f"Parties: {self.runs} (interrompues après {MAX_ACTIONS} actions: {self.truncated})",
+            f"Taux de victoire: {self.win_rate:.2%} (bloquées sans porte: {self.stuck})",
+            f"Pas utilisés: moyenne {mean_steps:.1f}, "
+            f"p10 {self.steps_percentile(0.1)}, p50 {self.steps_percentile(0.5)}, "
+            f"p90 {self.steps_percentile(0.9)}",
+            f"Gemmes finales (moy.): {self.mean('gems'):.2f}",
+            f"Or final (moy.): {self.mean('gold'):.2f}",
+            f"Clés finales (moy.): {self.mean('keys'):.2f}",
+            f"Salles posées (moy.): {self.mean('rooms_placed'):.2f}",
+        ]
+        return "\n".join(lines)
+
+
+# ----------------------------
+# Batch / process pool
+# ----------------------------
+def chunk_seed(seed: int, chunk_index: int) -> int:
+    """Seed indépendante pour chaque chunk (même résultat quel que soit le nombre de workers)."""
+    return random.Random(f"{seed}:{chunk_index}").getrandbits(64)
+
+
+def _run_chunk(args) -> SimulationStats:
+    policy_name, n_runs, seed = args
+    rng = random.Random(seed)
+    policy = POLICIES[policy_name]()
+    stats = SimulationStats()
+    for _ in range(n_runs):
+        stats.add(play_run(policy, rng))
+    return stats
+
+
+def simulate(n_runs: int, policy: str = "random", workers: Optional[int] = None,
+             seed: int = 0, chunk_size: int = CHUNK_SIZE) -> SimulationStats:
+    """
+    Joue n_runs parties avec la stratégie donnée.
+
+    workers=1 exécute tout dans le processus courant ; sinon les chunks sont
+    répartis sur un ProcessPoolExecutor (os.cpu_count() workers par défaut).
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy {policy!r} (choices: {', '.join(POLICIES)})")
+    jobs = []
+    remaining = n_runs
+    idx = 0
+    while remaining > 0:
+        n = min(chunk_size, remaining)
+        jobs.append((policy, n, chunk_seed(seed, idx)))
+        remaining -= n
+        idx += 1
+
+    stats = SimulationStats()
+    if workers == 1 or len(jobs) <= 1:
+        for job in jobs:
+            stats.merge(_run_chunk(job))
+        return stats
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        for part in pool.map(_run_chunk, jobs):
+            stats.merge(part)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Blue Prince - simulation Monte Carlo")
+    parser.add_argument("--runs", type=int, default=10000)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="random")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    stats = simulate(args.runs, args.policy, args.workers, args.seed)
+    elapsed = time.perf_counter() - t0
+    print(stats.report())
+    print(f"Temps: {elapsed:.2f}s ({stats.runs / elapsed:.0f} parties/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,150 @@
-
 # Mohand
 # sound_manager.py
 """
- - assets/sounds/music/<name>.mp3 (o .ogg)
- - assets/sounds/effects/<name>.wav
+Audio subsystem: sound effects and music.
+
+ - assets/audio/main_theme.mp3 (o .wav): musique, lue en streaming par
+   pygame.mixer.music (son propre canal).
+ - assets/audio/effects/<name>.wav: effets, décodés une seule fois en mémoire
+   (asset_cache.sounds, rempli par preloader.py ou par AudioSystem.preload).
+
+Les effets sont joués sur un groupe de canaux réservés : si tous sont occupés,
+l'effet le moins prioritaire (le plus ancien à priorité égale) est coupé, à
+condition que sa priorité ne dépasse pas celle du nouvel effet.
 """
 
 import os
+import time
+from typing import Dict, List, Optional, Tuple
+
 import pygame
 
-MUSIC_DIR = os.path.join("assets", "sounds", "music")
-EFFECTS_DIR = os.path.join("assets", "sounds", "effects")
+from asset_cache import sounds
+from constants import AUDIO_DIR, SFX_DIR
+from startup_profile import profiler
+
+MUSIC_DIR = AUDIO_DIR
+EFFECTS_DIR = SFX_DIR
+
+# Effect name -> (file, priority). Higher priority steals lower ones.
+EFFECTS: Dict[str, Tuple[str, int]] = {
+    "door_open": ("open_door.wav", 1),
+    "pick_item": ("pick_item.wav", 1),
+    "door_locked": ("door_locked.wav", 2),
+    "game_over": ("game_over.wav", 3),
+}
+
+MUSIC_FILES = ("main_theme.mp3", "main_theme.wav")
+MUSIC_VOLUME = 0.5
+
+# Channels reserved for effects (pygame never picks them automatically)
+EFFECT_CHANNELS = 4
+
+
+class AudioSystem:
+    """
+    Banque d'effets préchargés + pool de canaux avec vol de voix.
+
+    init() réserve les canaux ; play(name) ne fait aucune lecture disque si
+    preload() (ou le préchargeur) a été exécuté. Sans mixer, tout est ignoré.
+    """
+
+    def __init__(self, effect_channels: int = EFFECT_CHANNELS):
+        self.effect_channels = effect_channels
+        self._channels: List[pygame.mixer.Channel] = []
+        # Per channel: (priority, start time) of the effect playing on it
+        self._playing: List[Tuple[int, float]] = []
+        self.enabled = False
+
+    def init(self) -> bool:
+        """Initialise le mixer (si besoin) et réserve les canaux des effets."""
+        if self.enabled:
+            return True
+        try:
+            if not pygame.mixer.get_init():
+                with profiler.phase("mixer init"):
+                    pygame.mixer.init()
+        except pygame.error as e:
+            print("Audio init failed:", e)
+            self.enabled = False
+            return False
+        if pygame.mixer.get_num_channels() < self.effect_channels:
+            pygame.mixer.set_num_channels(self.effect_channels)
+        pygame.mixer.set_reserved(self.effect_channels)
+        self._channels = [pygame.mixer.Channel(i) for i in range(self.effect_channels)]
+        self._playing = [(0, 0.0)] * self.effect_channels
+        self.enabled = True
+        return True
+
+    def preload(self) -> int:
+        """Décode tous les effets connus (déjà faits par le préchargeur : rien à lire)."""
+        return sum(1 for filename, _ in EFFECTS.values() if sounds.get(filename) is not None)
+
+    def _pick_channel(self, priority: int) -> Optional[int]:
+        victim = None
+        for i, channel in enumerate(self._channels):
+            if not channel.get_busy():
+                return i
+            prio, started = self._playing[i]
+            if prio <= priority and (victim is None or (prio, started) < self._playing[victim]):
+                victim = i
+        return victim
+
+    def play(self, name: str) -> bool:
+        """Joue l'effet name (voir EFFECTS). Retourne False s'il n'a pas été joué."""
+        if not self.enabled or name not in EFFECTS:
+            return False
+        filename, priority = EFFECTS[name]
+        sound = sounds.get(filename)
+        if sound is None:
+            return False
+        idx = self._pick_channel(priority)
+        if idx is None:
+            return False
+        self._channels[idx].play(sound)
+        self._playing[idx] = (priority, time.monotonic())
+        return True
+
+    def play_music(self, filename: Optional[str] = None, loop: bool = True) -> bool:
+        """Lance la musique en streaming (le thème principal par défaut)."""
+        if not self.enabled:
+            return False
+        names = (filename,) if filename else MUSIC_FILES
+        for name in names:
+            path = os.path.join(MUSIC_DIR, name)
+            if not os.path.exists(path):
+                continue
+            try:
+                pygame.mixer.music.load(path)
+                pygame.mixer.music.set_volume(MUSIC_VOLUME)
+                pygame.mixer.music.play(-1 if loop else 0)
+                return True
+            except pygame.error as e:
+                print("Error playing music:", e)
+                return False
+        print("Music file not found:", ", ".join(os.path.join(MUSIC_DIR, n) for n in names))
+        return False
+
+    def stop_music(self):
+        if self.enabled:
+            pygame.mixer.music.stop()
+
+
+# Instance partagée (jeu, menus)
+audio = AudioSystem()
+
 
 def init_sound():
-    try:
-        pygame.mixer.init()
-    except Exception as e:
-        print("Audio init failed:", e)
-
-def play_music(filename: str, loop: bool = True):
-    path = os.path.join(MUSIC_DIR, filename)
-    if not os.path.exists(path):
-        print("Music file not found:", path)
-        return
-    try:
-        pygame.mixer.music.load(path)
-        pygame.mixer.music.set_volume(0.5)
-        pygame.mixer.music.play(-1 if loop else 0)
-    except Exception as e:
-        print("Error playing music:", e)
+    audio.init()
+
+
+def play_music(filename: Optional[str] = None, loop: bool = True):
+    audio.play_music(filename, loop)
+
 
 def stop_music():
-    pygame.mixer.music.stop()
-
-def play_effect(filename: str):
-    path = os.path.join(EFFECTS_DIR, filename)
-    if not os.path.exists(path):
-        print("Effect file not found:", path)
-        return
-    try:
-        s = pygame.mixer.Sound(path)
-        s.play()
-    except Exception as e:
-        print("Error playing effect:", e)
+    audio.stop_music()
+
+
+def play_effect(name: str):
+    audio.play(name)
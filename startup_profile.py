@@ -0,0 +1,90 @@
+# startup_profile.py
+"""
+Startup instrumentation: time spent before the main menu's first frame.
+
+Enabled with the environment variable BLUE_PRINCE_PROFILE_STARTUP=1 or the
+command line flag --profile-startup:
+    python main.py --profile-startup
+
+main.py imports this module first, so the origin is (almost) the start of
+the imports. The report is printed when the menu shows its first frame;
+later events (background asset preload) are printed as they happen.
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+PROCESS_START = time.perf_counter()
+
+ENV_VAR = "BLUE_PRINCE_PROFILE_STARTUP"
+CLI_FLAG = "--profile-startup"
+
+
+class StartupProfiler:
+    """
+    Chronomètre des phases du démarrage.
+
+    mark(name) enregistre le temps écoulé depuis la marque précédente,
+    phase(name) mesure un bloc ; plusieurs mesures du même nom s'additionnent.
+    Désactivé, chaque appel ne coûte qu'un test.
+    """
+
+    def __init__(self, enabled: bool, origin: float = PROCESS_START):
+        self.enabled = enabled
+        self.origin = origin
+        self._last_mark = origin
+        self.phases: List[Tuple[str, float]] = []
+        self.reported = False
+
+    def add(self, name: str, seconds: float):
+        if not self.enabled:
+            return
+        for i, (n, s) in enumerate(self.phases):
+            if n == name:
+                self.phases[i] = (n, s + seconds)
+                break
+        else:
+            self.phases.append((name, seconds))
+        if self.reported:
+            print(f"[startup] {name}: {seconds * 1000:.1f} ms "
+                  f"(t+{(time.perf_counter() - self.origin) * 1000:.0f} ms)")
+
+    def mark(self, name: str):
+        now = time.perf_counter()
+        self.add(name, now - self._last_mark)
+        self._last_mark = now
+
+    @contextmanager
+    def phase(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    def first_frame(self):
+        """À appeler après le premier flip du menu : affiche le rapport (une fois)."""
+        if not self.enabled or self.reported:
+            return
+        total = time.perf_counter() - self.origin
+        print(self.report(total))
+        self.reported = True
+
+    def report(self, total: float) -> str:
+        width = max([len(n) for n, _ in self.phases] + [20])
+        lines = ["[startup] Démarrage jusqu'à la première image du menu:"]
+        for name, seconds in self.phases:
+            lines.append(f"  {name:<{width}} {seconds * 1000:8.1f} ms")
+        accounted = sum(s for _, s in self.phases)
+        lines.append(f"  {'(autre)':<{width}} {(total - accounted) * 1000:8.1f} ms")
+        lines.append(f"  {'TOTAL':<{width}} {total * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+
+profiler = StartupProfiler(os.environ.get(ENV_VAR, "") not in ("", "0") or CLI_FLAG in sys.argv)
@@ -0,0 +1,85 @@
+# text_cache.py
+"""LRU cache of rendered text surfaces (font.render is costly, texts rarely change)."""
+
+from collections import OrderedDict
+from typing import Tuple
+
+import pygame
+
+# Bounds of the shared cache
+MAX_ENTRIES = 512
+MAX_BYTES = 8 * 1024 * 1024
+
+
+class TextCache:
+    """
+    Cache LRU des surfaces de texte, clé (font, text, color, antialias).
+
+    La mémoire est bornée par le nombre d'entrées et par la taille totale des
+    surfaces ; les entrées les moins récemment utilisées sont retirées en premier.
+    Les compteurs hits / misses permettent de suivre l'efficacité du cache.
+
+    Les polices doivent être des objets durables (créés une fois) : la clé
+    utilise l'objet Font lui-même.
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _size_of(surface: pygame.Surface) -> int:
+        w, h = surface.get_size()
+        return w * h * surface.get_bytesize()
+
+    def render(self, font: pygame.font.Font, text: str, antialias: bool,
+               color: Tuple[int, ...]) -> pygame.Surface:
+        """Même signature que font.render (sans fond)."""
+        key = (font, text, tuple(color), antialias)
+        surf = self._entries.get(key)
+        if surf is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return surf
+
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        self._entries[key] = surf
+        self._bytes += self._size_of(surf)
+        while self._entries and (len(self._entries) > self.max_entries
+                                 or self._bytes > self.max_bytes):
+            _, old = self._entries.popitem(last=False)
+            self._bytes -= self._size_of(old)
+        return surf
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+
+# Cache partagé par tous les écrans
+text_cache = TextCache()
+
+
+def render_text(font: pygame.font.Font, text: str, antialias: bool,
+                color: Tuple[int, ...]) -> pygame.Surface:
+    """Remplace font.render(text, antialias, color) par une lecture du cache."""
+    return text_cache.render(font, text, antialias, color)
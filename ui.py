@@ -2,50 +2,105 @@
 """Rendering utilities: draw grid, player, inventory panel and simple modal for 'tirage'."""
 
 import pygame
-import os
-from typing import Tuple
+from typing import Optional, Tuple
 from constants import *
+from camera import Camera
 from grid import Grid, Room
+from door import BIT_DELTAS
+from asset_cache import icons, room_surfaces
+from text_cache import render_text
 
 FONT_SIZE = 18
+ICON_SIZE = 24
 
-def draw_grid(surface: pygame.Surface, grid: Grid, player_pos: Tuple[int,int], cursor_pos: Tuple[int,int]):
-    """Dessine la grille et les salles."""
+CONSUMABLE_ICONS = ("steps.png", "gem.png", "key.png", "dice.png", "gold.png")
+PERMANENT_ICONS = ("pelle.png", "marteau.png", "picklock.png", "detecteur.png", "pattelapin.png")
+
+def draw_grid(surface: pygame.Surface, grid: Grid, player_pos: Tuple[int,int], cursor_pos: Tuple[int,int],
+              camera: Optional[Camera] = None):
+    """
+    Dessine la partie visible de la grille et des salles.
+
+    camera : vue à utiliser (défilement / zoom, voir camera.py) ; par défaut
+    une vue où tout le manoir tient. Seules les cases visibles sont dessinées.
+    """
     area_w = GRID_AREA_WIDTH
     area_h = GRID_AREA_HEIGHT
-    cell_w = area_w // grid.cols
-    cell_h = area_h // grid.rows
+    if camera is None:
+        camera = Camera(area_w, area_h)
+        camera.fit(grid.rows, grid.cols)
+    camera.follow((player_pos, cursor_pos), grid.rows, grid.cols)
+    cell = camera.cell
+    cell_size = (cell, cell)
+    room_surfaces.set_cell_size(cell_size)
+    r0, r1, c0, c1 = camera.visible_cells(grid.rows, grid.cols)
 
-    # Background
     grid_rect = pygame.Rect(0, 0, area_w, area_h)
+    old_clip = surface.get_clip()
+    surface.set_clip(grid_rect.clip(old_clip))
+
+    # Background: every cell starts unknown
     pygame.draw.rect(surface, DARK_GRAY, grid_rect)
+    cells_rect = pygame.Rect(-camera.x, -camera.y, grid.cols * cell, grid.rows * cell).clip(grid_rect)
+    pygame.draw.rect(surface, UNKNOWN_ROOM_COLOR, cells_rect)
 
-    # Draw cells
-    for r in range(grid.rows):
-        for c in range(grid.cols):
-            x = c * cell_w
-            y = r * cell_h
-            cell_rect = pygame.Rect(x, y, cell_w, cell_h)
-            room = grid.get_room(r, c)
-            if room is None:
-                pygame.draw.rect(surface, UNKNOWN_ROOM_COLOR, cell_rect)
-            else:
-                if hasattr(room, "image") and room.image:
-                    img = pygame.transform.scale(room.image, (cell_w, cell_h))
-                    surface.blit(img, (x, y))
-                else:
-                    pygame.draw.rect(surface, room.color, cell_rect)
-            pygame.draw.rect(surface, GRID_LINE_COLOR, cell_rect, 1)
+    # Grid lines (visible range only)
+    for r in range(r0, r1 + 1):
+        y = r * cell - camera.y
+        pygame.draw.line(surface, GRID_LINE_COLOR, (cells_rect.left, y), (cells_rect.right, y))
+    for c in range(c0, c1 + 1):
+        x = c * cell - camera.x
+        pygame.draw.line(surface, GRID_LINE_COLOR, (x, cells_rect.top), (x, cells_rect.bottom))
+
+    # Discovered rooms: only the chunks under the view are visited
+    # (undiscovered cells never touch the room images)
+    for r, c, room, discovered in grid.iter_region(r0, r1, c0, c1):
+        if room is None or not discovered:
+            continue
+        cell_rect = pygame.Rect(camera.cell_rect(r, c))
+        img = room_surfaces.get(room, cell_size)
+        if img is not None:
+            surface.blit(img, cell_rect.topleft)
+        else:
+            pygame.draw.rect(surface, room.color, cell_rect)
+        pygame.draw.rect(surface, GRID_LINE_COLOR, cell_rect, 1)
+        draw_doors(surface, room, cell_rect)
 
     # Player highlight
     pr, pc = player_pos
-    prow = pygame.Rect(pc * cell_w, pr * cell_h, cell_w, cell_h)
-    pygame.draw.rect(surface, BLUE, prow, 4)
+    pygame.draw.rect(surface, BLUE, camera.cell_rect(pr, pc), 4)
 
-    # Cursor highlight
+    # Cursor highlight (grey when no door leads there from the player)
     cr, cc = cursor_pos
-    crect = pygame.Rect(cc * cell_w, cr * cell_h, cell_w, cell_h)
-    pygame.draw.rect(surface, CURSOR_COLOR, crect, 3)
+    blocked = abs(cr - pr) + abs(cc - pc) == 1 and not grid.door_between(pr, pc, cr, cc)
+    pygame.draw.rect(surface, CURSOR_BLOCKED_COLOR if blocked else CURSOR_COLOR,
+                     camera.cell_rect(cr, cc), 3)
+
+    surface.set_clip(old_clip)
+
+
+def draw_doors(surface: pygame.Surface, room: Room, cell_rect: pygame.Rect):
+    """Marque les portes de la salle au milieu de chaque côté (verrouillées en jaune)."""
+    thickness = max(3, min(cell_rect.w, cell_rect.h) // 12)
+    for bit, (dr, dc) in BIT_DELTAS.items():
+        if not room.doors & bit:
+            continue
+        color = LOCKED_DOOR_COLOR if room.locked_doors & bit else DOOR_COLOR
+        if dr:
+            w, h = cell_rect.w // 3, thickness
+        else:
+            w, h = thickness, cell_rect.h // 3
+        door = pygame.Rect(0, 0, w, h)
+        door.center = cell_rect.center
+        if dr < 0:
+            door.top = cell_rect.top
+        elif dr > 0:
+            door.bottom = cell_rect.bottom
+        elif dc < 0:
+            door.left = cell_rect.left
+        else:
+            door.right = cell_rect.right
+        pygame.draw.rect(surface, color, door)
 
 
 def draw_inventory(surface: pygame.Surface, inventory, font: pygame.font.Font):
@@ -54,9 +109,13 @@ def draw_inventory(surface: pygame.Surface, inventory, font: pygame.font.Font):
     panel = pygame.Rect(x0, 0, PANEL_WIDTH, WINDOW_HEIGHT)
     pygame.draw.rect(surface, GRAY, panel)
 
+    icon_size = ICON_SIZE
+    if icons.use_atlas and not icons.has_atlas(icon_size):
+        icons.build_atlas(CONSUMABLE_ICONS + PERMANENT_ICONS, icon_size)
+
     margin = 12
     y = margin
-    title_s = font.render("INVENTAIRE", True, BLACK)
+    title_s = render_text(font, "INVENTAIRE", True, BLACK)
     surface.blit(title_s, (x0 + margin, y))
     y += 30
 
@@ -68,19 +127,14 @@ def draw_inventory(surface: pygame.Surface, inventory, font: pygame.font.Font):
         ("Dés", inventory.dice, "dice.png"),
         ("Pièces", inventory.gold, "gold.png"),
     ]
-    icon_size = 24
     for name, count, icon_file in consumables:
-        icon_path = os.path.join(ICON_DIR, icon_file)
-        if os.path.exists(icon_path):
-            icon_img = pygame.image.load(icon_path).convert_alpha()
-            icon_img = pygame.transform.scale(icon_img, (icon_size, icon_size))
-            surface.blit(icon_img, (x0 + margin, y))
-        s = font.render(f"{name}: {count}", True, BLACK)
+        icons.blit(surface, icon_file, icon_size, (x0 + margin, y))
+        s = render_text(font, f"{name}: {count}", True, BLACK)
         surface.blit(s, (x0 + margin + icon_size + 6, y + 2))
         y += icon_size + 6
 
     y += 8
-    perm_title = font.render("Objets permanents:", True, BLACK)
+    perm_title = render_text(font, "Objets permanents:", True, BLACK)
     surface.blit(perm_title, (x0 + margin, y))
     y += 22
 
@@ -92,21 +146,15 @@ def draw_inventory(surface: pygame.Surface, inventory, font: pygame.font.Font):
         ("Patte lapin", inventory.rabbit_foot, "pattelapin.png"),
     ]
     for name, have, icon_file in permanents:
-        icon_path = os.path.join(ICON_DIR, icon_file)
-        if os.path.exists(icon_path):
-            icon_img = pygame.image.load(icon_path).convert_alpha()
-            icon_img = pygame.transform.scale(icon_img, (icon_size, icon_size))
-            surface.blit(icon_img, (x0 + margin, y))
-        else:
+        if not icons.blit(surface, icon_file, icon_size, (x0 + margin, y)):
             pygame.draw.rect(surface, DARK_GRAY, (x0 + margin, y, icon_size, icon_size))
-            print(f"Icon not found: {icon_path}")
-        s = font.render(f"{name}: {'✓' if have else 'x'}", True, BLACK)
+        s = render_text(font, f"{name}: {'✓' if have else 'x'}", True, BLACK)
         surface.blit(s, (x0 + margin + icon_size + 6, y + 2))
         y += icon_size + 6
 
 
 def draw_message(surface: pygame.Surface, font: pygame.font.Font, message: str):
     """Petit texte en bas center."""
-    s = font.render(message, True, WHITE)
+    s = render_text(font, message, True, WHITE)
     rect = s.get_rect(center=(GRID_AREA_WIDTH // 2, WINDOW_HEIGHT - 20))
     surface.blit(s, rect)
\ No newline at end of file
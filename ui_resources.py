@@ -0,0 +1,55 @@
+# ui_resources.py
+"""Shared UI resources: fonts and translucent overlays created once and reused by every screen."""
+
+from typing import Dict, Tuple
+
+import pygame
+
+from startup_profile import profiler
+
+
+class UIResources:
+    """
+    Pool de polices et de surfaces d'overlay.
+
+    pygame.font.SysFont fait une recherche de police système à chaque appel :
+    chaque police (nom, taille, gras) est créée une seule fois. Les overlays
+    plein écran (SRCALPHA) sont créés une fois par taille de fenêtre et couleur ;
+    un changement de taille de fenêtre vide les overlays de l'ancienne taille.
+    """
+
+    def __init__(self):
+        self._fonts: Dict[Tuple[str, int, bool], pygame.font.Font] = {}
+        self._overlays: Dict[Tuple[int, int, int, int], pygame.Surface] = {}
+        self._overlay_size: Tuple[int, int] | None = None
+
+    def font(self, name: str, size: int, bold: bool = False) -> pygame.font.Font:
+        """Police système partagée (SysFont résolue une seule fois)."""
+        key = (name, size, bold)
+        f = self._fonts.get(key)
+        if f is None:
+            with profiler.phase("font lookup"):
+                f = pygame.font.SysFont(name, size, bold=bold)
+            self._fonts[key] = f
+        return f
+
+    def overlay(self, size: Tuple[int, int], rgba: Tuple[int, int, int, int]) -> pygame.Surface:
+        """Surface translucide de la taille de la fenêtre, remplie avec rgba."""
+        if size != self._overlay_size:
+            self._overlays.clear()
+            self._overlay_size = size
+        surf = self._overlays.get(rgba)
+        if surf is None:
+            surf = pygame.Surface(size, pygame.SRCALPHA)
+            surf.fill(rgba)
+            self._overlays[rgba] = surf
+        return surf
+
+    def clear(self):
+        self._fonts.clear()
+        self._overlays.clear()
+        self._overlay_size = None
+
+
+# Instance partagée par tous les écrans
+ui_resources = UIResources()